@@ -8,4 +8,7 @@ setup(
         'pyparsing',
         'tabulate',
     ],
+    extras_require={
+        'columnar': ['numpy'],  # vectorized scans and aggregates
+    },
 )
\ No newline at end of file
@@ -0,0 +1,63 @@
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional
+
+class Cursor:
+    """Fetches the rows of a statement as the executor produces them
+    
+    Follows the DB-API cursor methods: execute() runs a statement, and
+    fetchone(), fetchmany(), fetchall() or iteration pull its rows through
+    the executor's pipeline one at a time. Rows come from a snapshot of the
+    tables taken when the statement ran, so writes made while they are
+    fetched are not seen; on storages without snapshot reads they are read
+    from the tables as they are fetched, and such a write may or may not be.
+    """
+    
+    arraysize = 100  # default number of rows for fetchmany()
+    
+    def __init__(self, executor, session=None):
+        self.executor = executor
+        self.session = session  # executor Session to run statements in, the thread's own if None
+        self.result: Dict[str, Any] = {}  # result of the last statement, without its rows
+        self.rowcount = -1  # rows changed by the last statement, -1 for SELECT
+        self._rows: Iterator[Dict[str, Any]] = iter(())
+    
+    def execute(self, sql, params=None) -> 'Cursor':
+        """Execute a statement (SQL text or prepared) with parameter values"""
+        self.close()
+        result = self.executor.execute(sql, params, stream=True, session=self.session)
+        
+        self._rows = iter(result.pop('rows', ()))
+        self.result = result
+        self.rowcount = result.get('affected_rows', -1)
+        return self
+    
+    def fetchone(self) -> Optional[Dict[str, Any]]:
+        """Fetch the next row, or None when there are no more"""
+        return next(self._rows, None)
+    
+    def fetchmany(self, size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Fetch up to size rows (arraysize by default); fewer means the rows ran out"""
+        return list(islice(self._rows, self.arraysize if size is None else size))
+    
+    def fetchall(self) -> List[Dict[str, Any]]:
+        """Fetch all remaining rows"""
+        return list(self._rows)
+    
+    def close(self) -> None:
+        """Stop producing the rows of the current statement"""
+        close = getattr(self._rows, 'close', None)
+        if close is not None:
+            close()
+        self._rows = iter(())
+    
+    def __iter__(self) -> 'Cursor':
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        return next(self._rows)
+    
+    def __enter__(self) -> 'Cursor':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
\ No newline at end of file
@@ -0,0 +1,372 @@
+import operator
+import re
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from ...domain.models.table import Table, Column, Row
+from ...domain.models.column_store import ColumnStore
+from ...domain.exceptions import ColumnNotFoundException, InvalidDataTypeException
+
+Predicate = Callable[[Row], bool]
+VectorPredicate = Callable[[ColumnStore], Any]  # mask of matching rows, None if a column is not held
+
+class PredicateCompiler:
+    """Compiles parsed WHERE expressions into row predicates
+    
+    NOT is pushed down to the leaves first, so a comparison with a NULL row
+    value can simply be false and the result still follows SQL's three-valued
+    logic. Literals are converted to the column type once, at compile time.
+    """
+    
+    COMPARISONS = {
+        '=': operator.eq,
+        '!=': operator.ne,
+        '>': operator.gt,
+        '<': operator.lt,
+        '>=': operator.ge,
+        '<=': operator.le,
+    }
+    NEGATIONS = {
+        '=': '!=', '!=': '=',
+        '>': '<=', '<=': '>',
+        '<': '>=', '>=': '<',
+        'IN': 'NOT IN', 'NOT IN': 'IN',
+        'BETWEEN': 'NOT BETWEEN', 'NOT BETWEEN': 'BETWEEN',
+        'LIKE': 'NOT LIKE', 'NOT LIKE': 'LIKE',
+        'IS NULL': 'IS NOT NULL', 'IS NOT NULL': 'IS NULL',
+    }
+    
+    # Index lookup operators, most selective first
+    LOOKUP_OPERATORS = ('=', 'IN', 'BETWEEN', '>', '>=', '<', '<=')
+    
+    def compile(self, where: Dict[str, Any], table: Table) -> Predicate:
+        """Compile a WHERE expression into a function of a row of table"""
+        return self._compile(self.normalize(where), table)
+    
+    def compile_vectorized(self, where: Dict[str, Any], table: Table) -> Optional[VectorPredicate]:
+        """Compile a WHERE expression into a function computing the mask of matching rows of a ColumnStore
+        
+        Returns None when NumPy is missing or the expression needs the row
+        path: LIKE, columns a ColumnStore never holds, and literals compared
+        by converting row values.
+        """
+        if not ColumnStore.available():
+            return None
+        return self._compile_vectorized(self.normalize(where), table)
+    
+    def indexable_conjuncts(self, where: Dict[str, Any], table: Table) -> List[Tuple[str, str, Any]]:
+        """Get (column, operator, value) filters ANDed at the top of a WHERE expression
+        
+        Values are converted to the column type. Filters come most selective
+        operator first, with PRIMARY KEY/UNIQUE columns ahead of others.
+        """
+        node = self.normalize(where)
+        conjuncts = node['operands'] if node['operator'] == 'AND' else [node]
+        unique_columns = {column.name for column in table.get_unique_columns()}
+        
+        filters = []
+        for conjunct in conjuncts:
+            if conjunct['operator'] not in self.LOOKUP_OPERATORS:
+                continue
+            
+            column = self._column(table, conjunct['column'])
+            if conjunct['operator'] == 'IN':
+                literals = [self._coerce(column, value) for value in conjunct['values']]
+                value = [value for value, _ in literals]
+            elif conjunct['operator'] == 'BETWEEN':
+                literals = [self._coerce(column, conjunct['low']), self._coerce(column, conjunct['high'])]
+                value = (literals[0][0], literals[1][0])
+            else:
+                literals = [self._coerce(column, conjunct['value'])]
+                value = literals[0][0]
+            
+            # Only literals compared without converting row values can use an index
+            if all(literal is not None and convert is None for literal, convert in literals):
+                filters.append((column.name, conjunct['operator'], value))
+        
+        filters.sort(key=lambda f: (self.LOOKUP_OPERATORS.index(f[1]), f[0] not in unique_columns))
+        return filters
+    
+    def index_literal(self, table: Table, column_name: str, value: Any) -> Any:
+        """Convert a literal to the type of the values an index on the column holds
+        
+        Returns None for NULL and for literals that are compared by converting
+        row values instead, which no index can answer.
+        """
+        literal, convert = self._coerce(self._column(table, column_name), value)
+        return literal if convert is None else None
+    
+    def normalize(self, node: Dict[str, Any], negate: bool = False) -> Dict[str, Any]:
+        """Push NOT down to the leaves and flatten nested AND/OR"""
+        op = node['operator']
+        
+        if op == 'NOT':
+            return self.normalize(node['operand'], not negate)
+        
+        if op in ('AND', 'OR'):
+            if negate:
+                op = 'OR' if op == 'AND' else 'AND'
+            operands = []
+            for operand in node['operands']:
+                operand = self.normalize(operand, negate)
+                if operand['operator'] == op:
+                    operands.extend(operand['operands'])
+                else:
+                    operands.append(operand)
+            return {'operator': op, 'operands': operands}
+        
+        if negate:
+            return dict(node, operator=self.NEGATIONS[op])
+        return node
+    
+    def _compile(self, node: Dict[str, Any], table: Table) -> Predicate:
+        """Compile a normalized expression"""
+        op = node['operator']
+        
+        if op in ('AND', 'OR'):
+            return self._combine(op, [self._compile(operand, table) for operand in node['operands']])
+        
+        column = self._column(table, node['column'])
+        position = table.column_position(column.name)
+        
+        if op == 'IS NULL':
+            return lambda row: row[position] is None
+        if op == 'IS NOT NULL':
+            return lambda row: row[position] is not None
+        
+        if op in ('LIKE', 'NOT LIKE'):
+            return self._compile_like(position, node['value'], negate=op == 'NOT LIKE')
+        
+        if op == 'IN':
+            return self._compile_in(column, position, node['values'])
+        if op == 'NOT IN':
+            return self._combine('AND', [
+                self._compile_comparison(column, position, '!=', v) for v in node['values']
+            ])
+        
+        if op == 'BETWEEN':
+            return self._combine('AND', [
+                self._compile_comparison(column, position, '>=', node['low']),
+                self._compile_comparison(column, position, '<=', node['high'])
+            ])
+        if op == 'NOT BETWEEN':
+            return self._combine('OR', [
+                self._compile_comparison(column, position, '<', node['low']),
+                self._compile_comparison(column, position, '>', node['high'])
+            ])
+        
+        return self._compile_comparison(column, position, op, node['value'])
+    
+    def _compile_vectorized(self, node: Dict[str, Any], table: Table) -> Optional[VectorPredicate]:
+        """Compile a normalized expression over column arrays, following the row semantics of _compile"""
+        op = node['operator']
+        
+        if op in ('AND', 'OR'):
+            masks = [self._compile_vectorized(operand, table) for operand in node['operands']]
+            return None if None in masks else self._combine_vectorized(op, masks)
+        
+        column = self._column(table, node['column'])
+        position = table.column_position(column.name)
+        if column.data_type not in ColumnStore.TYPES or op in ('LIKE', 'NOT LIKE'):
+            return None
+        
+        if op in ('IS NULL', 'IS NOT NULL'):
+            is_null = op == 'IS NULL'
+            return lambda store: store.nulls(position, is_null)
+        
+        if op == 'IN':
+            literals = [self._coerce(column, value) for value in node['values']]
+            if any(convert is not None for _, convert in literals):
+                return None
+            members = [literal for literal, _ in literals if literal is not None]
+            return lambda store: store.isin(position, members)
+        
+        if op == 'NOT IN':
+            comparisons, combine = [('!=', value) for value in node['values']], 'AND'
+        elif op == 'BETWEEN':
+            comparisons, combine = [('>=', node['low']), ('<=', node['high'])], 'AND'
+        elif op == 'NOT BETWEEN':
+            comparisons, combine = [('<', node['low']), ('>', node['high'])], 'OR'
+        else:
+            comparisons, combine = [(op, node['value'])], 'AND'
+        
+        masks = []
+        for comparison, value in comparisons:
+            literal, convert = self._coerce(column, value)
+            if convert is not None:
+                return None
+            masks.append(self._compare_vectorized(position, comparison, literal))
+        return self._combine_vectorized(combine, masks)
+    
+    def _compare_vectorized(self, position: int, op: str, literal: Any) -> VectorPredicate:
+        """Compile 'column op literal' over column arrays"""
+        if literal is None:
+            return lambda store: store.mask(False)  # Comparing with NULL is never true
+        compare = self.COMPARISONS[op]
+        return lambda store: store.compare(position, compare, literal)
+    
+    def _combine_vectorized(self, op: str, masks: List[VectorPredicate]) -> VectorPredicate:
+        """Join vectorized predicates with AND or OR"""
+        def combined(store: ColumnStore) -> Any:
+            result = None
+            for compute in masks:
+                mask = compute(store)
+                if mask is None:
+                    return None
+                if result is None:
+                    result = mask
+                elif op == 'AND':
+                    result &= mask
+                else:
+                    result |= mask
+            
+            # An empty AND holds, an empty OR does not
+            return store.mask(op == 'AND') if result is None else result
+        
+        return combined
+    
+    def _compile_comparison(self, column: Column, position: int, op: str, value: Any) -> Predicate:
+        """Compile 'column op value' for a single literal, the column being at position in a row"""
+        literal, convert = self._coerce(column, value)
+        if literal is None:
+            return self._never  # Comparing with NULL is never true
+        
+        compare = self.COMPARISONS[op]
+        
+        if convert is not None:
+            def converted_predicate(row: Row) -> bool:
+                row_value = convert(row[position])
+                return row_value is not None and compare(row_value, literal)
+            
+            return converted_predicate
+        
+        if op == '=':
+            def equals_predicate(row: Row) -> bool:
+                row_value = row[position]
+                return row_value is not None and row_value == literal
+            
+            return equals_predicate
+        
+        def predicate(row: Row) -> bool:
+            row_value = row[position]
+            return row_value is not None and compare(row_value, literal)
+        
+        return predicate
+    
+    def _compile_in(self, column: Column, position: int, values: List[Any]) -> Predicate:
+        """Compile 'column IN (values)' as a set lookup when no conversion is needed"""
+        literals = [self._coerce(column, value) for value in values]
+        literals = [(literal, convert) for literal, convert in literals if literal is not None]
+        
+        if any(convert is not None for _, convert in literals):
+            return self._combine('OR', [
+                self._compile_comparison(column, position, '=', literal) for literal, _ in literals
+            ])
+        
+        members = {literal for literal, _ in literals}
+        return lambda row: row[position] in members
+    
+    def _compile_like(self, position: int, pattern: Any, negate: bool) -> Predicate:
+        """Compile a LIKE pattern, where % matches any text and _ one character"""
+        if pattern is None:
+            return self._never
+        
+        regex = ''.join(
+            '.*' if char == '%' else '.' if char == '_' else re.escape(char)
+            for char in str(pattern)
+        )
+        match = re.compile(regex, re.DOTALL).fullmatch
+        
+        if negate:
+            def not_like_predicate(row: Row) -> bool:
+                row_value = row[position]
+                return row_value is not None and match(str(row_value)) is None
+            
+            return not_like_predicate
+        
+        def like_predicate(row: Row) -> bool:
+            row_value = row[position]
+            return row_value is not None and match(str(row_value)) is not None
+        
+        return like_predicate
+    
+    def _combine(self, op: str, predicates: List[Predicate]) -> Predicate:
+        """Join predicates with AND or OR"""
+        if not predicates:
+            # An empty AND (e.g. NOT IN with no values) holds, an empty OR does not
+            return self._always if op == 'AND' else self._never
+        
+        first = predicates[0]
+        if len(predicates) == 1:
+            return first
+        
+        rest = self._combine(op, predicates[1:])
+        if op == 'AND':
+            return lambda row: first(row) and rest(row)
+        return lambda row: first(row) or rest(row)
+    
+    def _coerce(self, column: Column, value: Any) -> Tuple[Any, Optional[Callable[[Any], Any]]]:
+        """Convert a literal to a column's type
+        
+        Returns the literal and, when row values must be converted instead
+        (a number compared with a text column), a function converting them.
+        """
+        if value is None:
+            return None, None
+        
+        if column.data_type in ('INTEGER', 'FLOAT'):
+            number = self._parse_number(value)
+            if number is not None:
+                return (float(number) if column.data_type == 'FLOAT' else number), None
+        
+        elif column.data_type == 'BOOLEAN':
+            if isinstance(value, bool):
+                return value, None
+            if value in (0, 1):
+                return bool(value), None
+            if isinstance(value, str) and value.lower() in ('true', 'false'):
+                return value.lower() == 'true', None
+        
+        elif column.data_type in ('VARCHAR', 'DATE'):
+            if isinstance(value, str):
+                return value, None
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                # Quoted numbers reach the executor as numbers; compare text numerically
+                return value, self._parse_number
+        
+        raise InvalidDataTypeException(
+            f"Cannot compare {column.data_type} column '{column.name}' with {value!r}"
+        )
+    
+    def _column(self, table: Table, column_name: str) -> Column:
+        """Get a column referenced by a WHERE expression"""
+        column = table.get_column(column_name)
+        if column is None:
+            raise ColumnNotFoundException(
+                f"Column '{column_name}' does not exist in table '{table.name}'"
+            )
+        return column
+    
+    @staticmethod
+    def _parse_number(value: Any) -> Any:
+        """Read a value as int or float, or None if it is not a number"""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        if not isinstance(value, str):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _always(row: Row) -> bool:
+        """Predicate that holds for every row"""
+        return True
+    
+    @staticmethod
+    def _never(row: Row) -> bool:
+        """Predicate that holds for no row"""
+        return False
\ No newline at end of file
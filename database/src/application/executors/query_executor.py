@@ -1,35 +1,383 @@
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from ...domain.models.transaction import Transaction
 from ...domain.services.schema_service import SchemaService
 from ...domain.services.data_service import DataService
-from ..parsers.sql_parser import SQLParser
+from ...domain.services.table_cache import TableCache
+from ...domain.services.lock_manager import LockManager
+from ...domain.exceptions import ParseException, TransactionException
+from ...infrastructure.storage.bulk_reader import read_rows
+from ..parsers.recursive_descent_parser import RecursiveDescentParser
+from ..parsers.prepared_statement import PreparedStatement
+from .predicate_compiler import PredicateCompiler
+from .query_planner import QueryPlanner, QueryPlan
+from .cursor import Cursor
+
+class LockedRows:
+    """Iterator over a streamed SELECT's rows that keeps its tables read-locked while they are read
+    
+    holds are the statement's read locks, taken by LockManager.acquire().
+    They are released once the rows run out or are closed, so writers
+    cannot shift the row positions of an open cursor. A writer waiting for
+    one of the locks has the remaining rows read into memory first, which
+    releases them early rather than leave it waiting on an unread stream.
+    """
+    
+    def __init__(self, rows: Iterator[Dict[str, Any]], locks: LockManager, holds: List[Any]):
+        self.rows = rows
+        self.locks = locks
+        self.holds = holds
+        self._mutex = threading.RLock()  # the writer's thread may buffer the rows while the reader's reads them
+        
+        writer_waiting = False
+        for lock, _ in holds:
+            writer_waiting = lock.add_yielder(self._buffer) or writer_waiting
+        if writer_waiting:
+            self._buffer()
+    
+    def __iter__(self) -> 'LockedRows':
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        with self._mutex:
+            try:
+                return next(self.rows)
+            except StopIteration:
+                self.close()
+                raise
+    
+    def close(self) -> None:
+        """Stop producing rows and release the read locks"""
+        with self._mutex:
+            if self.holds is None:
+                return
+            close = getattr(self.rows, 'close', None)
+            if close is not None:
+                close()
+            self._release()
+    
+    def _buffer(self) -> None:
+        """Read the remaining rows into memory and release the read locks, for a waiting writer"""
+        with self._mutex:
+            if self.holds is None:
+                return
+            rows = []
+            try:
+                rows.extend(self.rows)
+            except Exception as e:
+                # Raised to the reader once it reaches the failing row
+                self.rows = self._buffered(rows, e)
+            else:
+                self.rows = iter(rows)
+            self._release()
+    
+    def _release(self) -> None:
+        """Release the read locks and stop yielding them to writers"""
+        for lock, _ in self.holds:
+            lock.remove_yielder(self._buffer)
+        self.locks.release(self.holds)
+        self.holds = None
+    
+    @staticmethod
+    def _buffered(rows: List[Dict[str, Any]], error: Exception) -> Iterator[Dict[str, Any]]:
+        """Produce buffered rows, then raise the error that ended reading them"""
+        yield from rows
+        raise error
+    
+    def __del__(self):
+        self.close()
+
+class SnapshotRows:
+    """Iterator over a streamed SELECT's rows that holds the snapshot they are read from
+    
+    The snapshot is released once the rows run out or are closed, so
+    writers change overlays of its tables only while it is read.
+    """
+    
+    def __init__(self, rows: Iterator[Dict[str, Any]], schema_service: SchemaService,
+                 snapshot: Dict[str, Any]):
+        self.rows = rows
+        self.schema_service = schema_service
+        self.snapshot = snapshot
+    
+    def __iter__(self) -> 'SnapshotRows':
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        try:
+            return next(self.rows)
+        except StopIteration:
+            self.close()
+            raise
+    
+    def close(self) -> None:
+        """Stop producing rows and release the snapshot"""
+        if self.snapshot is None:
+            return
+        close = getattr(self.rows, 'close', None)
+        if close is not None:
+            close()
+        self.schema_service.release_snapshot(self.snapshot)
+        self.snapshot = None
+    
+    def __del__(self):
+        self.close()
+
+class Session:
+    """A client's state between statements: the transaction it has open, if any"""
+    
+    def __init__(self):
+        self.transaction: Optional[Transaction] = None
 
 class QueryExecutor:
-    """Executes parsed SQL queries"""
+    """Executes parsed SQL queries
+    
+    One executor may be shared by many threads. SELECT and EXPLAIN read a
+    snapshot of their tables without locking them (see
+    SchemaService.hold_snapshot), so readers and writers never wait for
+    each other; on storages without SNAPSHOT_READS they hold the tables'
+    read locks. Every other statement holds the write locks of the tables
+    it touches. Statements run in a Session,
+    by default one per thread. Between BEGIN and COMMIT or ROLLBACK the
+    session's transaction keeps the write locks of the tables it changed;
+    waiting for a lock then times out after lock_timeout seconds, as two
+    transactions may each hold what the other needs. Changes are flushed
+    to storage on commit (see CommitService), and COMMIT and each write
+    outside a transaction return once their changes are stored.
+    """
+    
+    STATEMENT_CACHE_SIZE = 256
+    DEFAULT_LOCK_TIMEOUT = 10.0
+    
+    # Statements that change rows, run as a transaction of their own outside BEGIN ... COMMIT
+    WRITE_STATEMENTS = ('INSERT', 'COPY', 'UPDATE', 'DELETE')
+    # Statements allowed between BEGIN and COMMIT
+    TRANSACTION_STATEMENTS = WRITE_STATEMENTS + ('SELECT', 'EXPLAIN')
     
-    def __init__(self, storage):
+    def __init__(self, storage, cache_size_bytes: int = TableCache.DEFAULT_MAX_BYTES):
         self.storage = storage
-        self.schema_service = SchemaService(storage)
+        self.schema_service = SchemaService(storage, cache_size_bytes)
         self.data_service = DataService(storage, self.schema_service)
-        self.parser = SQLParser()
+        self.parser = RecursiveDescentParser()
+        self.predicate_compiler = PredicateCompiler()
+        self.planner = QueryPlanner(self.schema_service, self.data_service.index_service,
+                                    self.predicate_compiler)
+        self.locks = self.data_service.locks
+        self.commit_service = self.data_service.commit_service
+        self.lock_timeout = self.DEFAULT_LOCK_TIMEOUT
+        self._statements = OrderedDict()  # SQL text -> PreparedStatement, least recently used first
+        self._statements_mutex = threading.Lock()
+        self._thread_sessions = threading.local()
+    
+    def prepare(self, sql: str) -> PreparedStatement:
+        """Parse a statement once, reusing the cached template for repeated SQL text"""
+        with self._statements_mutex:
+            statement = self._statements.get(sql)
+            if statement is not None:
+                self._statements.move_to_end(sql)
+                return statement
+        
+        statement = PreparedStatement(sql, self.parser.parse(sql))
+        with self._statements_mutex:
+            self._statements[sql] = statement
+            if len(self._statements) > self.STATEMENT_CACHE_SIZE:
+                self._statements.popitem(last=False)
+        
+        return statement
+    
+    def cursor(self, session: Optional[Session] = None) -> Cursor:
+        """Open a cursor fetching the rows of SELECT statements as they are produced"""
+        return Cursor(self, session)
+    
+    def list_tables(self) -> List[str]:
+        """Get the names of all tables"""
+        return self.schema_service.list_tables()
+    
+    def session(self) -> Session:
+        """Open a session, for a client whose statements are not all run by one thread"""
+        return Session()
+    
+    def execute(self, sql: Union[str, PreparedStatement], params=None, stream: bool = False,
+                session: Optional[Session] = None) -> Dict[str, Any]:
+        """Execute SQL statement and return result
+        
+        sql is SQL text or a statement returned by prepare(); params holds the
+        values of its placeholders, a list for ? and a dict for :name. With
+        stream, a SELECT result holds an iterator producing its rows as they
+        are pulled, and no row count. session defaults to the calling
+        thread's own.
+        """
+        # Parse SQL (cached) and bind parameters
+        statement = sql if isinstance(sql, PreparedStatement) else self.prepare(sql)
+        parsed = statement.bind(params)
+        
+        if session is None:
+            session = self._thread_session()
+        if parsed['type'] in ('BEGIN', 'COMMIT', 'ROLLBACK'):
+            return self._execute_transaction_control(parsed, session)
+        if session.transaction is not None:
+            return self._execute_in_transaction(parsed, stream, session.transaction)
+        
+        reads, writes = self._locked_tables(parsed)
+        if parsed['type'] in self.WRITE_STATEMENTS:
+            # Hand the changes over before releasing the locks, then wait for them to be stored
+            transaction = Transaction(explicit=False)
+            with self.locks.lock(reads, writes, owner=self.commit_service):
+                try:
+                    result = self._execute_parsed(parsed, stream, transaction)
+                    self.commit_service.commit(transaction)
+                finally:
+                    self.schema_service.end_changes(transaction)
+            self.commit_service.wait(transaction)
+            return result
+        if not writes:
+            return self._execute_read(parsed, stream, reads)
+        
+        # Statements changing schemas wait until changes being flushed are stored
+        with self.locks.lock(writes=writes):
+            return self._execute_parsed(parsed, stream)
+    
+    def _thread_session(self) -> Session:
+        """Get the calling thread's session"""
+        session = getattr(self._thread_sessions, 'session', None)
+        if session is None:
+            session = self._thread_sessions.session = Session()
+        return session
+    
+    def _execute_transaction_control(self, parsed: Dict[str, Any], session: Session) -> Dict[str, Any]:
+        """Execute BEGIN, COMMIT or ROLLBACK"""
+        transaction = session.transaction
+        if parsed['type'] == 'BEGIN':
+            if transaction is not None:
+                raise TransactionException("A transaction is already in progress")
+            session.transaction = Transaction()
+            return {'success': True, 'message': "Transaction started", 'affected_rows': 0}
+        
+        if transaction is None:
+            raise TransactionException(f"No transaction in progress to {parsed['type'].lower()}")
+        session.transaction = None
+        
+        if parsed['type'] == 'ROLLBACK':
+            # The transaction's changes are on its own table overlays, so dropping it undoes them
+            self.locks.release(transaction.holds)
+            return {'success': True, 'message': "Transaction rolled back", 'affected_rows': 0}
+        
+        try:
+            self.commit_service.commit(transaction)
+        finally:
+            self.locks.release(transaction.holds)
+        self.commit_service.wait(transaction)
+        return {'success': True, 'message': "Transaction committed", 'affected_rows': 0}
     
-    def execute(self, sql: str) -> Dict[str, Any]:
-        """Execute SQL statement and return result"""
-        # Parse SQL
-        parsed = self.parser.parse(sql)
+    def _execute_in_transaction(self, parsed: Dict[str, Any], stream: bool,
+                                transaction: Transaction) -> Dict[str, Any]:
+        """Execute a statement inside an explicit transaction
         
-        # Route to appropriate executor
+        Tables the transaction writes stay write-locked until it ends and
+        are read from its own overlays; other tables are read as by a
+        statement outside it.
+        """
+        if parsed['type'] not in self.TRANSACTION_STATEMENTS:
+            raise TransactionException(f"{parsed['type'].replace('_', ' ')} cannot run inside a transaction")
+        
+        reads, writes = self._locked_tables(parsed)
+        new_writes = [table_name for table_name in writes if table_name not in transaction.write_locked]
+        if new_writes:
+            transaction.holds.extend(
+                self.locks.acquire(writes=new_writes, timeout=self.lock_timeout, owner=self.commit_service)
+            )
+            transaction.write_locked.update(new_writes)
+        if not writes:
+            reads = [table_name for table_name in reads if table_name not in transaction.write_locked]
+            return self._execute_read(parsed, stream, reads, transaction)
+        
+        with self.schema_service.using_transaction(transaction):
+            return self._execute_parsed(parsed, stream, transaction)
+    
+    def _execute_read(self, parsed: Dict[str, Any], stream: bool, reads: List[str],
+                      transaction: Optional[Transaction] = None) -> Dict[str, Any]:
+        """Execute SELECT or EXPLAIN, reading its tables from a snapshot when the storage allows
+        
+        Tables not in the cache, such as ones changed by another process,
+        are read under their read locks instead, which loads those the
+        statement needs for later snapshots. Reads see changes still being
+        flushed. Inside a transaction lock waits time out, and the tables it
+        writes are read from its own overlays.
+        """
+        snapshot = self.schema_service.hold_snapshot(reads) if self.storage.SNAPSHOT_READS else None
+        if snapshot is None:
+            timeout = None if transaction is None else self.lock_timeout
+            holds = self.locks.acquire(reads, timeout=timeout, owner=self.commit_service)
+            try:
+                with self.schema_service.using_transaction(transaction):
+                    result = self._execute_parsed(parsed, stream)
+            except BaseException:
+                self.locks.release(holds)
+                raise
+            
+            # Streamed rows keep the read locks until they are read
+            if stream and 'rows' in result:
+                result['rows'] = LockedRows(iter(result['rows']), self.locks, holds)
+            else:
+                self.locks.release(holds)
+            return result
+        
+        try:
+            with self.schema_service.using_transaction(transaction), self.schema_service.using_snapshot(snapshot):
+                result = self._execute_parsed(parsed, stream)
+        except BaseException:
+            self.schema_service.release_snapshot(snapshot)
+            raise
+        
+        if stream and 'rows' in result:
+            result['rows'] = SnapshotRows(iter(result['rows']), self.schema_service, snapshot)
+        else:
+            self.schema_service.release_snapshot(snapshot)
+        return result
+    
+    def _locked_tables(self, parsed: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Get the tables a statement reads and the tables it writes"""
+        statement = parsed['statement'] if parsed['type'] == 'EXPLAIN' else parsed
+        if 'join' in statement:
+            table_names = [statement['join']['left_table'], statement['join']['right_table']]
+        elif parsed['type'] == 'DROP_INDEX':
+            table_name = self.schema_service.find_index_table(parsed['index_name'])
+            table_names = [] if table_name is None else [table_name]
+        elif parsed['type'] == 'ANALYZE' and not parsed['table_name']:
+            table_names = self.schema_service.list_tables()
+        else:
+            table_names = [statement['table_name']] if statement.get('table_name') else []
+        
+        if parsed['type'] in ('SELECT', 'EXPLAIN'):
+            return table_names, []
+        return [], table_names
+    
+    def _execute_parsed(self, parsed: Dict[str, Any], stream: bool,
+                        transaction: Optional[Transaction] = None) -> Dict[str, Any]:
+        """Route a bound statement to its executor, recording changes in transaction"""
         if parsed['type'] == 'CREATE':
             return self._execute_create(parsed)
         elif parsed['type'] == 'DROP':
             return self._execute_drop(parsed)
+        elif parsed['type'] == 'CREATE_INDEX':
+            return self._execute_create_index(parsed)
+        elif parsed['type'] == 'DROP_INDEX':
+            return self._execute_drop_index(parsed)
         elif parsed['type'] == 'INSERT':
-            return self._execute_insert(parsed)
+            return self._execute_insert(parsed, transaction)
+        elif parsed['type'] == 'COPY':
+            return self._execute_copy(parsed, transaction)
         elif parsed['type'] == 'SELECT':
-            return self._execute_select(parsed)
+            return self._execute_select(parsed, stream)
         elif parsed['type'] == 'UPDATE':
-            return self._execute_update(parsed)
+            return self._execute_update(parsed, transaction)
         elif parsed['type'] == 'DELETE':
-            return self._execute_delete(parsed)
+            return self._execute_delete(parsed, transaction)
+        elif parsed['type'] == 'EXPLAIN':
+            return self._execute_explain(parsed)
+        elif parsed['type'] == 'ANALYZE':
+            return self._execute_analyze(parsed)
     
     def _execute_create(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
         """Execute CREATE TABLE"""
@@ -54,42 +402,90 @@ class QueryExecutor:
             'affected_rows': 0
         }
     
-    def _execute_insert(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_create_index(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute CREATE INDEX"""
+        self.schema_service.create_index(
+            table_name=parsed['table_name'],
+            index_name=parsed['index_name'],
+            column_name=parsed['column'],
+            kind=parsed['index_type']
+        )
+        
+        # Build the index now rather than on the first query that needs it
+        self.schema_service.get_table(parsed['table_name'])
+        
+        return {
+            'success': True,
+            'message': f"Index '{parsed['index_name']}' created on '{parsed['table_name']}'",
+            'affected_rows': 0
+        }
+    
+    def _execute_drop_index(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute DROP INDEX"""
+        table_name = self.schema_service.drop_index(parsed['index_name'])
+        
+        return {
+            'success': True,
+            'message': f"Index '{parsed['index_name']}' dropped from '{table_name}'",
+            'affected_rows': 0
+        }
+    
+    def _execute_insert(self, parsed: Dict[str, Any], transaction: Optional[Transaction] = None) -> Dict[str, Any]:
         """Execute INSERT"""
-        # Create row dictionary from columns and values
-        row = dict(zip(parsed['columns'], parsed['values']))
+        # Create row dictionaries from columns and values
+        columns = parsed['columns']
+        rows = []
+        for values in parsed['rows']:
+            if len(values) != len(columns):
+                raise ParseException(
+                    f"INSERT has {len(columns)} column(s) but {len(values)} value(s)"
+                )
+            rows.append(dict(zip(columns, values)))
         
-        self.data_service.insert_row(parsed['table_name'], row)
+        count = self.data_service.insert_rows(parsed['table_name'], rows, transaction)
         
         return {
             'success': True,
-            'message': f"1 row inserted into '{parsed['table_name']}'",
-            'affected_rows': 1
+            'message': f"{count} row{'' if count == 1 else 's'} inserted into '{parsed['table_name']}'",
+            'affected_rows': count
         }
     
-    def _execute_select(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute SELECT"""
-        # Check if it's a JOIN query
-        if 'join' in parsed:
-            rows = self.data_service.join_tables(
-                left_table_name=parsed['join']['left_table'],
-                right_table_name=parsed['join']['right_table'],
-                left_column=parsed['join']['left_column'],
-                right_column=parsed['join']['right_column'],
-                select_columns=parsed['columns']
-            )
+    def _execute_copy(self, parsed: Dict[str, Any], transaction: Optional[Transaction] = None) -> Dict[str, Any]:
+        """Execute COPY (bulk load from a file)"""
+        table = self.schema_service.get_table(parsed['table_name'])
+        
+        # CSV fields are text and need converting to the column types
+        rows = read_rows(parsed['file_path'], parsed['format'])
+        if parsed['format'] == 'CSV':
+            rows = [self.schema_service.convert_text_row(table, row) for row in rows]
+        
+        # The whole file is one batch: validated together, written once
+        count = self.data_service.insert_rows(parsed['table_name'], list(rows), transaction)
+        
+        return {
+            'success': True,
+            'message': f"{count} row(s) copied into '{parsed['table_name']}'",
+            'affected_rows': count
+        }
+    
+    def _execute_select(self, parsed: Dict[str, Any], stream: bool = False) -> Dict[str, Any]:
+        """Execute SELECT, building the row list unless streaming"""
+        plan = self.planner.plan(parsed)
+        if plan.from_statistics:
+            rows = [{parsed['columns'][0]: self.data_service.count_rows(parsed['table_name'])}]
+            end = None if plan.limit is None else plan.offset + plan.limit
+            rows = iter(rows[plan.offset:end])
         else:
-            # Build WHERE condition function if present
-            where_func = None
-            if 'where' in parsed:
-                where_func = self._build_where_function(parsed['where'])
-            
-            rows = self.data_service.select_rows(
-                table_name=parsed['table_name'],
-                columns=parsed['columns'],
-                where_condition=where_func
-            )
+            rows = self._run_select(parsed, plan)
         
+        if stream:
+            return {
+                'success': True,
+                'message': "Rows streamed",
+                'rows': rows
+            }
+        
+        rows = list(rows)
         return {
             'success': True,
             'message': f"{len(rows)} row(s) returned",
@@ -97,20 +493,24 @@ class QueryExecutor:
             'row_count': len(rows)
         }
     
-    def _execute_update(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_update(self, parsed: Dict[str, Any], transaction: Optional[Transaction] = None) -> Dict[str, Any]:
         """Execute UPDATE"""
         # Build updates dictionary
-        updates = {parsed['set']['column']: parsed['set']['value']}
+        updates = {}
+        for assignment in parsed['set']:
+            if assignment['column'] in updates:
+                raise ParseException(f"Column '{assignment['column']}' assigned more than once")
+            updates[assignment['column']] = assignment['value']
         
-        # Build WHERE condition function if present
-        where_func = None
-        if 'where' in parsed:
-            where_func = self._build_where_function(parsed['where'])
+        # Plan how to find the rows to update
+        plan = self.planner.plan(parsed)
         
         count = self.data_service.update_rows(
             table_name=parsed['table_name'],
             updates=updates,
-            where_condition=where_func
+            where_condition=plan.predicate,
+            lookup=plan.lookup,
+            transaction=transaction
         )
         
         return {
@@ -119,16 +519,16 @@ class QueryExecutor:
             'affected_rows': count
         }
     
-    def _execute_delete(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_delete(self, parsed: Dict[str, Any], transaction: Optional[Transaction] = None) -> Dict[str, Any]:
         """Execute DELETE"""
-        # Build WHERE condition function if present
-        where_func = None
-        if 'where' in parsed:
-            where_func = self._build_where_function(parsed['where'])
+        # Plan how to find the rows to delete
+        plan = self.planner.plan(parsed)
         
         count = self.data_service.delete_rows(
             table_name=parsed['table_name'],
-            where_condition=where_func
+            where_condition=plan.predicate,
+            lookup=plan.lookup,
+            transaction=transaction
         )
         
         return {
@@ -137,45 +537,117 @@ class QueryExecutor:
             'affected_rows': count
         }
     
-    def _build_where_function(self, where_clause: Dict[str, Any]):
-        """Build a WHERE condition function from parsed clause"""
-        column = where_clause['column']
-        operator = where_clause['operator']
-        value = where_clause['value']
+    def _execute_explain(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute EXPLAIN: show the chosen plan with estimated and actual row counts
         
+        SELECT statements are run; UPDATE and DELETE only count the rows they
+        would change, leaving the table untouched.
+        """
+        statement = parsed['statement']
+        if statement['type'] not in ('SELECT', 'UPDATE', 'DELETE'):
+            raise ParseException("EXPLAIN supports SELECT, UPDATE and DELETE statements")
         
-        def where_func(row: Dict[str, Any]) -> bool:
-            row_value = row.get(column)
-            
-            # Handle None values
-            if row_value is None:
-                return False
-            
-            # Try to convert both values to the same type for comparison
-            try:
-                # If value is int, try to convert row_value to int
-                if isinstance(value, int):
-                    row_value = int(row_value)
-                # If value is float, try to convert row_value to float
-                elif isinstance(value, float):
-                    row_value = float(row_value)
-            except (ValueError, TypeError):
-                pass  # Keep original types if conversion fails
-            
-            result = False
-            if operator == '=':
-                result = row_value == value
-            elif operator == '!=':
-                result = row_value != value
-            elif operator == '>':
-                result = row_value > value
-            elif operator == '<':
-                result = row_value < value
-            elif operator == '>=':
-                result = row_value >= value
-            elif operator == '<=':
-                result = row_value <= value
-            
-            return result
+        plan = self.planner.plan(statement)
         
-        return where_func
\ No newline at end of file
+        if statement['type'] != 'SELECT':
+            scanned, matched = self.data_service.match_counts(
+                statement['table_name'], plan.predicate, plan.lookup
+            )
+            counters = {'scanned': scanned, 'matched': matched, 'returned': matched}
+        elif plan.from_statistics:
+            counters = {'returned': 1}
+        else:
+            # Pull every row through the plan to count them, without keeping them
+            counters = {}
+            for _ in self._run_select(statement, plan, counters):
+                pass
+        plan.record_actual_rows(counters)
+        
+        lines = plan.root.format()
+        return {
+            'success': True,
+            'message': f"Plan for {statement['type']}",
+            'plan': lines,
+            'rows': [{'QUERY PLAN': line} for line in lines],
+            'row_count': len(lines)
+        }
+    
+    def _execute_analyze(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute ANALYZE, for one table or every table"""
+        table_names = [parsed['table_name']] if parsed['table_name'] else self.schema_service.list_tables()
+        
+        for table_name in table_names:
+            table = self.schema_service.get_table(table_name)
+            self.schema_service.statistics_service.analyze(table)
+        
+        if parsed['table_name']:
+            message = f"Table '{parsed['table_name']}' analyzed"
+        else:
+            message = f"{len(table_names)} table(s) analyzed"
+        
+        return {
+            'success': True,
+            'message': message,
+            'affected_rows': 0
+        }
+    
+    def _run_select(self, parsed: Dict[str, Any], plan: QueryPlan,
+                    counters: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """Run a planned SELECT, producing its rows as they are pulled and counting each step into counters"""
+        if 'aggregates' in parsed and 'join' in parsed:
+            return self.data_service.aggregate_join(
+                left_table_name=parsed['join']['left_table'],
+                right_table_name=parsed['join']['right_table'],
+                left_column=parsed['join']['left_column'],
+                right_column=parsed['join']['right_column'],
+                group_by=plan.group_by,
+                aggregates=plan.aggregates,
+                columns=parsed['columns'],
+                strategy=plan.join_strategy,
+                having=plan.having,
+                order_by=plan.order_by,
+                limit=plan.limit,
+                offset=plan.offset,
+                counters=counters
+            )
+        if 'aggregates' in parsed:
+            return self.data_service.aggregate_rows(
+                table_name=parsed['table_name'],
+                group_by=plan.group_by,
+                aggregates=plan.aggregates,
+                columns=parsed['columns'],
+                where_condition=plan.predicate,
+                lookup=plan.lookup,
+                having=plan.having,
+                order_by=plan.order_by,
+                limit=plan.limit,
+                offset=plan.offset,
+                counters=counters,
+                vector_condition=plan.vector_predicate
+            )
+        if 'join' in parsed:
+            return self.data_service.iter_join(
+                left_table_name=parsed['join']['left_table'],
+                right_table_name=parsed['join']['right_table'],
+                left_column=parsed['join']['left_column'],
+                right_column=parsed['join']['right_column'],
+                select_columns=parsed['columns'],
+                strategy=plan.join_strategy,
+                order_by=plan.order_by,
+                limit=plan.limit,
+                offset=plan.offset,
+                counters=counters
+            )
+        
+        return self.data_service.iter_rows(
+            table_name=parsed['table_name'],
+            columns=parsed['columns'],
+            where_condition=plan.predicate,
+            lookup=plan.lookup,
+            order_by=plan.order_by,
+            limit=plan.limit,
+            offset=plan.offset,
+            order_index=plan.order_index,
+            counters=counters,
+            vector_condition=plan.vector_predicate
+        )
\ No newline at end of file
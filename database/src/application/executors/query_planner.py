@@ -0,0 +1,597 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+from ...domain.models.table import Table, Column
+from ...domain.models.statistics import ColumnStatistics
+from ...domain.exceptions import ColumnNotFoundException, InvalidDataTypeException, ParseException
+from .predicate_compiler import PredicateCompiler, Predicate, VectorPredicate
+
+@dataclass
+class PlanNode:
+    """A step of a physical query plan"""
+    operation: str
+    detail: str
+    estimated_rows: float
+    cost: float
+    children: List['PlanNode'] = field(default_factory=list)
+    counter: str = 'returned'  # execution counter holding the step's actual row count
+    actual_rows: Optional[int] = None
+    
+    def walk(self):
+        """Yield the step and every step below it"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+    
+    def format(self, depth: int = 0) -> List[str]:
+        """Render the step and its inputs as indented lines"""
+        counts = f"cost={self.cost:.1f}, estimated rows={round(self.estimated_rows)}"
+        if self.actual_rows is not None:
+            counts += f", actual rows={self.actual_rows}"
+        
+        prefix = '  ' * depth + ('-> ' if depth else '')
+        lines = [f"{prefix}{self.operation} {self.detail}  ({counts})"]
+        for child in self.children:
+            lines.extend(child.format(depth + 1))
+        return lines
+
+@dataclass
+class QueryPlan:
+    """Physical plan of a statement, with the choices the executor carries out"""
+    root: PlanNode
+    predicate: Optional[Predicate] = None
+    vector_predicate: Optional[VectorPredicate] = None  # predicate over column arrays, None if it needs rows
+    lookup: Optional[Tuple[str, str, Any]] = None  # index lookup, None for a full scan
+    join_strategy: Optional[str] = None  # one of DataService.JOIN_STRATEGIES
+    from_statistics: bool = False  # COUNT(*) answered from the stored row count
+    order_by: Optional[List[Tuple[str, bool]]] = None  # (column, descending) sort keys
+    order_index: Optional[str] = None  # ordered index read instead of sorting
+    limit: Optional[int] = None
+    offset: int = 0
+    group_by: Optional[List[Tuple[str, str]]] = None  # (result name, input column) grouping keys
+    aggregates: Optional[List[Tuple[str, str, str]]] = None  # (result name, function, input column)
+    having: Optional[Predicate] = None  # HAVING condition on result rows
+    
+    def record_actual_rows(self, counters: Dict[str, int]) -> None:
+        """Fill in actual row counts from the counters collected while running the plan"""
+        for node in self.root.walk():
+            node.actual_rows = counters.get(node.counter)
+
+class QueryPlanner:
+    """Chooses physical plans for statements from table statistics
+    
+    Costs are in rows touched. Row counts come from the tables, value counts
+    from their indexes and otherwise from the column statistics ANALYZE
+    stores; filters none of these can estimate get the fixed selectivities
+    below.
+    """
+    
+    # Fraction of rows assumed to pass a filter the statistics cannot estimate
+    DEFAULT_SELECTIVITY = {
+        '=': 0.1,
+        'RANGE': 1 / 3,
+        'BETWEEN': 0.25,
+        'LIKE': 0.25,
+        'IS NULL': 0.1,
+    }
+    
+    INDEX_PROBE_COST = 1.0  # per index lookup
+    INDEX_ROW_COST = 1.5  # per row found through an index, read out of table order
+    HASH_BUILD_COST = 2.0  # per row hashed for a join
+    COMPARE_COST = 0.25  # per row per comparison of a sort
+    
+    RANGE_OPERATORS = ('>', '<', '>=', '<=', 'BETWEEN')
+    NEGATED_OPERATORS = ('!=', 'NOT IN', 'NOT BETWEEN', 'NOT LIKE', 'IS NOT NULL')
+    
+    def __init__(self, schema_service, index_service, predicate_compiler: PredicateCompiler):
+        self.schema_service = schema_service
+        self.index_service = index_service
+        self.predicate_compiler = predicate_compiler
+    
+    def plan(self, parsed: Dict[str, Any]) -> QueryPlan:
+        """Build the physical plan of a parsed SELECT, UPDATE or DELETE"""
+        limit, offset = self._paging(parsed, 'limit'), self._paging(parsed, 'offset') or 0
+        
+        if self._counts_whole_table(parsed):
+            # Counting a whole table needs only its statistics
+            count = PlanNode('Row Count', f"from statistics of {parsed['table_name']}", 1, 1.0)
+            return QueryPlan(PlanNode('Aggregate', 'COUNT(*)', 1, 1.0, [count]), from_statistics=True,
+                             limit=limit, offset=offset)
+        
+        if 'join' in parsed:
+            plan = self._plan_join(parsed)
+        else:
+            table = self.schema_service.get_table(parsed['table_name'])
+            plan = self._plan_scan(parsed['table_name'], parsed.get('where'))
+        plan.limit, plan.offset = limit, offset
+        
+        # Aggregated rows are sorted and paged by their result names
+        if 'aggregates' in parsed:
+            result_table = self._add_aggregate(plan, parsed)
+            plan.order_by = self._order_by(parsed, result_table)
+        elif 'join' in parsed:
+            plan.order_by = self._join_order_by(parsed)
+        else:
+            plan.order_by = self._order_by(parsed, table)
+        
+        if plan.order_by:
+            if 'join' not in parsed and 'aggregates' not in parsed:
+                self._choose_index_order(plan, table)
+            if plan.order_index is None:
+                self._add_sort(plan)
+        if limit is not None or offset:
+            self._add_limit(plan)
+        
+        child = plan.root
+        if parsed['type'] == 'SELECT':
+            operation, detail = 'Project', ', '.join(parsed['columns'])
+        elif parsed['type'] == 'UPDATE':
+            operation = 'Update'
+            detail = f"{parsed['table_name']} SET {', '.join(a['column'] for a in parsed['set'])}"
+        else:
+            operation, detail = 'Delete', f"from {parsed['table_name']}"
+        
+        plan.root = PlanNode(operation, detail, child.estimated_rows, child.cost, [child])
+        return plan
+    
+    def _plan_scan(self, table_name: str, where: Optional[Dict[str, Any]]) -> QueryPlan:
+        """Choose between a full scan and an index for the rows matching a WHERE clause"""
+        table = self.schema_service.get_table(table_name)
+        row_count = len(table.rows)
+        access = PlanNode('Full Scan', f"on {table.name}", row_count, float(row_count), counter='scanned')
+        
+        if where is None:
+            return QueryPlan(access)
+        
+        predicate = self.predicate_compiler.compile(where, table)
+        
+        # Take the cheapest index lookup that beats reading every row
+        lookup = None
+        for candidate in self.predicate_compiler.indexable_conjuncts(where, table):
+            if not self.index_service.can_lookup(table, *candidate):
+                continue
+            node = self._index_access(table, candidate)
+            if node.cost < access.cost:
+                access, lookup = node, candidate
+        
+        # The whole WHERE clause is rechecked on the rows the access step reads
+        condition = self.predicate_compiler.normalize(where)
+        estimated = min(row_count * self._selectivity(table, condition), access.estimated_rows)
+        root = PlanNode('Filter', self._describe(condition), estimated, access.cost, [access], counter='matched')
+        
+        vector_predicate = self.predicate_compiler.compile_vectorized(where, table) if lookup is None else None
+        return QueryPlan(root, predicate=predicate, vector_predicate=vector_predicate, lookup=lookup)
+    
+    def _add_aggregate(self, plan: QueryPlan, parsed: Dict[str, Any]) -> Table:
+        """Put hash aggregation and the HAVING filter on top of the plan
+        
+        Returns a table describing the result columns of the aggregation,
+        which HAVING and ORDER BY refer to.
+        """
+        inputs = self._aggregate_inputs(parsed)
+        
+        group_by = [(name, self._input_column(name, inputs, parsed)) for name in parsed.get('group_by', [])]
+        aggregates = []
+        for aggregate in parsed['aggregates']:
+            function, column = aggregate['function'], aggregate['column']
+            if column != '*':
+                column = self._input_column(column, inputs, parsed)
+                data_type = inputs[column][1].data_type
+                if function in ('SUM', 'AVG') and data_type not in ('INTEGER', 'FLOAT'):
+                    raise InvalidDataTypeException(
+                        f"{function} requires a numeric column, '{aggregate['column']}' is {data_type}"
+                    )
+            aggregates.append((aggregate['name'], function, column))
+        
+        # Every other result column must be one of the grouping keys, however it is written
+        aggregate_names = {name for name, _, _ in aggregates}
+        for name in parsed['columns']:
+            if name == '*':
+                raise ParseException("SELECT * cannot be used with GROUP BY or aggregate functions")
+            if name in aggregate_names or any(name == group for group, _ in group_by):
+                continue
+            column = self._input_column(name, inputs, parsed)
+            if not any(column == key for _, key in group_by):
+                raise ParseException(
+                    f"Column '{name}' must appear in GROUP BY or be used in an aggregate function"
+                )
+            group_by.append((name, column))
+        
+        result_columns = [Column(name, inputs[column][1].data_type) for name, column in group_by]
+        for name, function, column in aggregates:
+            if function == 'COUNT':
+                data_type = 'INTEGER'
+            elif function == 'AVG':
+                data_type = 'FLOAT'
+            else:
+                data_type = inputs[column][1].data_type
+            result_columns.append(Column(name, data_type))
+        result_table = Table(self._source_name(parsed), result_columns)
+        
+        # Each group is one combination of its key columns' values
+        child = plan.root
+        calls = ', '.join(f"{a['function']}({a['column']})" for a in parsed['aggregates'])
+        if group_by:
+            groups = 1.0
+            for _, column in group_by:
+                table, definition = inputs[column]
+                distinct = self._distinct_count(table, definition.name)
+                groups *= distinct if distinct is not None else len(table.rows) * self.DEFAULT_SELECTIVITY['=']
+            estimated = min(groups, child.estimated_rows)
+            operation = 'Hash Aggregate'
+            detail = f"group by {', '.join(parsed['group_by'])}" + (f": {calls}" if calls else '')
+        else:
+            operation, detail, estimated = 'Aggregate', calls, 1
+        plan.root = PlanNode(operation, detail, estimated, child.cost + child.estimated_rows, [child],
+                             counter='grouped')
+        
+        if 'having' in parsed:
+            plan.having = self.predicate_compiler.compile(parsed['having'], result_table)
+            condition = self.predicate_compiler.normalize(parsed['having'])
+            estimated *= self.DEFAULT_SELECTIVITY['RANGE']
+            plan.root = PlanNode('Filter', self._describe(condition), estimated, plan.root.cost, [plan.root],
+                                 counter='having')
+        
+        plan.group_by, plan.aggregates = group_by, aggregates
+        return result_table
+    
+    def _aggregate_inputs(self, parsed: Dict[str, Any]) -> Dict[str, Tuple[Table, Column]]:
+        """Get the columns of the rows fed to aggregation, keyed as they appear in those rows"""
+        if 'join' not in parsed:
+            table = self.schema_service.get_table(parsed['table_name'])
+            return {column.name: (table, column) for column in table.columns}
+        
+        inputs = {}
+        for table_name in (parsed['join']['left_table'], parsed['join']['right_table']):
+            table = self.schema_service.get_table(table_name)
+            for column in table.columns:
+                inputs[f"{table.name}.{column.name}"] = (table, column)
+        return inputs
+    
+    def _input_column(self, name: str, inputs: Dict[str, Tuple[Table, Column]], parsed: Dict[str, Any]) -> str:
+        """Resolve a column of a grouped SELECT to its key in the aggregated rows"""
+        if name in inputs:
+            return name
+        
+        prefix, _, column_name = name.rpartition('.')
+        if 'join' not in parsed:
+            if prefix == parsed['table_name'] and column_name in inputs:
+                return column_name
+        else:
+            matches = [key for key in inputs if not prefix and key.rpartition('.')[2] == name]
+            if len(matches) > 1:
+                raise ColumnNotFoundException(
+                    f"Column '{name}' is ambiguous in table '{self._source_name(parsed)}'"
+                )
+            if matches:
+                return matches[0]
+        raise ColumnNotFoundException(
+            f"Column '{name}' does not exist in table '{self._source_name(parsed)}'"
+        )
+    
+    def _source_name(self, parsed: Dict[str, Any]) -> str:
+        """Describe the table or join a SELECT reads, for messages"""
+        if 'join' in parsed:
+            return f"{parsed['join']['left_table']} JOIN {parsed['join']['right_table']}"
+        return parsed['table_name']
+    
+    def _counts_whole_table(self, parsed: Dict[str, Any]) -> bool:
+        """Check for a plain SELECT COUNT(*) of a whole table, which statistics answer"""
+        aggregates = parsed.get('aggregates')
+        return (
+            aggregates is not None and len(aggregates) == 1 and
+            aggregates[0]['function'] == 'COUNT' and aggregates[0]['column'] == '*' and
+            parsed['columns'] == [aggregates[0]['name']] and
+            not any(clause in parsed for clause in ('join', 'where', 'group_by', 'having'))
+        )
+    
+    def _choose_index_order(self, plan: QueryPlan, table: Table) -> None:
+        """Read rows in the order of an ordered index instead of sorting, when that is cheaper"""
+        if len(plan.order_by) != 1:
+            return
+        column_name, descending = plan.order_by[0]
+        index = table.get_ordered_index(column_name)
+        if index is None:
+            return
+        
+        # Without sorting, the scan stops once the page is filled
+        row_count = len(table.rows)
+        matched = plan.root.estimated_rows
+        scanned = float(row_count)
+        if plan.limit is not None and matched > 0:
+            scanned = min(scanned, (plan.offset + plan.limit) * row_count / matched)
+        cost = scanned * self.INDEX_ROW_COST
+        
+        # NULLs are not indexed, so a nullable column is scanned for them first when descending
+        column = table.get_column(column_name)
+        if descending and 'NOT NULL' not in column.constraints and 'PRIMARY KEY' not in column.constraints:
+            cost += row_count
+        
+        if cost >= plan.root.cost + self._sort_cost(matched, plan):
+            return
+        
+        direction = 'DESC' if descending else 'ASC'
+        access = PlanNode('Index Order Scan', f"on {table.name} using {index.name} ({column_name} {direction})",
+                          scanned, cost, counter='scanned')
+        if plan.predicate is not None:
+            filter_node = plan.root
+            plan.root = PlanNode(filter_node.operation, filter_node.detail, min(matched, scanned), cost,
+                                 [access], counter='matched')
+        else:
+            plan.root = access
+        plan.lookup = None
+        plan.order_index = index.name
+    
+    def _add_sort(self, plan: QueryPlan) -> None:
+        """Put a sort, or a top-N heap sort when there is a limit, on top of the plan"""
+        child = plan.root
+        keys = ', '.join(f"{column} {'DESC' if descending else 'ASC'}" for column, descending in plan.order_by)
+        estimated = child.estimated_rows
+        operation = 'Sort'
+        if plan.limit is not None:
+            operation = 'Top-N Sort'
+            keys += f" keep {plan.offset + plan.limit}"
+            estimated = min(estimated, plan.offset + plan.limit)
+        
+        plan.root = PlanNode(operation, keys, estimated, child.cost + self._sort_cost(child.estimated_rows, plan),
+                             [child], counter='sorted')
+    
+    def _add_limit(self, plan: QueryPlan) -> None:
+        """Put LIMIT/OFFSET on top of the plan"""
+        child = plan.root
+        estimated = max(child.estimated_rows - plan.offset, 0)
+        detail = f"offset {plan.offset}"
+        if plan.limit is not None:
+            estimated = min(estimated, plan.limit)
+            detail = f"{plan.limit} " + detail
+        plan.root = PlanNode('Limit', detail, estimated, child.cost, [child])
+    
+    def _sort_cost(self, rows: float, plan: QueryPlan) -> float:
+        """Estimate the cost of sorting rows, keeping only the page when there is a limit"""
+        kept = rows if plan.limit is None else min(rows, plan.offset + plan.limit)
+        return rows * math.log2(max(kept, 2)) * self.COMPARE_COST
+    
+    def _order_by(self, parsed: Dict[str, Any], table: Table) -> Optional[List[Tuple[str, bool]]]:
+        """Get the (column, descending) sort keys of a single-table SELECT, or of aggregated result rows"""
+        if 'order_by' not in parsed:
+            return None
+        
+        keys = []
+        for item in parsed['order_by']:
+            prefix, column_name = '', item['column']
+            if table.get_column(column_name) is None:
+                prefix, _, column_name = column_name.rpartition('.')
+            if (prefix and prefix != table.name) or table.get_column(column_name) is None:
+                raise ColumnNotFoundException(
+                    f"Column '{item['column']}' does not exist in table '{table.name}'"
+                )
+            keys.append((column_name, item['direction'] == 'DESC'))
+        return keys
+    
+    def _join_order_by(self, parsed: Dict[str, Any]) -> Optional[List[Tuple[str, bool]]]:
+        """Get the (output column, descending) sort keys of a JOIN, matching unqualified names by suffix"""
+        if 'order_by' not in parsed:
+            return None
+        
+        join = parsed['join']
+        if parsed['columns'] == ['*']:
+            outputs = [
+                f"{table.name}.{column.name}"
+                for table in (self.schema_service.get_table(join['left_table']),
+                              self.schema_service.get_table(join['right_table']))
+                for column in table.columns
+            ]
+        else:
+            outputs = parsed['columns']
+        
+        keys = []
+        for item in parsed['order_by']:
+            matches = [item['column']] if item['column'] in outputs else [
+                output for output in outputs if output.rpartition('.')[2] == item['column']
+            ]
+            if len(matches) != 1:
+                raise ColumnNotFoundException(
+                    f"ORDER BY column '{item['column']}' must name exactly one column of the JOIN result"
+                )
+            keys.append((matches[0], item['direction'] == 'DESC'))
+        return keys
+    
+    def _paging(self, parsed: Dict[str, Any], clause: str) -> Optional[int]:
+        """Get the LIMIT or OFFSET row count of a statement, checking bound parameters"""
+        value = parsed.get(clause)
+        if value is None:
+            return None
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ParseException(f"{clause.upper()} must be a non-negative integer, got {value!r}")
+        return value
+    
+    def _index_access(self, table: Table, lookup: Tuple[str, str, Any]) -> PlanNode:
+        """Build the step answering a (column, operator, value) filter from an index"""
+        column_name, op, value = lookup
+        estimated = len(table.rows) * self.index_service.selectivity(table, column_name, op, value)
+        probes = len(value) if op == 'IN' else 1
+        
+        if op in self.RANGE_OPERATORS:
+            operation, index = 'Index Range Scan', table.get_ordered_index(column_name)
+        else:
+            operation, index = 'Index Lookup', table.get_index(column_name)
+        
+        condition = self._describe_lookup(column_name, op, value)
+        return PlanNode(
+            operation, f"on {table.name} using {index.name} ({condition})",
+            estimated, probes * self.INDEX_PROBE_COST + estimated * self.INDEX_ROW_COST,
+            counter='scanned'
+        )
+    
+    def _plan_join(self, parsed: Dict[str, Any]) -> QueryPlan:
+        """Choose the cheapest strategy for an INNER JOIN"""
+        join = parsed['join']
+        left = self.schema_service.get_table(join['left_table'])
+        right = self.schema_service.get_table(join['right_table'])
+        left_column, right_column = join['left_column'], join['right_column']
+        n, m = len(left.rows), len(right.rows)
+        
+        # Each left row matches right rows sharing its value; the side with more values bounds it
+        distinct = [d for d in (self._distinct_count(left, left_column),
+                                self._distinct_count(right, right_column)) if d]
+        estimated = n * m / max(distinct) if distinct else float(max(n, m))
+        condition = f"({left.name}.{left_column} = {right.name}.{right_column})"
+        
+        def scan(table: Table) -> PlanNode:
+            return PlanNode('Full Scan', f"on {table.name}", len(table.rows), float(len(table.rows)),
+                            counter='left' if table is left else 'right')
+        
+        candidates = []
+        
+        # Index nested loop: scan one table, probe the other's index per row
+        for strategy, outer, inner, inner_column, outer_column in (
+            ('index_right', left, right, right_column, left_column),
+            ('index_left', right, left, left_column, right_column),
+        ):
+            index = inner.get_index(inner_column)
+            if index is None:
+                continue
+            probe_cost = len(outer.rows) * self.INDEX_PROBE_COST + estimated * self.INDEX_ROW_COST
+            probe = PlanNode(
+                'Index Lookup',
+                f"on {inner.name} using {index.name} ({inner_column} = {outer.name}.{outer_column})",
+                estimated, probe_cost, counter='joined'
+            )
+            cost = len(outer.rows) + probe_cost
+            candidates.append((strategy, PlanNode(
+                'Index Nested Loop', condition, estimated, cost, [scan(outer), probe], counter='joined'
+            )))
+        
+        # Hash join: hash one table, probe it with every row of the other
+        for strategy, built in (('hash_right', right), ('hash_left', left)):
+            cost = n + m + self.HASH_BUILD_COST * len(built.rows) + estimated
+            candidates.append((strategy, PlanNode(
+                'Hash Join', f"{condition} hash on {built.name}", estimated, cost, [scan(left), scan(right)],
+                counter='joined'
+            )))
+        
+        # Nested loop: compare every pair, cheapest for tiny tables
+        candidates.append(('nested_loop', PlanNode(
+            'Nested Loop', condition, estimated, n + n * m + estimated, [scan(left), scan(right)],
+            counter='joined'
+        )))
+        
+        strategy, node = min(candidates, key=lambda candidate: candidate[1].cost)
+        return QueryPlan(node, join_strategy=strategy)
+    
+    def _selectivity(self, table: Table, node: Dict[str, Any]) -> float:
+        """Estimate the fraction of rows matching a normalized WHERE expression"""
+        op = node['operator']
+        
+        if op in ('AND', 'OR'):
+            fractions = [self._selectivity(table, operand) for operand in node['operands']]
+            result = 1.0
+            for fraction in fractions:
+                result *= fraction if op == 'AND' else 1 - fraction
+            return result if op == 'AND' else 1 - result
+        
+        # Negated filters match the rows their positive form does not
+        positive = self.predicate_compiler.NEGATIONS[op] if op in self.NEGATED_OPERATORS else op
+        fraction = min(self._leaf_selectivity(table, positive, node), 1.0)
+        return fraction if positive == op else 1 - fraction
+    
+    def _leaf_selectivity(self, table: Table, op: str, node: Dict[str, Any]) -> float:
+        """Estimate the fraction of rows matching a comparison, IN, BETWEEN, LIKE or IS NULL"""
+        column = table.get_column(node['column'])
+        
+        statistics = self._column_statistics(table, column.name)
+        
+        if op == 'IS NULL':
+            if 'NOT NULL' in column.constraints or 'PRIMARY KEY' in column.constraints:
+                return 0.0
+            if statistics is not None:
+                return statistics.null_fraction
+            return self.DEFAULT_SELECTIVITY['IS NULL']
+        if op == 'LIKE':
+            return self.DEFAULT_SELECTIVITY['LIKE']
+        if op == 'IN':
+            return sum(self._leaf_selectivity(table, '=', dict(node, value=value)) for value in node['values'])
+        
+        # Convert literals as for an index lookup, then ask the index for counts
+        if op == 'BETWEEN':
+            literals = [self.predicate_compiler.index_literal(table, column.name, node[key])
+                        for key in ('low', 'high')]
+            value = tuple(literals)
+        else:
+            literals = [self.predicate_compiler.index_literal(table, column.name, node['value'])]
+            value = literals[0]
+        
+        comparable = all(literal is not None for literal in literals)
+        if comparable:
+            fraction = self.index_service.selectivity(table, column.name, op, value)
+            if fraction is not None:
+                return fraction
+        
+        # Then the ANALYZE statistics, then what the constraints tell
+        if op == '=':
+            if node['value'] is None:
+                return 0.0
+            if statistics is not None:
+                return statistics.equality_selectivity()
+            if column in table.get_unique_columns():
+                return 1 / max(len(table.rows), 1)
+            return self.DEFAULT_SELECTIVITY['=']
+        
+        if statistics is not None and comparable:
+            fraction = statistics.range_selectivity(**self.index_service.range_bounds(op, value))
+            if fraction is not None:
+                return fraction
+        return self.DEFAULT_SELECTIVITY['BETWEEN' if op == 'BETWEEN' else 'RANGE']
+    
+    def _distinct_count(self, table: Table, column_name: str) -> Optional[int]:
+        """Get the number of distinct values in a column, or None if unknown"""
+        index = table.get_index(column_name)
+        if index is not None:
+            return index.distinct_count()
+        statistics = self._column_statistics(table, column_name)
+        if statistics is not None:
+            return statistics.distinct_count
+        column = table.get_column(column_name)
+        if column is not None and column in table.get_unique_columns():
+            return len(table.rows)
+        return None
+    
+    def _column_statistics(self, table: Table, column_name: str) -> Optional[ColumnStatistics]:
+        """Get the ANALYZE statistics of a column, if it has been analyzed"""
+        if table.statistics is None:
+            return None
+        return table.statistics.columns.get(column_name)
+    
+    def _describe(self, node: Dict[str, Any]) -> str:
+        """Render a normalized WHERE expression as text"""
+        op = node['operator']
+        if op in ('AND', 'OR'):
+            return f" {op} ".join(
+                f"({self._describe(operand)})" if operand['operator'] in ('AND', 'OR')
+                else self._describe(operand)
+                for operand in node['operands']
+            )
+        if op in ('IS NULL', 'IS NOT NULL'):
+            return f"{node['column']} {op}"
+        if op in ('IN', 'NOT IN'):
+            return self._describe_lookup(node['column'], op, node['values'])
+        if op in ('BETWEEN', 'NOT BETWEEN'):
+            return self._describe_lookup(node['column'], op, (node['low'], node['high']))
+        return self._describe_lookup(node['column'], op, node['value'])
+    
+    def _describe_lookup(self, column_name: str, op: str, value: Any) -> str:
+        """Render a (column, operator, value) filter as text"""
+        if op.endswith('IN'):
+            return f"{column_name} {op} ({', '.join(self._literal(item) for item in value)})"
+        if op.endswith('BETWEEN'):
+            return f"{column_name} {op} {self._literal(value[0])} AND {self._literal(value[1])}"
+        return f"{column_name} {op} {self._literal(value)}"
+    
+    @staticmethod
+    def _literal(value: Any) -> str:
+        """Render a literal as it would be written in SQL"""
+        if value is None:
+            return 'NULL'
+        if isinstance(value, str):
+            return f"'{value}'"
+        return str(value)
\ No newline at end of file
@@ -0,0 +1,77 @@
+from typing import Dict, Any, List, Optional, Union
+from ...domain.exceptions import ParseException
+
+class Parameter:
+    """Placeholder for a value supplied when a statement is executed"""
+    
+    def __init__(self, name: Optional[str] = None):
+        self.name = name  # None for a positional ? placeholder
+        self.position = None
+    
+    def __repr__(self) -> str:
+        return f":{self.name}" if self.name is not None else f"?{self.position}"
+
+class PreparedStatement:
+    """Parsed statement template whose ? or :name placeholders are bound at execution"""
+    
+    def __init__(self, sql: str, parsed: Dict[str, Any]):
+        self.sql = sql
+        self.parsed = parsed
+        self.parameters = []
+        self._collect_parameters(parsed)
+        
+        # Number positional placeholders in the order they appear
+        named = [parameter for parameter in self.parameters if parameter.name is not None]
+        if named and len(named) != len(self.parameters):
+            raise ParseException("Cannot mix ? and named placeholders in one statement")
+        for position, parameter in enumerate(self.parameters):
+            parameter.position = position
+    
+    @property
+    def is_named(self) -> bool:
+        """Check if the statement uses :name placeholders"""
+        return any(parameter.name is not None for parameter in self.parameters)
+    
+    def bind(self, params: Union[List[Any], Dict[str, Any], None] = None) -> Dict[str, Any]:
+        """Get the parsed statement with placeholders replaced by parameter values"""
+        if self.is_named:
+            if not isinstance(params, dict):
+                raise ParseException("Statement expects named parameters as a dict")
+            missing = [p.name for p in self.parameters if p.name not in params]
+            if missing:
+                raise ParseException(f"Missing value for parameter ':{missing[0]}'")
+        else:
+            if params is None:
+                params = []
+            elif not isinstance(params, (list, tuple)):
+                raise ParseException("Statement expects positional parameters as a list")
+            if len(params) != len(self.parameters):
+                raise ParseException(
+                    f"Statement expects {len(self.parameters)} parameter(s), got {len(params)}"
+                )
+        
+        # Statements without placeholders share the template; it must not be modified
+        if not self.parameters:
+            return self.parsed
+        return self._substitute(self.parsed, params)
+    
+    def _collect_parameters(self, node: Any) -> None:
+        """Collect placeholders of a parsed statement in statement order"""
+        if isinstance(node, Parameter):
+            self.parameters.append(node)
+        elif isinstance(node, dict):
+            for value in node.values():
+                self._collect_parameters(value)
+        elif isinstance(node, list):
+            for value in node:
+                self._collect_parameters(value)
+    
+    def _substitute(self, node: Any, params: Union[List[Any], Dict[str, Any]]) -> Any:
+        """Copy a parsed node with placeholders replaced by their values"""
+        if isinstance(node, Parameter):
+            return params[node.name] if node.name is not None else params[node.position]
+        if isinstance(node, dict):
+            return {key: self._substitute(value, params) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self._substitute(value, params) for value in node]
+        return node
\ No newline at end of file
@@ -0,0 +1,556 @@
+from typing import Dict, Any, List, Optional, Tuple
+from ...domain.exceptions import ParseException
+from .prepared_statement import Parameter
+from .sql_lexer import Token, tokenize
+
+class TokenStream:
+    """Cursor over the tokens of one statement"""
+    
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+    
+    def peek(self, offset: int = 0) -> Token:
+        """Get an upcoming token without consuming it"""
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+    
+    def next(self) -> Token:
+        """Consume and return the current token"""
+        token = self.tokens[self.pos]
+        if token.kind != 'END':
+            self.pos += 1
+        return token
+    
+    def at_keyword(self, keyword: str) -> bool:
+        """Check if the current token is a keyword"""
+        token = self.peek()
+        return token.kind == 'WORD' and token.upper == keyword
+    
+    def accept_keyword(self, keyword: str) -> bool:
+        """Consume a keyword if it is the current token"""
+        if self.at_keyword(keyword):
+            self.pos += 1
+            return True
+        return False
+    
+    def expect_keyword(self, *keywords: str) -> str:
+        """Consume one of the keywords and return it in upper case"""
+        token = self.peek()
+        if token.kind == 'WORD' and token.upper in keywords:
+            self.pos += 1
+            return token.upper
+        raise self.error(' | '.join(keywords))
+    
+    def accept_op(self, op: str) -> bool:
+        """Consume an operator or punctuation token if it is the current token"""
+        token = self.peek()
+        if token.kind == 'OP' and token.text == op:
+            self.pos += 1
+            return True
+        return False
+    
+    def expect_op(self, op: str) -> None:
+        """Consume an operator or punctuation token"""
+        if not self.accept_op(op):
+            raise self.error(f"'{op}'")
+    
+    def expect_kind(self, kind: str, description: str) -> Token:
+        """Consume a token of the given kind"""
+        if self.peek().kind != kind:
+            raise self.error(description)
+        return self.next()
+    
+    def error(self, expected: str) -> ParseException:
+        """Build a parse error for the current token"""
+        token = self.peek()
+        found = token.text if token.kind != 'END' else 'end of text'
+        return ParseException(f"Parse error: Expected {expected}, found '{found}' (at char {token.start})")
+
+class RecursiveDescentParser:
+    """Hand-written parser for SQL-like commands
+    
+    Produces the same parsed statements as the pyparsing based SQLParser,
+    which is kept as the reference grammar, without its matching overhead.
+    WHERE expressions beyond a single comparison (AND/OR/NOT, IN, BETWEEN,
+    IS [NOT] NULL, LIKE), aggregate functions, GROUP BY/HAVING, ORDER BY,
+    LIMIT/OFFSET, EXPLAIN and ANALYZE are only supported by this parser.
+    """
+    
+    DATA_TYPES = ('INTEGER', 'FLOAT', 'BOOLEAN', 'DATE', 'VARCHAR')
+    COMPARISON_OPERATORS = ('=', '!=', '>', '<', '>=', '<=')
+    AGGREGATE_FUNCTIONS = ('COUNT', 'SUM', 'AVG', 'MIN', 'MAX')
+    
+    def parse(self, sql: str) -> Dict[str, Any]:
+        """Parse SQL statement and return structured result"""
+        # Remove trailing semicolon if present
+        sql = sql.strip().rstrip(';')
+        
+        tokens = TokenStream(tokenize(sql))
+        statement = self._parse_statement(tokens)
+        
+        if tokens.peek().kind != 'END':
+            raise tokens.error('end of text')
+        return statement
+    
+    def _parse_statement(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Dispatch on the leading keyword of a statement"""
+        keyword = tokens.expect_keyword(
+            'CREATE', 'DROP', 'INSERT', 'COPY', 'SELECT', 'UPDATE', 'DELETE', 'EXPLAIN', 'ANALYZE',
+            'BEGIN', 'COMMIT', 'ROLLBACK'
+        )
+        
+        if keyword in ('BEGIN', 'COMMIT', 'ROLLBACK'):
+            if not tokens.accept_keyword('TRANSACTION'):
+                tokens.accept_keyword('WORK')
+            return {'type': keyword}
+        elif keyword == 'EXPLAIN':
+            return {'type': 'EXPLAIN', 'statement': self._parse_statement(tokens)}
+        elif keyword == 'ANALYZE':
+            table_name = self._identifier(tokens) if tokens.peek().kind == 'WORD' else None
+            return {'type': 'ANALYZE', 'table_name': table_name}
+        elif keyword == 'CREATE':
+            if tokens.expect_keyword('TABLE', 'INDEX') == 'TABLE':
+                return self._parse_create(tokens)
+            return self._parse_create_index(tokens)
+        elif keyword == 'DROP':
+            if tokens.expect_keyword('TABLE', 'INDEX') == 'TABLE':
+                return {'type': 'DROP', 'table_name': self._identifier(tokens)}
+            return {'type': 'DROP_INDEX', 'index_name': self._identifier(tokens)}
+        elif keyword == 'INSERT':
+            return self._parse_insert(tokens)
+        elif keyword == 'COPY':
+            return self._parse_copy(tokens)
+        elif keyword == 'SELECT':
+            return self._parse_select(tokens)
+        elif keyword == 'UPDATE':
+            return self._parse_update(tokens)
+        return self._parse_delete(tokens)
+    
+    def _parse_create(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse the rest of CREATE TABLE"""
+        table_name = self._identifier(tokens)
+        
+        tokens.expect_op('(')
+        columns = [self._parse_column_def(tokens)]
+        while tokens.accept_op(','):
+            columns.append(self._parse_column_def(tokens))
+        tokens.expect_op(')')
+        
+        return {
+            'type': 'CREATE',
+            'table_name': table_name,
+            'columns': columns
+        }
+    
+    def _parse_column_def(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse a column definition of CREATE TABLE"""
+        col_dict = {
+            'name': self._identifier(tokens),
+            'type': tokens.expect_keyword(*self.DATA_TYPES),
+            'constraints': []
+        }
+        
+        if col_dict['type'] == 'VARCHAR':
+            tokens.expect_op('(')
+            max_length = int(tokens.expect_kind('NUMBER', 'integer').text)
+            tokens.expect_op(')')
+        else:
+            max_length = None
+        
+        # Constraints
+        while True:
+            if tokens.accept_keyword('PRIMARY'):
+                tokens.expect_keyword('KEY')
+                col_dict['constraints'].append('PRIMARY KEY')
+            elif tokens.accept_keyword('UNIQUE'):
+                col_dict['constraints'].append('UNIQUE')
+            elif tokens.accept_keyword('NOT'):
+                tokens.expect_keyword('NULL')
+                col_dict['constraints'].append('NOT NULL')
+            else:
+                break
+        
+        if max_length is not None:
+            col_dict['max_length'] = max_length
+        
+        return col_dict
+    
+    def _parse_create_index(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse the rest of CREATE INDEX"""
+        index_name = self._identifier(tokens)
+        tokens.expect_keyword('ON')
+        table_name = self._identifier(tokens)
+        tokens.expect_op('(')
+        column = self._identifier(tokens)
+        tokens.expect_op(')')
+        
+        index_type = 'HASH'
+        if tokens.accept_keyword('USING'):
+            index_type = tokens.expect_keyword('HASH', 'BTREE', 'ORDERED')
+        
+        return {
+            'type': 'CREATE_INDEX',
+            'index_name': index_name,
+            'table_name': table_name,
+            'column': column,
+            'index_type': 'HASH' if index_type == 'HASH' else 'ORDERED'
+        }
+    
+    def _parse_insert(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse the rest of INSERT"""
+        tokens.expect_keyword('INTO')
+        table_name = self._identifier(tokens)
+        
+        tokens.expect_op('(')
+        columns = [self._identifier(tokens)]
+        while tokens.accept_op(','):
+            columns.append(self._identifier(tokens))
+        tokens.expect_op(')')
+        
+        tokens.expect_keyword('VALUES')
+        rows = [self._parse_value_list(tokens)]
+        while tokens.accept_op(','):
+            rows.append(self._parse_value_list(tokens))
+        
+        return {
+            'type': 'INSERT',
+            'table_name': table_name,
+            'columns': columns,
+            'rows': rows
+        }
+    
+    def _parse_value_list(self, tokens: TokenStream) -> List[Any]:
+        """Parse a parenthesized list of values"""
+        tokens.expect_op('(')
+        values = [self._parse_value(tokens)]
+        while tokens.accept_op(','):
+            values.append(self._parse_value(tokens))
+        tokens.expect_op(')')
+        return values
+    
+    def _parse_copy(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse the rest of COPY"""
+        table_name = self._identifier(tokens)
+        tokens.expect_keyword('FROM')
+        file_path = tokens.expect_kind('STRING', 'quoted string').value
+        
+        # Without FORMAT, the file extension decides between CSV and NDJSON
+        if tokens.accept_keyword('FORMAT'):
+            file_format = tokens.expect_keyword('CSV', 'NDJSON')
+        elif file_path.lower().endswith(('.ndjson', '.jsonl', '.json')):
+            file_format = 'NDJSON'
+        else:
+            file_format = 'CSV'
+        
+        return {
+            'type': 'COPY',
+            'table_name': table_name,
+            'file_path': file_path,
+            'format': file_format
+        }
+    
+    def _parse_select(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse the rest of SELECT"""
+        aggregates = []
+        if tokens.accept_op('*'):
+            columns = ['*']
+        else:
+            columns = [self._parse_result_column(tokens, aggregates)]
+            while tokens.accept_op(','):
+                columns.append(self._parse_result_column(tokens, aggregates))
+        
+        tokens.expect_keyword('FROM')
+        parsed = {
+            'type': 'SELECT',
+            'columns': columns
+        }
+        
+        table_name = self._identifier(tokens)
+        
+        # A JOIN takes no WHERE clause
+        if tokens.accept_keyword('INNER'):
+            tokens.expect_keyword('JOIN')
+            right_table = self._identifier(tokens)
+            tokens.expect_keyword('ON')
+            self._identifier(tokens)
+            tokens.expect_op('.')
+            left_column = self._identifier(tokens)
+            tokens.expect_op('=')
+            self._identifier(tokens)
+            tokens.expect_op('.')
+            right_column = self._identifier(tokens)
+            
+            parsed['join'] = {
+                'left_table': table_name,
+                'right_table': right_table,
+                'left_column': left_column,
+                'right_column': right_column
+            }
+        else:
+            parsed['table_name'] = table_name
+            self._parse_optional_where(tokens, parsed)
+        
+        if tokens.accept_keyword('GROUP'):
+            tokens.expect_keyword('BY')
+            group_by = [self._parse_select_column(tokens)]
+            while tokens.accept_op(','):
+                group_by.append(self._parse_select_column(tokens))
+            parsed['group_by'] = group_by
+        if tokens.accept_keyword('HAVING'):
+            parsed['having'] = self._parse_or(tokens, aggregates)
+        
+        # Aggregates only referenced by HAVING or ORDER BY are computed but not returned
+        self._parse_order_and_limit(tokens, parsed, aggregates)
+        if aggregates or 'group_by' in parsed or 'having' in parsed:
+            parsed['aggregates'] = aggregates
+        return parsed
+    
+    def _parse_result_column(self, tokens: TokenStream, aggregates: List[Dict[str, Any]]) -> str:
+        """Parse a column or an aggregate call [AS alias] of the SELECT list, returning its result name"""
+        if not self._at_aggregate(tokens):
+            return self._parse_select_column(tokens)
+        
+        function, column = self._parse_aggregate_call(tokens)
+        name = f"{function}({column})"
+        if tokens.accept_keyword('AS'):
+            name = self._identifier(tokens)
+        aggregates.append({'function': function, 'column': column, 'name': name})
+        return name
+    
+    def _parse_aggregate_reference(self, tokens: TokenStream, aggregates: List[Dict[str, Any]]) -> str:
+        """Parse an aggregate call outside the SELECT list, returning the name of its result
+        
+        Calls matching an aggregate already computed share its result;
+        others are added to aggregates.
+        """
+        function, column = self._parse_aggregate_call(tokens)
+        for aggregate in aggregates:
+            if aggregate['function'] == function and aggregate['column'] == column:
+                return aggregate['name']
+        
+        name = f"{function}({column})"
+        aggregates.append({'function': function, 'column': column, 'name': name})
+        return name
+    
+    def _parse_aggregate_call(self, tokens: TokenStream) -> Tuple[str, str]:
+        """Parse FUNCTION(column) or COUNT(*) into the function and column"""
+        function = tokens.next().upper
+        tokens.expect_op('(')
+        if function == 'COUNT' and tokens.accept_op('*'):
+            column = '*'
+        else:
+            column = self._parse_select_column(tokens)
+        tokens.expect_op(')')
+        return function, column
+    
+    def _at_aggregate(self, tokens: TokenStream) -> bool:
+        """Check whether an aggregate function call starts at the current token"""
+        token, after = tokens.peek(), tokens.peek(1)
+        return (
+            token.kind == 'WORD' and token.upper in self.AGGREGATE_FUNCTIONS and
+            after.kind == 'OP' and after.text == '('
+        )
+    
+    def _parse_select_column(self, tokens: TokenStream) -> str:
+        """Parse a column name, with an optional table prefix written without spaces"""
+        name = self._identifier(tokens)
+        
+        dot, column = tokens.peek(), tokens.peek(1)
+        is_qualified = (
+            dot.kind == 'OP' and dot.text == '.' and column.kind == 'WORD' and
+            dot.start == tokens.tokens[tokens.pos - 1].end and column.start == dot.end
+        )
+        if is_qualified:
+            tokens.next()
+            tokens.next()
+            return f"{name}.{column.text}"
+        return name
+    
+    def _parse_order_and_limit(self, tokens: TokenStream, parsed: Dict[str, Any],
+                               aggregates: List[Dict[str, Any]]) -> None:
+        """Parse optional ORDER BY column [ASC | DESC], ... and LIMIT count [OFFSET count]"""
+        if tokens.accept_keyword('ORDER'):
+            tokens.expect_keyword('BY')
+            order_by = []
+            while True:
+                if self._at_aggregate(tokens):
+                    column = self._parse_aggregate_reference(tokens, aggregates)
+                else:
+                    column = self._parse_select_column(tokens)
+                direction = 'ASC'
+                if tokens.at_keyword('ASC') or tokens.at_keyword('DESC'):
+                    direction = tokens.next().upper
+                order_by.append({'column': column, 'direction': direction})
+                if not tokens.accept_op(','):
+                    break
+            parsed['order_by'] = order_by
+        
+        if tokens.accept_keyword('LIMIT'):
+            parsed['limit'] = self._parse_count(tokens)
+        if tokens.accept_keyword('OFFSET'):
+            parsed['offset'] = self._parse_count(tokens)
+    
+    def _parse_count(self, tokens: TokenStream) -> Any:
+        """Parse the row count of LIMIT or OFFSET, a number or placeholder"""
+        token = tokens.peek()
+        if token.kind == 'PARAM':
+            tokens.next()
+            return Parameter(token.value)
+        return int(tokens.expect_kind('NUMBER', 'row count').text)
+    
+    def _parse_update(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse the rest of UPDATE"""
+        table_name = self._identifier(tokens)
+        tokens.expect_keyword('SET')
+        
+        assignments = [self._parse_assignment(tokens)]
+        while tokens.accept_op(','):
+            assignments.append(self._parse_assignment(tokens))
+        
+        parsed = {
+            'type': 'UPDATE',
+            'table_name': table_name,
+            'set': assignments
+        }
+        self._parse_optional_where(tokens, parsed)
+        return parsed
+    
+    def _parse_assignment(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse 'column = value' of UPDATE"""
+        column = self._identifier(tokens)
+        tokens.expect_op('=')
+        return {
+            'column': column,
+            'value': self._parse_value(tokens)
+        }
+    
+    def _parse_delete(self, tokens: TokenStream) -> Dict[str, Any]:
+        """Parse the rest of DELETE"""
+        tokens.expect_keyword('FROM')
+        parsed = {
+            'type': 'DELETE',
+            'table_name': self._identifier(tokens)
+        }
+        self._parse_optional_where(tokens, parsed)
+        return parsed
+    
+    def _parse_optional_where(self, tokens: TokenStream, parsed: Dict[str, Any]) -> None:
+        """Parse a WHERE clause into parsed['where'] if one follows"""
+        if tokens.accept_keyword('WHERE'):
+            parsed['where'] = self._parse_or(tokens)
+    
+    def _parse_or(self, tokens: TokenStream,
+                  aggregates: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Parse conditions joined by OR
+        
+        aggregates is given for HAVING, whose conditions may apply to aggregate calls.
+        """
+        operands = [self._parse_and(tokens, aggregates)]
+        while tokens.accept_keyword('OR'):
+            operands.append(self._parse_and(tokens, aggregates))
+        
+        if len(operands) == 1:
+            return operands[0]
+        return {'operator': 'OR', 'operands': operands}
+    
+    def _parse_and(self, tokens: TokenStream,
+                   aggregates: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Parse conditions joined by AND"""
+        operands = [self._parse_not(tokens, aggregates)]
+        while tokens.accept_keyword('AND'):
+            operands.append(self._parse_not(tokens, aggregates))
+        
+        if len(operands) == 1:
+            return operands[0]
+        return {'operator': 'AND', 'operands': operands}
+    
+    def _parse_not(self, tokens: TokenStream,
+                   aggregates: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Parse an optionally negated condition"""
+        # NOT followed by a comparison operator is a column named 'not'
+        after = tokens.peek(1)
+        if tokens.at_keyword('NOT') and (after.kind != 'OP' or after.text == '('):
+            tokens.next()
+            return {'operator': 'NOT', 'operand': self._parse_not(tokens, aggregates)}
+        
+        if tokens.accept_op('('):
+            condition = self._parse_or(tokens, aggregates)
+            tokens.expect_op(')')
+            return condition
+        
+        return self._parse_predicate(tokens, aggregates)
+    
+    def _parse_predicate(self, tokens: TokenStream,
+                         aggregates: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Parse a condition on one column, or on an aggregate call in HAVING"""
+        if aggregates is not None and self._at_aggregate(tokens):
+            column = self._parse_aggregate_reference(tokens, aggregates)
+        elif aggregates is not None:
+            column = self._parse_select_column(tokens)
+        else:
+            column = self._identifier(tokens)
+        
+        token = tokens.peek()
+        if token.kind == 'OP' and token.text in self.COMPARISON_OPERATORS:
+            tokens.next()
+            return {
+                'column': column,
+                'operator': token.text,
+                'value': self._parse_value(tokens)
+            }
+        
+        if tokens.accept_keyword('IS'):
+            operator = 'IS NOT NULL' if tokens.accept_keyword('NOT') else 'IS NULL'
+            tokens.expect_keyword('NULL')
+            return {'column': column, 'operator': operator}
+        
+        negated = tokens.accept_keyword('NOT')
+        keyword = tokens.expect_keyword('IN', 'BETWEEN', 'LIKE')
+        
+        if keyword == 'IN':
+            predicate = {'column': column, 'operator': 'IN', 'values': self._parse_value_list(tokens)}
+        elif keyword == 'BETWEEN':
+            low = self._parse_value(tokens)
+            tokens.expect_keyword('AND')
+            predicate = {'column': column, 'operator': 'BETWEEN', 'low': low, 'high': self._parse_value(tokens)}
+        else:
+            predicate = {'column': column, 'operator': 'LIKE', 'value': self._parse_value(tokens)}
+        
+        if negated:
+            return {'operator': 'NOT', 'operand': predicate}
+        return predicate
+    
+    def _parse_value(self, tokens: TokenStream) -> Any:
+        """Parse a literal value or placeholder"""
+        token = tokens.peek()
+        if token.kind == 'STRING':
+            tokens.next()
+            return self._convert_value(token.value)
+        if token.kind == 'NUMBER':
+            tokens.next()
+            return int(token.text)
+        if token.kind == 'PARAM':
+            tokens.next()
+            return Parameter(token.value)
+        raise tokens.error('value')
+    
+    def _identifier(self, tokens: TokenStream) -> str:
+        """Parse an identifier"""
+        return tokens.expect_kind('WORD', 'identifier').text
+    
+    def _convert_value(self, value: str) -> Any:
+        """Convert a quoted value to int or float when it reads as a number"""
+        # Try to convert to int
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        
+        # Try to convert to float
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        
+        # Return as string
+        return value
\ No newline at end of file
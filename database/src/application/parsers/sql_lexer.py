@@ -0,0 +1,57 @@
+import re
+from dataclasses import dataclass
+from typing import Any, List
+from ...domain.exceptions import ParseException
+
+# Token patterns, mirroring the terminals of the SQLParser grammar
+TOKEN_PATTERN = re.compile(r"""
+    (?P<WS>[ \t\n\r]+)
+  | (?P<WORD>[A-Za-z][A-Za-z0-9_]*)
+  | (?P<NUMBER>[0-9]+)
+  | (?P<STRING>'[^'\n\r]*'|"[^"\n\r]*")
+  | (?P<PARAM>\?|:[A-Za-z][A-Za-z0-9_]*)
+  | (?P<OP>!=|>=|<=|[=<>(),.*])
+""", re.VERBOSE)
+
+# Whitespace escapes converted inside quoted strings, as pyparsing's QuotedString does
+WHITESPACE_ESCAPES = {r'\t': '\t', r'\n': '\n', r'\f': '\f', r'\r': '\r'}
+ESCAPE_PATTERN = re.compile(r'\\[tnfr]')
+
+@dataclass
+class Token:
+    """A lexical token of a SQL statement"""
+    kind: str  # WORD, NUMBER, STRING, PARAM, OP or END
+    text: str
+    start: int
+    end: int
+    
+    @property
+    def upper(self) -> str:
+        """Get the token text in upper case, for keyword comparison"""
+        return self.text.upper()
+    
+    @property
+    def value(self) -> Any:
+        """Get the literal value of a STRING token or the name of a :name PARAM token"""
+        if self.kind == 'STRING':
+            return ESCAPE_PATTERN.sub(lambda m: WHITESPACE_ESCAPES[m.group()], self.text[1:-1])
+        if self.kind == 'PARAM':
+            return self.text[1:] if self.text.startswith(':') else None
+        return self.text
+
+def tokenize(sql: str) -> List[Token]:
+    """Split a SQL statement into tokens, ending with an END token"""
+    tokens = []
+    pos = 0
+    
+    while pos < len(sql):
+        match = TOKEN_PATTERN.match(sql, pos)
+        if match is None:
+            raise ParseException(f"Parse error: Unexpected character '{sql[pos]}' (at char {pos})")
+        
+        if match.lastgroup != 'WS':
+            tokens.append(Token(match.lastgroup, match.group(), pos, match.end()))
+        pos = match.end()
+    
+    tokens.append(Token('END', '', len(sql), len(sql)))
+    return tokens
\ No newline at end of file
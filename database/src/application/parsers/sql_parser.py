@@ -1,9 +1,14 @@
 import pyparsing as pp
 from typing import Dict, Any, List
 from ...domain.exceptions import ParseException
+from .prepared_statement import Parameter
 
 class SQLParser:
-    """Parser for SQL-like commands"""
+    """Parser for SQL-like commands
+    
+    Reference pyparsing grammar for RecursiveDescentParser, which is the
+    parser QueryExecutor uses.
+    """
     
     def __init__(self):
         # Define SQL keywords (case-insensitive)
@@ -27,12 +32,26 @@ class SQLParser:
         UNIQUE = pp.CaselessKeyword("UNIQUE")
         NOT = pp.CaselessKeyword("NOT")
         NULL = pp.CaselessKeyword("NULL")
+        INDEX = pp.CaselessKeyword("INDEX")
+        USING = pp.CaselessKeyword("USING")
+        COPY = pp.CaselessKeyword("COPY")
+        FORMAT = pp.CaselessKeyword("FORMAT")
+        BEGIN = pp.CaselessKeyword("BEGIN")
+        COMMIT = pp.CaselessKeyword("COMMIT")
+        ROLLBACK = pp.CaselessKeyword("ROLLBACK")
         
         # Define basic elements
         identifier = pp.Word(pp.alphas, pp.alphanums + "_")
         integer = pp.Word(pp.nums)
         string = pp.QuotedString("'") | pp.QuotedString('"')
         
+        # Placeholders (? or :name) for values bound at execution
+        placeholder = (
+            pp.Literal("?").setParseAction(lambda: Parameter()) |
+            pp.Combine(pp.Suppress(":") + identifier).setParseAction(lambda t: Parameter(t[0]))
+        )
+        value = string | integer | placeholder
+        
         # Data types
         data_type = (
             pp.CaselessKeyword("INTEGER") |
@@ -43,8 +62,8 @@ class SQLParser:
         )
         
         # Constraints
-        primary_key = PRIMARY + KEY
-        not_null = NOT + NULL
+        primary_key = pp.Group(PRIMARY + KEY)
+        not_null = pp.Group(NOT + NULL)
         constraint = primary_key | UNIQUE | not_null
         
         # Column definition for CREATE TABLE
@@ -65,12 +84,39 @@ class SQLParser:
         # DROP TABLE statement
         drop_table = DROP + TABLE + identifier("table_name")
         
-        # INSERT statement
+        # CREATE INDEX statement (hash by default, ordered for range scans)
+        index_type = (
+            pp.CaselessKeyword("HASH") |
+            pp.CaselessKeyword("BTREE") |
+            pp.CaselessKeyword("ORDERED")
+        )
+        create_index = (
+            CREATE + INDEX + identifier("index_name") +
+            ON + identifier("table_name") +
+            pp.Suppress("(") + identifier("column") + pp.Suppress(")") +
+            pp.Optional(pp.Suppress(USING) + index_type("index_type"))
+        )
+        
+        # DROP INDEX statement
+        drop_index = DROP + INDEX + identifier("index_name")
+        
+        # INSERT statement with one or more value lists
+        value_list = pp.Group(
+            pp.Suppress("(") + pp.delimitedList(value) + pp.Suppress(")")
+        )
         insert_stmt = (
             INSERT + INTO + identifier("table_name") +
             pp.Suppress("(") + pp.delimitedList(identifier)("columns") + pp.Suppress(")") +
             VALUES +
-            pp.Suppress("(") + pp.delimitedList(string | integer)("values") + pp.Suppress(")")
+            pp.Group(pp.delimitedList(value_list))("rows")
+        )
+        
+        # COPY statement (bulk load from a CSV or NDJSON file)
+        file_format = pp.CaselessKeyword("CSV") | pp.CaselessKeyword("NDJSON")
+        copy_stmt = (
+            COPY + identifier("table_name") +
+            FROM + string("file_path") +
+            pp.Optional(pp.Suppress(FORMAT) + file_format("format"))
         )
         
         # WHERE clause
@@ -79,7 +125,7 @@ class SQLParser:
             pp.Suppress(WHERE) + 
             identifier("column") + 
             comparison_op("operator") + 
-            (string | integer)("value")
+            value("value")
         )("where")
         
         # Column list with optional table prefix (table.column)
@@ -110,10 +156,11 @@ class SQLParser:
         select_stmt = select_join | select_simple
         
         # UPDATE statement
-        # set_clause = identifier("column") + pp.Suppress("=") + (string | integer)("value")
-        set_clause = pp.Group(
-            identifier("column") + pp.Suppress("=") + (string | integer)("value")
-        )("set")
+        # set_clause = assignment [, assignment ...]
+        assignment = pp.Group(
+            identifier("column") + pp.Suppress("=") + value("value")
+        )
+        set_clause = pp.Group(pp.delimitedList(assignment))("set")
         update_stmt = (
             UPDATE + identifier("table_name") +
             SET + set_clause +
@@ -126,14 +173,24 @@ class SQLParser:
             pp.Optional(where_clause)
         )
         
+        # Transaction control: BEGIN | COMMIT | ROLLBACK [TRANSACTION | WORK]
+        transaction_stmt = (
+            (BEGIN | COMMIT | ROLLBACK)("command") +
+            pp.Optional(pp.CaselessKeyword("TRANSACTION") | pp.CaselessKeyword("WORK"))
+        )
+        
         # Main SQL statement
         self.sql_statement = (
             create_table("create") |
+            create_index("create_index") |
             drop_table("drop") |
+            drop_index("drop_index") |
             insert_stmt("insert") |
+            copy_stmt("copy") |
             select_stmt("select") |
             update_stmt("update") |
-            delete_stmt("delete")
+            delete_stmt("delete") |
+            transaction_stmt("transaction")
         )
     
     def parse(self, sql: str) -> Dict[str, Any]:
@@ -148,16 +205,24 @@ class SQLParser:
             # Determine statement type and structure result
             if 'create' in result:
                 return self._parse_create(result)
+            elif 'create_index' in result:
+                return self._parse_create_index(result)
             elif 'drop' in result:
                 return self._parse_drop(result)
+            elif 'drop_index' in result:
+                return self._parse_drop_index(result)
             elif 'insert' in result:
                 return self._parse_insert(result)
+            elif 'copy' in result:
+                return self._parse_copy(result)
             elif 'select' in result:
                 return self._parse_select(result)
             elif 'update' in result:
                 return self._parse_update(result)
             elif 'delete' in result:
                 return self._parse_delete(result)
+            elif 'transaction' in result:
+                return {'type': str(result.command).upper()}
             else:
                 raise ParseException("Unknown statement type")
         
@@ -203,44 +268,57 @@ class SQLParser:
             'table_name': result.table_name
         }
     
+    def _parse_create_index(self, result: pp.ParseResults) -> Dict[str, Any]:
+        """Parse CREATE INDEX result"""
+        index_type = str(result.index_type).upper() if 'index_type' in result else 'HASH'
+        
+        return {
+            'type': 'CREATE_INDEX',
+            'index_name': str(result.index_name),
+            'table_name': str(result.table_name),
+            'column': str(result.column),
+            'index_type': 'HASH' if index_type == 'HASH' else 'ORDERED'
+        }
+    
+    def _parse_drop_index(self, result: pp.ParseResults) -> Dict[str, Any]:
+        """Parse DROP INDEX result"""
+        return {
+            'type': 'DROP_INDEX',
+            'index_name': str(result.index_name)
+        }
+    
     def _parse_insert(self, result: pp.ParseResults) -> Dict[str, Any]:
         """Parse INSERT result"""
+        # Convert values of every row to appropriate types
+        rows = [
+            [self._convert_value(val) for val in value_list]
+            for value_list in result['rows']
+        ]
         
-        # Convert values to appropriate types
-        values = []
+        return {
+            'type': 'INSERT',
+            'table_name': str(result.table_name),
+            'columns': [str(col) for col in result.columns],
+            'rows': rows
+        }
+    
+    def _parse_copy(self, result: pp.ParseResults) -> Dict[str, Any]:
+        """Parse COPY result"""
+        file_path = str(result.file_path)
         
-        # Check if values is callable (a method)
-        if callable(result.values):
-            values_data = result['values']
+        # Without FORMAT, the file extension decides between CSV and NDJSON
+        if 'format' in result:
+            file_format = str(result.format).upper()
+        elif file_path.lower().endswith(('.ndjson', '.jsonl', '.json')):
+            file_format = 'NDJSON'
         else:
-            values_data = result.values
-        
-        for val in values_data:
-            # Convert to proper type
-            val_str = str(val)
-            
-            # Try to convert to int first
-            try:
-                values.append(int(val_str))
-                continue
-            except ValueError:
-                pass
-            
-            # Try to convert to float
-            try:
-                values.append(float(val_str))
-                continue
-            except ValueError:
-                pass
-            
-            # Keep as string
-            values.append(val_str)
+            file_format = 'CSV'
         
         return {
-            'type': 'INSERT',
+            'type': 'COPY',
             'table_name': str(result.table_name),
-            'columns': [str(col) for col in result.columns],
-            'values': values
+            'file_path': file_path,
+            'format': file_format
         }
     
     def _parse_select(self, result: pp.ParseResults) -> Dict[str, Any]:
@@ -278,10 +356,13 @@ class SQLParser:
         parsed = {
             'type': 'UPDATE',
             'table_name': str(result['table_name']),
-            'set': {
-                'column': str(result['set']['column']),
-                'value': self._convert_value(result['set']['value'])
-            }
+            'set': [
+                {
+                    'column': str(assignment['column']),
+                    'value': self._convert_value(assignment['value'])
+                }
+                for assignment in result['set']
+            ]
         }
         
         # Add WHERE clause if present
@@ -315,6 +396,9 @@ class SQLParser:
     
     def _convert_value(self, value: str) -> Any:
         """Convert string value to appropriate type"""
+        if isinstance(value, Parameter):
+            return value
+        
         # Try to convert to int
         try:
             return int(value)
@@ -10,6 +10,14 @@ class TableAlreadyExistsException(DatabaseException):
     """Raised when trying to create a table that already exists"""
     pass
 
+class IndexAlreadyExistsException(DatabaseException):
+    """Raised when trying to create an index that already exists"""
+    pass
+
+class IndexNotFoundException(DatabaseException):
+    """Raised when an index doesn't exist"""
+    pass
+
 class ColumnNotFoundException(DatabaseException):
     """Raised when a column doesn't exist"""
     pass
@@ -36,4 +44,16 @@ class NotNullConstraintViolationException(ConstraintViolationException):
 
 class ParseException(DatabaseException):
     """Raised when SQL parsing fails"""
+    pass
+
+class TransactionException(DatabaseException):
+    """Raised when a transaction statement is misused or a transaction cannot commit"""
+    pass
+
+class LockTimeoutException(TransactionException):
+    """Raised when a transaction waits too long for a table lock, as when two transactions deadlock"""
+    pass
+
+class ConnectionException(DatabaseException):
+    """Raised when the database server cannot be reached, drops the connection or breaks the protocol"""
     pass
\ No newline at end of file
@@ -0,0 +1,116 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+from .table import Row
+
+class Aggregate(ABC):
+    """Running state of an aggregate function over the rows of one group"""
+    
+    __slots__ = ('position',)
+    
+    def __init__(self, position: Optional[int]):
+        self.position = position  # position of the aggregated value in a row, None for COUNT(*)
+    
+    @abstractmethod
+    def add(self, row: Row) -> None:
+        """Take a row of the group into account"""
+        pass
+    
+    @abstractmethod
+    def result(self) -> Any:
+        """Get the aggregate of the rows added so far"""
+        pass
+
+class CountAggregate(Aggregate):
+    """COUNT(*) counts rows, COUNT(column) non-NULL values"""
+    
+    __slots__ = ('count',)
+    
+    def __init__(self, position: Optional[int]):
+        super().__init__(position)
+        self.count = 0
+    
+    def add(self, row: Row) -> None:
+        if self.position is None or row[self.position] is not None:
+            self.count += 1
+    
+    def result(self) -> int:
+        return self.count
+
+class SumAggregate(Aggregate):
+    """SUM of the non-NULL values, NULL when there are none"""
+    
+    __slots__ = ('total',)
+    
+    def __init__(self, position: Optional[int]):
+        super().__init__(position)
+        self.total = None
+    
+    def add(self, row: Row) -> None:
+        value = row[self.position]
+        if value is not None:
+            self.total = value if self.total is None else self.total + value
+    
+    def result(self) -> Any:
+        return self.total
+
+class AvgAggregate(Aggregate):
+    """AVG of the non-NULL values, NULL when there are none"""
+    
+    __slots__ = ('total', 'count')
+    
+    def __init__(self, position: Optional[int]):
+        super().__init__(position)
+        self.total = 0
+        self.count = 0
+    
+    def add(self, row: Row) -> None:
+        value = row[self.position]
+        if value is not None:
+            self.total += value
+            self.count += 1
+    
+    def result(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+class MinAggregate(Aggregate):
+    """MIN of the non-NULL values, NULL when there are none"""
+    
+    __slots__ = ('value',)
+    
+    def __init__(self, position: Optional[int]):
+        super().__init__(position)
+        self.value = None
+    
+    def add(self, row: Row) -> None:
+        value = row[self.position]
+        if value is not None and (self.value is None or value < self.value):
+            self.value = value
+    
+    def result(self) -> Any:
+        return self.value
+
+class MaxAggregate(Aggregate):
+    """MAX of the non-NULL values, NULL when there are none"""
+    
+    __slots__ = ('value',)
+    
+    def __init__(self, position: Optional[int]):
+        super().__init__(position)
+        self.value = None
+    
+    def add(self, row: Row) -> None:
+        value = row[self.position]
+        if value is not None and (self.value is None or value > self.value):
+            self.value = value
+    
+    def result(self) -> Any:
+        return self.value
+
+# Aggregate function name -> state class
+AGGREGATE_FUNCTIONS = {
+    'COUNT': CountAggregate,
+    'SUM': SumAggregate,
+    'AVG': AvgAggregate,
+    'MIN': MinAggregate,
+    'MAX': MaxAggregate,
+}
\ No newline at end of file
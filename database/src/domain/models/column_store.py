@@ -0,0 +1,208 @@
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+from .table import Table, Row
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it every scan takes the row path
+    np = None
+
+class ColumnStore:
+    """Columnar copy of a table's rows for vectorized filtering and aggregation
+    
+    Each INTEGER, FLOAT, BOOLEAN and DATE column whose values all have the
+    column's Python type is held as a NumPy array, next to a validity mask
+    that is False where the value is NULL (the array holds a placeholder
+    there). Other columns are left out, and expressions reading them take
+    the row path. Rows appended to the table are picked up by extend();
+    any other change to the rows needs a new store. Requires NumPy, see
+    available().
+    """
+    
+    # Column type -> (Python type of the values, array type, placeholder for NULL)
+    TYPES = {
+        'INTEGER': (int, 'int64', 0),
+        'FLOAT': (float, 'float64', 0.0),
+        'BOOLEAN': (bool, 'bool', False),
+        'DATE': (str, 'str', ''),
+    }
+    NUMERIC_TYPES = ('INTEGER', 'FLOAT')
+    
+    def __init__(self, table: Table):
+        self.data_types = [column.data_type for column in table.columns]
+        self.row_count = 0
+        self._columns: Dict[int, Tuple[Any, Any]] = {}  # column position -> (values, valid)
+        self._dropped = set()  # positions of columns whose values cannot be held
+        self.extend(table.rows)
+    
+    @staticmethod
+    def available() -> bool:
+        """Check if NumPy is installed"""
+        return np is not None
+    
+    def extend(self, rows: Sequence[Row]) -> None:
+        """Add the rows appended to the table since the store was last brought up to date"""
+        if len(rows) == self.row_count:
+            return
+        new_rows = rows[self.row_count:]
+        
+        for position, data_type in enumerate(self.data_types):
+            if data_type not in self.TYPES or position in self._dropped:
+                continue
+            
+            column = self._build_column(data_type, [row[position] for row in new_rows])
+            if column is None:
+                self._columns.pop(position, None)
+                self._dropped.add(position)
+            elif position in self._columns:
+                values, valid = self._columns[position]
+                self._columns[position] = (np.concatenate([values, column[0]]), np.concatenate([valid, column[1]]))
+            else:
+                self._columns[position] = column
+        
+        self.row_count = len(rows)
+    
+    def has_column(self, position: int) -> bool:
+        """Check if a column's values are held"""
+        return position in self._columns
+    
+    # Masks
+    
+    def mask(self, value: bool):
+        """Get a mask with the same value for every row"""
+        return np.full(self.row_count, value, dtype=bool)
+    
+    def compare(self, position: int, compare: Callable[[Any, Any], Any], literal: Any):
+        """Get the mask of rows whose non-NULL value compares true with a literal, or None if the column is not held"""
+        column = self._columns.get(position)
+        if column is None:
+            return None
+        values, valid = column
+        return compare(values, literal) & valid
+    
+    def isin(self, position: int, members: List[Any]):
+        """Get the mask of rows whose value is one of members, or None if the column is not held"""
+        column = self._columns.get(position)
+        if column is None:
+            return None
+        values, valid = column
+        return np.isin(values, members) & valid
+    
+    def nulls(self, position: int, is_null: bool):
+        """Get the mask of rows whose value is (or is not) NULL, or None if the column is not held"""
+        column = self._columns.get(position)
+        if column is None:
+            return None
+        return ~column[1] if is_null else column[1].copy()
+    
+    def positions(self, mask) -> List[int]:
+        """Get the positions of the rows a mask selects, in row order"""
+        return np.flatnonzero(mask).tolist()
+    
+    # Aggregation
+    
+    def aggregate(self, mask, key_position: Optional[int],
+                  aggregates: List[Tuple[str, Optional[int]]]) -> Optional[Tuple[List[int], List[List[Any]]]]:
+        """Group the rows a mask selects (every row for None) on a column and aggregate each group
+        
+        aggregates holds (function, column position) pairs, with no position
+        for COUNT(*). Returns the position of the first row of each group, in
+        order of first appearance, and each aggregate's value per group.
+        Without a key column all selected rows form one group, even when there
+        are none, and no first rows are returned. Values are summed in row
+        order, as the row path does. Returns None when a column is not held or
+        its type does not support the function, or an INTEGER sum could
+        overflow.
+        """
+        selected = np.arange(self.row_count) if mask is None else np.flatnonzero(mask)
+        
+        # Number the groups in order of first appearance, NULL keys forming a group of their own
+        if key_position is None:
+            group_ids = np.zeros(len(selected), dtype=np.intp)
+            firsts = selected[:0]
+            group_count = 1
+        else:
+            if key_position not in self._columns:
+                return None
+            values, valid = self._columns[key_position]
+            keys, key_valid = values[selected], valid[selected]
+            _, first_index, inverse = np.unique(keys[key_valid], return_index=True, return_inverse=True)
+            
+            group_ids = np.empty(len(selected), dtype=np.intp)
+            group_ids[key_valid] = inverse
+            firsts = np.flatnonzero(key_valid)[first_index]
+            if not key_valid.all():
+                group_ids[~key_valid] = len(firsts)
+                firsts = np.append(firsts, np.flatnonzero(~key_valid)[0])
+            
+            order = np.argsort(firsts, kind='stable')
+            renumber = np.empty(len(order), dtype=np.intp)
+            renumber[order] = np.arange(len(order))
+            group_ids = renumber[group_ids]
+            firsts = selected[firsts[order]]
+            group_count = len(firsts)
+        
+        results = []
+        for function, position in aggregates:
+            result = self._aggregate_groups(function, position, selected, group_ids, group_count)
+            if result is None:
+                return None
+            results.append(result)
+        
+        return firsts.tolist(), results
+    
+    def _aggregate_groups(self, function: str, position: Optional[int], selected,
+                          group_ids, group_count: int) -> Optional[List[Any]]:
+        """Compute an aggregate function for every group"""
+        if position is None:
+            return np.bincount(group_ids, minlength=group_count).tolist()
+        
+        column = self._columns.get(position)
+        if column is None:
+            return None
+        data_type = self.data_types[position]
+        
+        valid = column[1][selected]
+        values = column[0][selected][valid]
+        group_ids = group_ids[valid]
+        counts = np.bincount(group_ids, minlength=group_count)
+        if function == 'COUNT':
+            return counts.tolist()
+        
+        if function in ('SUM', 'AVG'):
+            if data_type not in self.NUMERIC_TYPES:
+                return None
+            if data_type == 'INTEGER' and len(values):
+                largest = max(-int(values.min()), int(values.max()))
+                if largest * len(values) >= 2 ** 63:
+                    return None  # Python ints do not overflow, int64 sums would
+            totals = np.zeros(group_count, dtype=values.dtype)
+            np.add.at(totals, group_ids, values)
+            if function == 'SUM':
+                return [total if count else None for total, count in zip(totals.tolist(), counts.tolist())]
+            return [total / count if count else None for total, count in zip(totals.tolist(), counts.tolist())]
+        
+        # MIN and MAX
+        if data_type == 'DATE':
+            return None
+        ufunc = np.minimum if function == 'MIN' else np.maximum
+        if data_type == 'BOOLEAN':
+            start = function == 'MIN'
+        else:
+            info = np.iinfo(values.dtype) if data_type == 'INTEGER' else np.finfo(values.dtype)
+            start = info.max if function == 'MIN' else info.min
+        extremes = np.full(group_count, start, dtype=values.dtype)
+        ufunc.at(extremes, group_ids, values)
+        return [extreme if count else None for extreme, count in zip(extremes.tolist(), counts.tolist())]
+    
+    def _build_column(self, data_type: str, values: List[Any]) -> Optional[Tuple[Any, Any]]:
+        """Build the (values, valid) arrays of a column, or None if a value is not of the column's Python type"""
+        python_type, array_type, placeholder = self.TYPES[data_type]
+        if not set(map(type, values)) <= {python_type, type(None)}:
+            return None  # e.g. ints in a FLOAT column, whose results must stay ints
+        
+        valid = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+        filled = values if valid.all() else [placeholder if value is None else value for value in values]
+        try:
+            return np.array(filled, dtype=array_type), valid
+        except OverflowError:
+            return None  # INTEGER values beyond 64 bits
\ No newline at end of file
@@ -0,0 +1,490 @@
+import operator
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+
+class RemovedPositions:
+    """Stored positions of rows deleted since an index last renumbered its positions
+    
+    Deleting a row moves every later row down a position. Instead of
+    renumbering all its positions on each DELETE, an index keeps them as
+    stored and maps them to row positions through the removed ones, and
+    renumbers only once RENUMBER_AFTER rows are removed. Never changed
+    once built, so copies of an index share it.
+    """
+    
+    RENUMBER_AFTER = 1024
+    
+    def __init__(self, removed: Iterable[int] = ()):
+        self.removed = sorted(removed)
+        # Rows kept before each removed one, to find the stored position of a row position
+        self.kept_before = [position - i for i, position in enumerate(self.removed)]
+    
+    def __len__(self) -> int:
+        return len(self.removed)
+    
+    def position(self, stored: int) -> int:
+        """Get the row position of a stored position"""
+        return stored - bisect_left(self.removed, stored)
+    
+    def positions(self, stored: Iterable[int]) -> List[int]:
+        """Get the row positions of stored positions, in their order"""
+        if not self.removed:
+            return list(stored)
+        removed = self.removed
+        return [position - bisect_left(removed, position) for position in stored]
+    
+    def stored(self, position: int) -> int:
+        """Get the stored position of a row position"""
+        return position + bisect_right(self.kept_before, position)
+    
+    def with_removed(self, positions: Iterable[int]) -> 'RemovedPositions':
+        """Get the removed positions after also removing the rows at the given row positions"""
+        return RemovedPositions(self.removed + [self.stored(position) for position in positions])
+
+class HashIndex:
+    """Hash index mapping column values to row positions"""
+    
+    kind = 'HASH'
+    
+    def __init__(self, name: str, column: str, unique: bool = False):
+        self.name = name
+        self.column = column
+        self.unique = unique
+        self.entries: Dict[Any, List[int]] = {}  # value -> stored positions (see RemovedPositions)
+        self.removed = RemovedPositions()
+    
+    def build(self, values: Iterable[Any]) -> None:
+        """Rebuild the index from the column value of each row, in row order"""
+        self.entries = {}
+        self.removed = RemovedPositions()
+        for position, value in enumerate(values):
+            self.add(value, position)
+    
+    def add(self, value: Any, position: int) -> None:
+        """Add a row position under the given value (NULLs are not indexed)"""
+        if value is None:
+            return
+        if self.removed:
+            position = self.removed.stored(position)
+        positions = self.entries.get(value)
+        if positions is None:
+            self.entries[value] = [position]
+        else:
+            positions.append(position)
+    
+    def remove(self, value: Any, position: int) -> None:
+        """Remove a row position from the given value"""
+        if value is None:
+            return
+        positions = self.entries.get(value)
+        if positions is None:
+            return
+        if self.removed:
+            position = self.removed.stored(position)
+        if position in positions:
+            positions.remove(position)
+        if not positions:
+            del self.entries[value]
+    
+    def delete(self, rows: List[Tuple[int, Any]]) -> None:
+        """Remove deleted rows, given as (position, value) pairs; later rows move down a position per deleted row"""
+        for position, value in rows:
+            self.remove(value, position)
+        self.removed = self.removed.with_removed(position for position, _ in rows)
+        if len(self.removed) > RemovedPositions.RENUMBER_AFTER:
+            self.entries = {value: self.removed.positions(positions) for value, positions in self.entries.items()}
+            self.removed = RemovedPositions()
+    
+    def lookup(self, value: Any) -> List[int]:
+        """Get the row positions holding the given value"""
+        return self.removed.positions(self.entries.get(value, ()))
+    
+    def contains(self, value: Any) -> bool:
+        """Check if any row holds the given value"""
+        return value in self.entries
+    
+    def count(self, value: Any) -> int:
+        """Count the rows holding the given value"""
+        return len(self.entries.get(value, ()))
+    
+    def distinct_count(self) -> int:
+        """Count the distinct non-NULL values indexed"""
+        return len(self.entries)
+    
+    def items(self) -> Iterable[Tuple[Any, List[int]]]:
+        """Iterate over (value, positions) pairs"""
+        return ((value, self.removed.positions(positions)) for value, positions in self.entries.items())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert index to a JSON-serializable dictionary"""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'column': self.column,
+            'unique': self.unique,
+            'entries': [[value, positions] for value, positions in self.items()]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HashIndex':
+        """Create index from a dictionary produced by to_dict"""
+        index = cls(data['name'], data['column'], data.get('unique', False))
+        index.entries = {value: list(positions) for value, positions in data['entries']}
+        return index
+    
+    def copy(self) -> 'HashIndex':
+        """Copy the index, so the copy can change independently"""
+        index = HashIndex(self.name, self.column, self.unique)
+        index.entries = {value: list(positions) for value, positions in self.entries.items()}
+        index.removed = self.removed
+        return index
+
+class OrderedIndex:
+    """Ordered index keeping column values sorted for range scans
+    
+    Keys live in a sorted list searched with bisect, with the row positions
+    of each key in a parallel list.
+    """
+    
+    kind = 'ORDERED'
+    
+    def __init__(self, name: str, column: str, unique: bool = False):
+        self.name = name
+        self.column = column
+        self.unique = unique
+        self.keys: List[Any] = []
+        self.positions: List[List[int]] = []  # stored positions of each key (see RemovedPositions)
+        self.removed = RemovedPositions()
+    
+    def build(self, values: Iterable[Any]) -> None:
+        """Rebuild the index from the column value of each row, in row order"""
+        entries: Dict[Any, List[int]] = {}
+        for position, value in enumerate(values):
+            if value is not None:
+                entries.setdefault(value, []).append(position)
+        
+        self.keys = sorted(entries)
+        self.positions = [entries[key] for key in self.keys]
+        self.removed = RemovedPositions()
+    
+    def add(self, value: Any, position: int) -> None:
+        """Add a row position under the given value (NULLs are not indexed)"""
+        if value is None:
+            return
+        if self.removed:
+            position = self.removed.stored(position)
+        i = bisect_left(self.keys, value)
+        if i < len(self.keys) and self.keys[i] == value:
+            self.positions[i].append(position)
+        else:
+            self.keys.insert(i, value)
+            self.positions.insert(i, [position])
+    
+    def remove(self, value: Any, position: int) -> None:
+        """Remove a row position from the given value"""
+        if value is None:
+            return
+        i = bisect_left(self.keys, value)
+        if i == len(self.keys) or self.keys[i] != value:
+            return
+        if self.removed:
+            position = self.removed.stored(position)
+        if position in self.positions[i]:
+            self.positions[i].remove(position)
+        if not self.positions[i]:
+            del self.keys[i]
+            del self.positions[i]
+    
+    def delete(self, rows: List[Tuple[int, Any]]) -> None:
+        """Remove deleted rows, given as (position, value) pairs; later rows move down a position per deleted row"""
+        for position, value in rows:
+            self.remove(value, position)
+        self.removed = self.removed.with_removed(position for position, _ in rows)
+        if len(self.removed) > RemovedPositions.RENUMBER_AFTER:
+            self.positions = [self.removed.positions(positions) for positions in self.positions]
+            self.removed = RemovedPositions()
+    
+    def lookup(self, value: Any) -> List[int]:
+        """Get the row positions holding the given value"""
+        i = bisect_left(self.keys, value)
+        if i < len(self.keys) and self.keys[i] == value:
+            return self.removed.positions(self.positions[i])
+        return []
+    
+    def contains(self, value: Any) -> bool:
+        """Check if any row holds the given value"""
+        i = bisect_left(self.keys, value)
+        return i < len(self.keys) and self.keys[i] == value
+    
+    def count(self, value: Any) -> int:
+        """Count the rows holding the given value"""
+        i = bisect_left(self.keys, value)
+        if i < len(self.keys) and self.keys[i] == value:
+            return len(self.positions[i])
+        return 0
+    
+    def distinct_count(self) -> int:
+        """Count the distinct non-NULL values indexed"""
+        return len(self.keys)
+    
+    def range(self, low: Optional[Any] = None, high: Optional[Any] = None,
+              low_inclusive: bool = True, high_inclusive: bool = True) -> List[int]:
+        """Get row positions with values between low and high, in key order (None means unbounded)"""
+        start, end = self._bounds(low, high, low_inclusive, high_inclusive)
+        
+        result = []
+        for positions in self.positions[start:end]:
+            result.extend(positions)
+        return self.removed.positions(result)
+    
+    def scan(self, descending: bool = False) -> Iterator[int]:
+        """Yield every indexed row position in key order, rows with equal keys in position order"""
+        indexes = range(len(self.keys) - 1, -1, -1) if descending else range(len(self.keys))
+        for i in indexes:
+            yield from self.removed.positions(sorted(self.positions[i]))
+    
+    def range_fraction(self, low: Optional[Any] = None, high: Optional[Any] = None,
+                       low_inclusive: bool = True, high_inclusive: bool = True) -> float:
+        """Get the fraction of distinct values between low and high, without reading positions"""
+        if not self.keys:
+            return 0.0
+        start, end = self._bounds(low, high, low_inclusive, high_inclusive)
+        return max(end - start, 0) / len(self.keys)
+    
+    def _bounds(self, low: Optional[Any], high: Optional[Any],
+                low_inclusive: bool, high_inclusive: bool) -> Tuple[int, int]:
+        """Get the slice of keys between low and high"""
+        if low is None:
+            start = 0
+        elif low_inclusive:
+            start = bisect_left(self.keys, low)
+        else:
+            start = bisect_right(self.keys, low)
+        
+        if high is None:
+            end = len(self.keys)
+        elif high_inclusive:
+            end = bisect_right(self.keys, high)
+        else:
+            end = bisect_left(self.keys, high)
+        
+        return start, end
+    
+    def items(self) -> Iterable[Tuple[Any, List[int]]]:
+        """Iterate over (value, positions) pairs in key order"""
+        return ((key, self.removed.positions(positions)) for key, positions in zip(self.keys, self.positions))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert index to a JSON-serializable dictionary"""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'column': self.column,
+            'unique': self.unique,
+            'entries': [[key, positions] for key, positions in self.items()]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'OrderedIndex':
+        """Create index from a dictionary produced by to_dict"""
+        index = cls(data['name'], data['column'], data.get('unique', False))
+        index.keys = [key for key, _ in data['entries']]
+        index.positions = [list(positions) for _, positions in data['entries']]
+        return index
+    
+    def copy(self) -> 'OrderedIndex':
+        """Copy the index, so the copy can change independently"""
+        index = OrderedIndex(self.name, self.column, self.unique)
+        index.keys = list(self.keys)
+        index.positions = [list(positions) for positions in self.positions]
+        index.removed = self.removed
+        return index
+
+class OverlayIndex:
+    """Index seen through changes kept apart from it, for a table overlay (see Table.overlay)
+    
+    Positions live in the overlay rows' stored positions (see OverlayRows):
+    those of the base index are hidden once their row is changed or
+    deleted, and new entries go to an index of added ones. Row positions
+    are mapped through the rows' removed positions, which the rows update
+    after the index drops deleted rows. The base index is left as it is
+    until apply() moves the changes into it.
+    """
+    
+    def __init__(self, base, rows):
+        self.base = base
+        self.rows = rows
+        self.name = base.name
+        self.column = base.column
+        self.unique = base.unique
+        self.kind = base.kind
+        self.hidden: Dict[int, Any] = {}  # stored position -> value of a hidden base entry
+        self.hidden_counts: Dict[Any, int] = {}  # value -> hidden base entries holding it
+        self.added = INDEX_TYPES[self.kind](self.name, self.column, self.unique)  # value -> stored positions
+    
+    def fork(self, rows) -> 'OverlayIndex':
+        """Copy the changes into an overlay of the same base index for other overlay rows"""
+        index = OverlayIndex(self.base, rows)
+        index.hidden = dict(self.hidden)
+        index.hidden_counts = dict(self.hidden_counts)
+        index.added = self.added.copy()
+        return index
+    
+    def build(self, values: Iterable[Any]) -> None:
+        """Rebuild the index from the column value of each row, in row order, hiding every base entry"""
+        self.hidden, self.hidden_counts = {}, {}
+        for value, positions in self.base.items():
+            for stored in positions:
+                self._hide(value, stored)
+        self.added = INDEX_TYPES[self.kind](self.name, self.column, self.unique)
+        for position, value in enumerate(values):
+            self.add(value, position)
+    
+    def add(self, value: Any, position: int) -> None:
+        """Add a row position under the given value (NULLs are not indexed)"""
+        if value is not None:
+            self.added.add(value, self.rows.stored(position))
+    
+    def remove(self, value: Any, position: int) -> None:
+        """Remove a row position from the given value"""
+        if value is None:
+            return
+        stored = self.rows.stored(position)
+        if stored < self.rows.base_length and stored not in self.hidden:
+            # An unchanged base row still holds its base entry
+            self._hide(value, stored)
+        else:
+            self.added.remove(value, stored)
+    
+    def delete(self, rows: List[Tuple[int, Any]]) -> None:
+        """Remove deleted rows, given as (position, value) pairs; the overlay rows move later rows down"""
+        for position, value in rows:
+            self.remove(value, position)
+    
+    def lookup(self, value: Any) -> List[int]:
+        """Get the row positions holding the given value"""
+        return self._visible(self.base.lookup(value), self.added.lookup(value))
+    
+    def contains(self, value: Any) -> bool:
+        """Check if any row holds the given value"""
+        return self.count(value) > 0
+    
+    def count(self, value: Any) -> int:
+        """Count the rows holding the given value"""
+        return self.base.count(value) - self.hidden_counts.get(value, 0) + self.added.count(value)
+    
+    def distinct_count(self) -> int:
+        """Count the distinct non-NULL values indexed"""
+        gone = sum(
+            1 for value, hidden in self.hidden_counts.items()
+            if hidden == self.base.count(value) and not self.added.contains(value)
+        )
+        new = sum(1 for value, _ in self.added.items() if not self.base.contains(value))
+        return self.base.distinct_count() - gone + new
+    
+    def range(self, low: Optional[Any] = None, high: Optional[Any] = None,
+              low_inclusive: bool = True, high_inclusive: bool = True) -> List[int]:
+        """Get row positions with values between low and high, in key order (None means unbounded)"""
+        result = []
+        for _, positions in self._ordered_items((low, high, low_inclusive, high_inclusive)):
+            result.extend(positions)
+        return result
+    
+    def scan(self, descending: bool = False) -> Iterator[int]:
+        """Yield every indexed row position in key order, rows with equal keys in position order"""
+        for _, positions in self._ordered_items((None, None, True, True), descending):
+            yield from sorted(positions)
+    
+    def range_fraction(self, low: Optional[Any] = None, high: Optional[Any] = None,
+                       low_inclusive: bool = True, high_inclusive: bool = True) -> float:
+        """Get the fraction of distinct values between low and high in the base index, as an estimate"""
+        return self.base.range_fraction(low, high, low_inclusive, high_inclusive)
+    
+    def items(self) -> Iterable[Tuple[Any, List[int]]]:
+        """Iterate over (value, positions) pairs, in key order for an ordered index"""
+        if self.kind == OrderedIndex.kind:
+            return self._ordered_items((None, None, True, True))
+        return self._hash_items()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert index to a JSON-serializable dictionary"""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'column': self.column,
+            'unique': self.unique,
+            'entries': [[value, positions] for value, positions in self.items()]
+        }
+    
+    def copy(self):
+        """Copy the index with its changes applied, as an index of the base's kind"""
+        return INDEX_TYPES[self.kind].from_dict(self.to_dict())
+    
+    def apply(self) -> None:
+        """Move the changes into the base index, once the overlay rows are applied to the base rows"""
+        for stored, value in self.hidden.items():
+            self.base.remove(value, stored)
+        for value, positions in self.added.items():
+            for stored in positions:
+                self.base.add(value, stored)
+        removed = self.rows.removed.removed
+        if removed:
+            self.base.delete([(stored, None) for stored in removed])
+    
+    def _hide(self, value: Any, stored: int) -> None:
+        """Hide the base entry of a stored position"""
+        self.hidden[stored] = value
+        self.hidden_counts[value] = self.hidden_counts.get(value, 0) + 1
+    
+    def _visible(self, base_positions: Iterable[int], added_positions: Iterable[int]) -> List[int]:
+        """Get the row positions of the visible base entries and the added ones of a value"""
+        hidden = self.hidden
+        if hidden:
+            stored = [position for position in base_positions if position not in hidden]
+        else:
+            stored = list(base_positions)
+        stored.extend(added_positions)
+        return self.rows.removed.positions(stored)
+    
+    def _hash_items(self) -> Iterator[Tuple[Any, List[int]]]:
+        """Iterate over the (value, positions) pairs of a hash index"""
+        added = self.added.entries
+        for value, positions in self.base.items():
+            positions = self._visible(positions, added.get(value, ()))
+            if positions:
+                yield value, positions
+        for value, stored in added.items():
+            if not self.base.contains(value):
+                yield value, self.rows.removed.positions(stored)
+    
+    def _ordered_items(self, bounds: Tuple[Any, Any, bool, bool],
+                       descending: bool = False) -> Iterator[Tuple[Any, List[int]]]:
+        """Iterate over the (value, positions) pairs of an ordered index between bounds, in key order"""
+        base, added = self.base, self.added
+        start, end = base._bounds(*bounds)
+        base_keys = range(end - 1, start - 1, -1) if descending else range(start, end)
+        start, end = added._bounds(*bounds)
+        added_keys = range(end - 1, start - 1, -1) if descending else range(start, end)
+        
+        # Merge the two sorted key lists
+        before = operator.gt if descending else operator.lt
+        i, j = iter(base_keys), iter(added_keys)
+        b, a = next(i, None), next(j, None)
+        while b is not None or a is not None:
+            if a is None or (b is not None and before(base.keys[b], added.keys[a])):
+                key, positions = base.keys[b], self._visible(base.removed.positions(base.positions[b]), ())
+                b = next(i, None)
+            elif b is None or base.keys[b] != added.keys[a]:
+                key, positions = added.keys[a], self.rows.removed.positions(added.positions[a])
+                a = next(j, None)
+            else:
+                key = base.keys[b]
+                positions = self._visible(base.removed.positions(base.positions[b]), added.positions[a])
+                b, a = next(i, None), next(j, None)
+            if positions:
+                yield key, positions
+
+INDEX_TYPES = {
+    HashIndex.kind: HashIndex,
+    OrderedIndex.kind: OrderedIndex,
+}
\ No newline at end of file
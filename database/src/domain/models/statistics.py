@@ -0,0 +1,94 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+@dataclass
+class ColumnStatistics:
+    """Value distribution of a column, computed by ANALYZE"""
+    distinct_count: int
+    null_fraction: float
+    histogram: List[Any] = field(default_factory=list)  # equi-depth bucket bounds of non-NULL values
+    
+    def equality_selectivity(self) -> float:
+        """Estimate the fraction of rows equal to a single value"""
+        if self.distinct_count == 0:
+            return 0.0
+        return (1 - self.null_fraction) / self.distinct_count
+    
+    def range_selectivity(self, low: Optional[Any] = None, high: Optional[Any] = None,
+                          low_inclusive: bool = True, high_inclusive: bool = True) -> Optional[float]:
+        """Estimate the fraction of rows between low and high (None means unbounded)
+        
+        Returns None when there is no histogram to estimate from.
+        """
+        if not self.histogram:
+            return None
+        
+        equal = 1 / max(self.distinct_count, 1)
+        upper = 1.0 if high is None else self._fraction_below(high) + (equal if high_inclusive else 0.0)
+        lower = 0.0 if low is None else self._fraction_below(low) + (0.0 if low_inclusive else equal)
+        
+        fraction = min(max(upper - lower, 0.0), 1.0)
+        return fraction * (1 - self.null_fraction)
+    
+    def _fraction_below(self, value: Any) -> float:
+        """Estimate the fraction of non-NULL values less than value, interpolating within a bucket"""
+        bounds = self.histogram
+        try:
+            if value <= bounds[0]:
+                return 0.0
+            if value > bounds[-1]:
+                return 1.0
+        except TypeError:
+            return 0.5  # Not comparable with the column values
+        
+        # bounds[i] < value <= bounds[i + 1]
+        i = bisect_right(bounds, value) - 1
+        if i >= len(bounds) - 1:
+            i -= 1
+        low, high = bounds[i], bounds[i + 1]
+        
+        within = 0.5
+        if isinstance(value, (int, float)) and isinstance(low, (int, float)) and high > low:
+            within = (value - low) / (high - low)
+        return (i + within) / (len(bounds) - 1)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to a JSON-serializable dictionary"""
+        return {
+            'distinct_count': self.distinct_count,
+            'null_fraction': self.null_fraction,
+            'histogram': self.histogram
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ColumnStatistics':
+        """Create statistics from a dictionary produced by to_dict"""
+        return cls(data['distinct_count'], data['null_fraction'], list(data.get('histogram', [])))
+
+@dataclass
+class TableStatistics:
+    """Row count of a table and the column statistics of its last ANALYZE"""
+    row_count: int
+    columns: Dict[str, ColumnStatistics] = field(default_factory=dict)
+    analyzed_row_count: Optional[int] = None  # row count when ANALYZE ran, None if it never did
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to a JSON-serializable dictionary"""
+        return {
+            'row_count': self.row_count,
+            'analyzed_row_count': self.analyzed_row_count,
+            'columns': {name: column.to_dict() for name, column in self.columns.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TableStatistics':
+        """Create statistics from a dictionary produced by to_dict"""
+        return cls(
+            row_count=data['row_count'],
+            columns={
+                name: ColumnStatistics.from_dict(column)
+                for name, column in data.get('columns', {}).items()
+            },
+            analyzed_row_count=data.get('analyzed_row_count')
+        )
\ No newline at end of file
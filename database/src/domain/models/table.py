@@ -1,5 +1,125 @@
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from collections.abc import MutableSequence
+from itertools import chain
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, field
+from .index import OverlayIndex, RemovedPositions
+
+# A table row: one value per column, in the order of Table.columns (None is NULL)
+Row = Tuple[Any, ...]
+
+class OverlayRows(MutableSequence):
+    """Row list seen through changes kept apart from it, for a table overlay (see Table.overlay)
+    
+    The base rows are shared and left as they are. Rows of the base and
+    then appended rows have stored positions; replaced rows are held by
+    stored position, and removed ones are mapped out like an index's (see
+    RemovedPositions). The base must not change while the overlay is used.
+    """
+    
+    # Most removed rows apply() deletes from a base list one at a time; more are filtered out in one pass
+    APPLY_IN_PLACE_MAX_ROWS = 200
+    
+    def __init__(self, base):
+        self.base = base
+        self.base_length = len(base)
+        self.replaced: Dict[int, Row] = {}  # stored position in the base -> row replacing it
+        self.appended: List[Row] = []
+        self.removed = RemovedPositions()
+    
+    def fork(self) -> 'OverlayRows':
+        """Copy the changes into a new overlay of the same base"""
+        rows = OverlayRows.__new__(OverlayRows)
+        rows.base = self.base
+        rows.base_length = self.base_length
+        rows.replaced = dict(self.replaced)
+        rows.appended = list(self.appended)
+        rows.removed = self.removed
+        return rows
+    
+    def changed_count(self) -> int:
+        """Count the rows replaced, appended or removed"""
+        return len(self.replaced) + len(self.appended) + len(self.removed)
+    
+    def stored(self, position: int) -> int:
+        """Get the stored position of a row position"""
+        return self.removed.stored(position) if self.removed else position
+    
+    def __len__(self) -> int:
+        return self.base_length + len(self.appended) - len(self.removed)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        stored = self.stored(self._position(index))
+        if stored >= self.base_length:
+            return self.appended[stored - self.base_length]
+        row = self.replaced.get(stored)
+        return self.base[stored] if row is None else row
+    
+    def __setitem__(self, index: int, row: Row) -> None:
+        stored = self.stored(self._position(index))
+        if stored >= self.base_length:
+            self.appended[stored - self.base_length] = row
+        else:
+            self.replaced[stored] = row
+    
+    def __delitem__(self, index: int) -> None:
+        self.remove_positions([self._position(index)])
+    
+    def remove_positions(self, positions: Iterable[int]) -> None:
+        """Remove the rows at several sorted positions"""
+        positions = list(positions)
+        for position in positions:
+            self.replaced.pop(self.stored(position), None)
+        self.removed = self.removed.with_removed(positions)
+    
+    def __iter__(self) -> Iterator[Row]:
+        rows = chain(self.base, self.appended)
+        if not (self.replaced or self.removed):
+            return rows
+        return self._changed_rows(rows)
+    
+    def insert(self, index: int, row: Row) -> None:
+        """Insert a row; overlays only support inserting at the end"""
+        if index != len(self):
+            raise IndexError("Overlay rows only support appending rows")
+        self.appended.append(row)
+    
+    def extend(self, rows: Iterable[Row]) -> None:
+        """Append several rows"""
+        self.appended.extend(rows)
+    
+    def apply(self) -> None:
+        """Move the changes into a base row list"""
+        base = self.base
+        for stored, row in self.replaced.items():
+            base[stored] = row
+        base.extend(self.appended)
+        
+        removed = self.removed.removed
+        if len(removed) > self.APPLY_IN_PLACE_MAX_ROWS:
+            removed = set(removed)
+            base[:] = [row for i, row in enumerate(base) if i not in removed]
+        else:
+            for stored in reversed(removed):
+                del base[stored]
+    
+    def _changed_rows(self, rows: Iterator[Row]) -> Iterator[Row]:
+        """Yield the rows of the base and the appended ones with the changes applied"""
+        removed = set(self.removed.removed)
+        replaced = self.replaced
+        for stored, row in enumerate(rows):
+            if stored not in removed:
+                yield replaced.get(stored, row)
+    
+    def _position(self, index: int) -> int:
+        """Normalize a (possibly negative) index to a row position"""
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("row position out of range")
+        return index
 
 @dataclass
 class Column:
@@ -13,23 +133,123 @@ class Column:
         if self.constraints is None:
             self.constraints = []
 
+@dataclass
+class IndexDefinition:
+    """Represents a declared (non-constraint) index on a column"""
+    name: str
+    column: str
+    kind: str = 'HASH'  # HASH or ORDERED
+
 @dataclass
 class Table:
-    """Represents a database table"""
+    """Represents a database table
+    
+    Rows are held as Row tuples indexed by column position; dictionaries
+    keyed by column name are only built for rows leaving the engine. Row
+    tuples are immutable, so copies of a table share them.
+    """
     name: str
     columns: List[Column]
-    rows: List[Dict[str, Any]] = None
+    rows: List[Row] = None
+    indexes: Dict[str, Any] = None  # index name -> loaded index
+    index_definitions: List[IndexDefinition] = None
+    statistics: Any = None  # TableStatistics, attached when the table is loaded
+    column_store: Any = None  # ColumnStore, built by the first vectorized scan
+    validator: Any = None  # RowValidator, compiled from the columns on first validation
+    base: Optional['Table'] = field(default=None, repr=False, compare=False)  # the table an overlay's changes are kept apart from
+    positions: Dict[str, int] = field(default=None, init=False, repr=False, compare=False)  # column name -> position
+    snapshots: int = field(default=0, init=False, repr=False, compare=False)  # snapshots holding this copy or an overlay of it, see TableCache.hold()
     
     def __post_init__(self):
         if self.rows is None:
             self.rows = []
+        if self.indexes is None:
+            self.indexes = {}
+        if self.index_definitions is None:
+            self.index_definitions = []
+        self.positions = {col.name: i for i, col in enumerate(self.columns)}
+    
+    def copy(self) -> 'Table':
+        """Copy the table's rows and indexes for changes that must not show in this table
+        
+        The schema, statistics and validator are shared; rows held by a
+        storage view or an overlay are read into a list.
+        """
+        return Table(
+            name=self.name,
+            columns=self.columns,
+            rows=list(self.rows),
+            indexes={name: index.copy() for name, index in self.indexes.items()},
+            index_definitions=self.index_definitions,
+            statistics=self.statistics,
+            validator=self.validator
+        )
+    
+    def overlay(self) -> 'Table':
+        """Get a table for changes that must not show in this table, without copying it
+        
+        The overlay shares this table's rows and indexes, keeping only the
+        changes made to it (see OverlayRows and OverlayIndex), so its cost
+        follows the changes rather than the table. An overlay of an overlay
+        copies its changes over the same base. The schema, statistics and
+        validator are shared.
+        """
+        if self.base is None:
+            base = self
+            rows = OverlayRows(self.rows)
+            indexes = {name: OverlayIndex(index, rows) for name, index in self.indexes.items()}
+        else:
+            base = self.base
+            rows = self.rows.fork()
+            indexes = {name: index.fork(rows) for name, index in self.indexes.items()}
+        
+        return Table(
+            name=self.name,
+            columns=self.columns,
+            rows=rows,
+            indexes=indexes,
+            index_definitions=self.index_definitions,
+            statistics=self.statistics,
+            validator=self.validator,
+            base=base
+        )
+    
+    def apply_overlay(self) -> 'Table':
+        """Move an overlay's changes into its base table in place, returning the base
+        
+        Nothing may read the base or its other overlays meanwhile. Rows of a
+        storage view are left alone, as the storage writes the changes
+        itself (see StorageInterface.commit_changes).
+        """
+        base = self.base
+        if isinstance(base.rows, list):
+            self.rows.apply()
+        for index in self.indexes.values():
+            index.apply()
+        base.column_store = None
+        return base
+    
+    @property
+    def column_names(self) -> List[str]:
+        """Get the column names in row order"""
+        return [col.name for col in self.columns]
     
     def get_column(self, column_name: str) -> Optional[Column]:
         """Get a column by name"""
-        for col in self.columns:
-            if col.name == column_name:
-                return col
-        return None
+        position = self.positions.get(column_name)
+        return None if position is None else self.columns[position]
+    
+    def column_position(self, column_name: str) -> Optional[int]:
+        """Get the position of a column's values in a row"""
+        return self.positions.get(column_name)
+    
+    def to_row(self, values: Dict[str, Any]) -> Row:
+        """Build a row from values keyed by column name, missing columns being NULL"""
+        return tuple([values.get(col.name) for col in self.columns])
+    
+    def to_dict(self, row: Row) -> Dict[str, Any]:
+        """Build a dictionary keyed by column name from a row"""
+        return dict(zip(self.positions, row))
     
     def has_primary_key(self) -> bool:
         """Check if table has a primary key"""
@@ -43,4 +263,28 @@ class Table:
         for col in self.columns:
             if 'PRIMARY KEY' in col.constraints:
                 return col
+        return None
+    
+    def get_unique_columns(self) -> List[Column]:
+        """Get columns with PRIMARY KEY or UNIQUE constraints"""
+        return [
+            col for col in self.columns
+            if 'PRIMARY KEY' in col.constraints or 'UNIQUE' in col.constraints
+        ]
+    
+    def get_index(self, column_name: str):
+        """Get the index used for equality lookups on a column, preferring hash indexes"""
+        ordered = None
+        for index in self.indexes.values():
+            if index.column == column_name:
+                if index.kind == 'HASH':
+                    return index
+                ordered = index
+        return ordered
+    
+    def get_ordered_index(self, column_name: str):
+        """Get an ordered index on a column, if any"""
+        for index in self.indexes.values():
+            if index.column == column_name and index.kind == 'ORDERED':
+                return index
         return None
\ No newline at end of file
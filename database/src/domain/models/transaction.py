@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set, Tuple
+from .table import Table
+
+# A change to table rows: ('insert', rows), ('update', {position: row}) or ('delete', positions before the change)
+Change = Tuple[str, Any]
+
+@dataclass
+class TableWrite:
+    """The changes a transaction made to one table"""
+    table: Table  # the table the changes were applied to
+    epoch: int  # CommitService.epoch() of the table when the transaction first wrote to it
+    changes: List[Change] = field(default_factory=list)
+
+@dataclass
+class Transaction:
+    """A unit of work whose changes reach storage together, when it commits
+    
+    An explicit transaction (BEGIN ... COMMIT) changes private overlays of
+    the tables it writes (see Table.overlay) and keeps their write locks until it ends. A
+    statement run outside one is an implicit transaction changing the
+    cached tables under its statement locks. Either way the changes are
+    recorded per table for CommitService to flush.
+    """
+    explicit: bool = True
+    writes: Dict[str, TableWrite] = field(default_factory=dict)  # table name -> changes made to it
+    holds: List[Any] = field(default_factory=list)  # lock holds kept until the transaction ends
+    write_locked: Set[str] = field(default_factory=set)  # tables held by holds
+    unflushed: Set[str] = field(default_factory=set)  # committed tables whose changes are not in storage yet
+    error: Optional[Exception] = None  # why flushing the committed changes failed
+    
+    def record(self, table_name: str, change: Change) -> None:
+        """Record a change applied to a table written in this transaction"""
+        self.writes[table_name].changes.append(change)
\ No newline at end of file
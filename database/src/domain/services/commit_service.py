@@ -0,0 +1,181 @@
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from ..models.table import Table
+from ..models.transaction import Transaction, TableWrite, Change
+from ..exceptions import TransactionException
+
+# A commit waiting to be flushed: the transaction, its changes to one table and the table it changed
+PendingCommit = Tuple[Transaction, List[Change], Table]
+
+class CommitService:
+    """Flushes the changes of committed transactions to storage, batching concurrent commits
+    
+    A transaction hands its changes over with commit() while it holds its
+    write locks, then releases them and waits in wait(). The first waiter
+    becomes the leader and flushes every commit handed over so far, with
+    one storage write (and fsync) per table, while the others wait; commits
+    arriving meanwhile go to the next leader. Under load a write thus
+    covers many commits (group commit), and writers never wait for the
+    disk while holding a table.
+    
+    Until its commits are flushed a table is pinned in the table cache,
+    so it is served ahead of storage, and its lock is pinned, so other
+    processes and engines wait (see TableCache and ReadWriteLock). If a
+    flush fails, every unflushed commit of the table fails with it, its
+    cached copy is dropped and its epoch advances, so a transaction that
+    saw the lost changes cannot commit. A commit spanning several tables
+    is flushed table by table. Storages without GROUP_COMMIT are flushed
+    by commit() itself.
+    """
+    
+    def __init__(self, storage, schema_service, locks):
+        self.storage = storage
+        self.schema_service = schema_service
+        self.table_cache = schema_service.table_cache
+        self.index_service = schema_service.index_service
+        self.statistics_service = schema_service.statistics_service
+        self.locks = locks
+        self._condition = threading.Condition()
+        self._pending: Dict[str, List[PendingCommit]] = {}  # table name -> commits to flush, oldest first
+        self._pending_rows: Dict[str, List[Any]] = {}  # table name -> rows after its last pending commit
+        self._epochs: Dict[str, int] = {}  # table name -> failed flushes so far
+        self._flushing = False
+    
+    def epoch(self, table_name: str) -> int:
+        """Get the number of failed flushes of a table, recorded by transactions when they first write it"""
+        with self._condition:
+            return self._epochs.get(table_name, 0)
+    
+    def commit(self, transaction: Transaction) -> None:
+        """Hand the changes of a transaction over to be flushed; the caller holds its tables' write locks"""
+        writes = {table_name: write for table_name, write in transaction.writes.items() if write.changes}
+        for write in writes.values():
+            write.table = self.table_cache.settle(write.table)
+        if not self.storage.GROUP_COMMIT:
+            self._flush_now(writes)
+            return
+        
+        with self._condition:
+            for table_name, write in writes.items():
+                if write.epoch != self._epochs.get(table_name, 0):
+                    raise TransactionException(
+                        f"A failed commit lost changes to table '{table_name}' this transaction saw; retry it"
+                    )
+            
+            for table_name, write in writes.items():
+                self._pending.setdefault(table_name, []).append((transaction, write.changes, write.table))
+                if self.storage.COMMIT_NEEDS_ALL_ROWS:
+                    self._pending_rows[table_name] = list(write.table.rows)
+                self.table_cache.pin(write.table)
+                self.locks.table_lock(table_name).pin(self)
+                transaction.unflushed.add(table_name)
+    
+    def wait(self, transaction: Transaction) -> None:
+        """Wait until the changes of a committed transaction are in storage, flushing as leader when no one is"""
+        with self._condition:
+            while transaction.unflushed:
+                if self._flushing:
+                    self._condition.wait()
+                    continue
+                
+                # Lead: take every commit handed over so far and flush it without holding the condition
+                batch, batch_rows = self._pending, self._pending_rows
+                self._pending, self._pending_rows = {}, {}
+                self._flushing = True
+                self._condition.release()
+                try:
+                    results = {
+                        table_name: self._flush_table(table_name, commits, batch_rows.get(table_name))
+                        for table_name, commits in batch.items()
+                    }
+                finally:
+                    self._condition.acquire()
+                    self._flushing = False
+                    self._condition.notify_all()
+                self._finish(batch, results)
+        
+        if transaction.error is not None:
+            raise transaction.error
+    
+    def _flush_table(self, table_name: str, commits: List[PendingCommit],
+                     all_rows: Optional[List[Any]]) -> Tuple[Optional[Exception], Any]:
+        """Write the pending commits of a table in one storage write
+        
+        Returns the error if the write failed, else the storage version to
+        cache the table at, or None if it must be reloaded when next used.
+        """
+        changes = [change for _, commit_changes, _ in commits for change in commit_changes]
+        try:
+            rewritten = self.storage.commit_changes(table_name, changes, all_rows)
+        except Exception as e:
+            return e, None
+        return None, self._save_derived(table_name, commits[-1][2], rewritten)
+    
+    def _save_derived(self, table_name: str, table: Table, rewritten: bool) -> Any:
+        """Save the indexes and note the row count of a flushed table if it matches storage, returning its version
+        
+        That is when no commit of it is pending and no writer holds it; the
+        read lock, taken without waiting, keeps writers out meanwhile.
+        Otherwise a later flush saves them.
+        """
+        lock = self.locks.table_lock(table_name)
+        if not lock.acquire_read(0, self):
+            return None
+        
+        try:
+            with self._condition:
+                if table_name in self._pending:
+                    return None
+            if rewritten:
+                self.index_service.save_indexes(table)
+            self.statistics_service.record_row_count(table)
+            return self.storage.get_table_version(table_name)
+        except Exception:
+            # The rows are safely stored; indexes and statistics are checked and rebuilt on load
+            return None
+        finally:
+            lock.release_read()
+    
+    def _finish(self, batch: Dict[str, List[PendingCommit]],
+                results: Dict[str, Tuple[Optional[Exception], Any]]) -> None:
+        """Complete the commits of a flushed batch and release their pins, failing those of failed tables"""
+        for table_name, commits in batch.items():
+            error, version = results[table_name]
+            if error is not None:
+                # Later commits of the table build on the lost changes, so they fail too
+                commits = commits + self._pending.pop(table_name, [])
+                self._pending_rows.pop(table_name, None)
+                self._epochs[table_name] = self._epochs.get(table_name, 0) + 1
+            
+            for transaction, _, _ in commits:
+                if error is not None and transaction.error is None:
+                    transaction.error = error
+                transaction.unflushed.discard(table_name)
+                self.table_cache.unpin(table_name, version)
+                self.locks.table_lock(table_name).unpin()
+            
+            if error is not None:
+                self.table_cache.invalidate(table_name)
+        self._condition.notify_all()
+    
+    def _flush_now(self, writes: Dict[str, TableWrite]) -> None:
+        """Write the changes of a transaction to a storage that does not defer commits
+        
+        The committed table stays cached with its in-memory indexes, at the
+        storage version the write left.
+        """
+        for table_name, write in writes.items():
+            all_rows = write.table.rows if self.storage.COMMIT_NEEDS_ALL_ROWS else None
+            try:
+                if self.storage.commit_changes(table_name, write.changes, all_rows):
+                    self.index_service.save_indexes(write.table)
+                self.statistics_service.record_row_count(write.table)
+            except Exception:
+                self.schema_service.invalidate_cached_table(table_name)
+                raise
+            
+            if write.table.base is None:
+                self.schema_service.refresh_cached_table(write.table)
+            else:
+                # An overlay still held by snapshots is not in the storage's form, such as a view over its pages
+                self.schema_service.invalidate_cached_table(table_name)
\ No newline at end of file
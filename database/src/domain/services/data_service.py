@@ -1,167 +1,847 @@
-from typing import Dict, Any, List, Callable
-from ..models.table import Table
+import heapq
+import operator
+import threading
+from itertools import chain, islice
+from typing import Dict, Any, List, Callable, Iterable, Iterator, Optional, Tuple
+from ..models.table import Table, Row, OverlayRows
+from ..models.aggregate import AGGREGATE_FUNCTIONS
+from ..models.column_store import ColumnStore
+from ..models.transaction import Transaction, TableWrite, Change
+from .commit_service import CommitService
+from .lock_manager import LockManager
 from ..exceptions import (
     PrimaryKeyViolationException,
     UniqueConstraintViolationException
 )
 
+class DescendingKey:
+    """Sort key wrapper reversing the order of the value it holds"""
+    
+    __slots__ = ('value',)
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def __lt__(self, other: 'DescendingKey') -> bool:
+        return other.value < self.value
+    
+    def __eq__(self, other: 'DescendingKey') -> bool:
+        return self.value == other.value
+
 class DataService:
-    """Service for managing table data operations"""
+    """Service for managing table data operations
+    
+    Methods do not lock; callers hold a table's read lock from locks while
+    reading it, or read it from a snapshot (see SchemaService.hold_snapshot),
+    and hold its write lock while changing it, as QueryExecutor does for
+    each statement. Changes made with a transaction are recorded in it
+    for commit_service instead of being written through to storage.
+    """
+    
+    # Join strategies, named after how the table on the given side is probed
+    JOIN_STRATEGIES = ('index_left', 'index_right', 'hash_left', 'hash_right', 'nested_loop')
+    
+    # Smallest table worth building a ColumnStore for
+    VECTORIZE_MIN_ROWS = 2000
+    
+    # Most rows a DELETE removes from a row list one at a time; more are filtered out in one pass
+    DELETE_IN_PLACE_MAX_ROWS = 200
     
     def __init__(self, storage, schema_service):
         self.storage = storage
         self.schema_service = schema_service
+        self.index_service = schema_service.index_service
+        self.statistics_service = schema_service.statistics_service
+        self.locks = LockManager.for_database(storage.db_path, storage.table_lock)  # per-table readers-writer locks, taken per statement
+        self.commit_service = CommitService(storage, schema_service, self.locks)
+        self._column_store_mutex = threading.Lock()  # concurrent readers may bring the same store up to date
     
     def insert_row(self, table_name: str, row: Dict[str, Any]) -> None:
         """Insert a new row into table"""
+        self.insert_rows(table_name, [row])
+    
+    def insert_rows(self, table_name: str, rows: List[Dict[str, Any]],
+                    transaction: Optional[Transaction] = None) -> int:
+        """Insert a batch of rows into table with a single storage write
+        
+        Every row is validated before any is added, so a failing row leaves
+        the table unchanged.
+        """
         # Load table
-        table = self.schema_service.get_table(table_name)
+        table = self._writable_table(table_name, transaction)
         
-        # Validate row against schema
-        self.schema_service.validate_row(table, row)
-        
-        # Check PRIMARY KEY uniqueness
-        pk_column = table.get_primary_key_column()
-        if pk_column and row.get(pk_column.name) is not None:
-            for existing_row in table.rows:
-                if existing_row.get(pk_column.name) == row.get(pk_column.name):
-                    raise PrimaryKeyViolationException(
-                        f"PRIMARY KEY violation: value '{row.get(pk_column.name)}' already exists"
-                    )
-        
-        # Check UNIQUE constraints
-        for column in table.columns:
-            if 'UNIQUE' in column.constraints and row.get(column.name) is not None:
-                for existing_row in table.rows:
-                    if existing_row.get(column.name) == row.get(column.name):
-                        raise UniqueConstraintViolationException(
-                            f"UNIQUE constraint violation on column '{column.name}'"
-                        )
-        
-        # Add row to table
-        table.rows.append(row)
+        # Validate rows against schema, turning them into positional rows
+        validator = self.schema_service.row_validator(table)
+        rows = [validator.from_dict(row) for row in rows]
+        
+        # Check PRIMARY KEY and UNIQUE constraints against the indexes and within the batch
+        for column in self._unique_columns_pk_first(table):
+            index = table.get_index(column.name)
+            position = table.column_position(column.name)
+            batch_values = set()
+            for row in rows:
+                value = row[position]
+                if value is None:
+                    continue
+                if value in batch_values or index.contains(value):
+                    self._raise_unique_violation(column, value)
+                batch_values.add(value)
+        
+        if not rows:
+            return 0
+        
+        # Add rows to table and indexes
+        start = len(table.rows)
+        table.rows.extend(rows)
+        for index in table.indexes.values():
+            position = table.column_position(index.column)
+            for i, row in enumerate(rows, start=start):
+                index.add(row[position], i)
         
         # Save to storage
-        self.storage.save_table_data(table_name, table.rows)
+        self._save(table, ('insert', rows), transaction)
+        
+        return len(rows)
     
-    def select_rows(self, table_name: str, columns: List[str] = None, 
-                   where_condition: Callable = None) -> List[Dict[str, Any]]:
-        """Select rows from table with optional filtering"""
+    def select_rows(self, table_name: str, columns: List[str] = None,
+                   where_condition: Callable = None,
+                   lookup: Optional[Tuple[str, str, Any]] = None,
+                   order_by: Optional[List[Tuple[str, bool]]] = None,
+                   limit: Optional[int] = None, offset: int = 0,
+                   order_index: Optional[str] = None,
+                   counters: Optional[Dict[str, int]] = None,
+                   vector_condition: Callable = None) -> List[Dict[str, Any]]:
+        """Select rows from table with optional filtering, ordering and paging
+        
+        Takes the arguments of iter_rows() and returns its rows as a list.
+        """
+        return list(self.iter_rows(table_name, columns, where_condition, lookup, order_by,
+                                   limit, offset, order_index, counters, vector_condition))
+    
+    def iter_rows(self, table_name: str, columns: List[str] = None,
+                  where_condition: Callable = None,
+                  lookup: Optional[Tuple[str, str, Any]] = None,
+                  order_by: Optional[List[Tuple[str, bool]]] = None,
+                  limit: Optional[int] = None, offset: int = 0,
+                  order_index: Optional[str] = None,
+                  counters: Optional[Dict[str, int]] = None,
+                  vector_condition: Callable = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over the selected rows of a table, producing each as it is pulled
+        
+        Rows flow one at a time through scan, filter, limit and projection,
+        so nothing is held but the row in flight; only ORDER BY without an
+        index collects the matching rows (up to the limit) to sort them.
+        lookup is an optional (column, operator, value) comparison taken from
+        the WHERE clause, answered from an index when the column has one.
+        order_by holds (column, descending) sort keys; when order_index names
+        an ordered index on the only sort column, rows are read in its order
+        instead of sorted. Unsorted scans stop as soon as offset + limit rows
+        match. vector_condition is the WHERE clause compiled by
+        PredicateCompiler.compile_vectorized(); full scans of large tables
+        use it to filter whole columns at once, when NumPy is installed.
+        counters, if given, receives how many rows were scanned, matched,
+        sorted and returned so far.
+        """
         # Load table
         table = self.schema_service.get_table(table_name)
         
-        # Apply WHERE condition if provided
-        if where_condition:
-            filtered_rows = [row for row in table.rows if where_condition(row)]
+        # Read rows in index order, from an index lookup or from the whole table
+        matches = None
+        if order_index is not None:
+            rows = self._index_order_rows(table, table.indexes[order_index], order_by[0][1])
+            order_by = None
         else:
-            filtered_rows = table.rows
+            candidates = self._candidate_positions(table, lookup)
+            if candidates is None:
+                matches = self._vector_matches(table, vector_condition)
+            rows = iter(table.rows) if candidates is None else (table.rows[i] for i in candidates)
         
-        # Select specific columns if provided
+        if matches is not None:
+            # The WHERE clause was evaluated over whole columns
+            if counters is not None:
+                counters['scanned'] = len(table.rows)
+            rows = (table.rows[i] for i in matches)
+        else:
+            rows = self._counted(rows, counters, 'scanned')
+            
+            # Apply WHERE condition if provided
+            if where_condition:
+                rows = filter(where_condition, rows)
+        rows = self._counted(rows, counters, 'matched')
+        
+        if order_by:
+            order_by = [(table.column_position(column), desc) for column, desc in order_by]
+        rows = self._order_and_page(rows, order_by, limit, offset, counters)
+        
+        # Build result dictionaries of the selected columns, or of every column
         if columns and columns != ['*']:
-            result = []
-            for row in filtered_rows:
-                selected_row = {col: row.get(col) for col in columns if col in row}
-                result.append(selected_row)
-            return result
+            selected = [(col, table.column_position(col)) for col in columns if table.get_column(col)]
+            rows = ({col: row[position] for col, position in selected} for row in rows)
+        else:
+            names = table.column_names
+            rows = (dict(zip(names, row)) for row in rows)
         
-        return filtered_rows
+        return self._counted(rows, counters, 'returned')
     
-    def update_rows(self, table_name: str, updates: Dict[str, Any], 
-                   where_condition: Callable = None) -> int:
+    def sort_rows(self, rows: Iterable[Row], order_by: List[Tuple[int, bool]],
+                  limit: Optional[int] = None) -> List[Row]:
+        """Sort rows by (column position, descending) keys, NULLs last ascending and first descending
+        
+        With a limit only the first limit rows are kept, in a bounded heap
+        rather than a full sort. Rows with equal keys keep their order.
+        """
+        positions = [position for position, _ in order_by]
+        descending = order_by[0][1]
+        
+        if all(desc == descending for _, desc in order_by):
+            def key(row: Row) -> Tuple:
+                return tuple([(row[position] is None, row[position]) for position in positions])
+        else:
+            # Invert the descending keys so one ascending sort orders every key
+            directions = [desc for _, desc in order_by]
+            descending = False
+            
+            def key(row: Row) -> Tuple:
+                parts = ((row[position] is None, row[position]) for position in positions)
+                return tuple(DescendingKey(part) if desc else part for part, desc in zip(parts, directions))
+        
+        if limit is None:
+            return sorted(rows, key=key, reverse=descending)
+        if descending:
+            return heapq.nlargest(limit, rows, key=key)
+        return heapq.nsmallest(limit, rows, key=key)
+    
+    def update_rows(self, table_name: str, updates: Dict[str, Any],
+                   where_condition: Callable = None,
+                   lookup: Optional[Tuple[str, str, Any]] = None,
+                   transaction: Optional[Transaction] = None) -> int:
         """Update rows in table"""
         # Load table
-        table = self.schema_service.get_table(table_name)
+        table = self._writable_table(table_name, transaction)
+        validator = self.schema_service.row_validator(table)
+        validator.check_columns(updates)
+        table.column_store = None
+        changes = [(table.column_position(column), value) for column, value in updates.items()]
+        
+        # Build updated rows before touching the table
+        updated_rows = {}
+        for i in self._matching_positions(table, where_condition, lookup):
+            updated_row = list(table.rows[i])
+            for position, value in changes:
+                updated_row[position] = value
+            updated_rows[i] = tuple(updated_row)
         
-        updated_count = 0
-        
-        for i, row in enumerate(table.rows):
-            # Check if row matches WHERE condition
-            if where_condition is None or where_condition(row):
-                # Create updated row
-                updated_row = row.copy()
-                updated_row.update(updates)
-                
-                # Validate updated row
-                self.schema_service.validate_row(table, updated_row)
-                
-                # Check PRIMARY KEY uniqueness (if PK is being updated)
-                pk_column = table.get_primary_key_column()
-                if pk_column and pk_column.name in updates:
-                    for j, existing_row in enumerate(table.rows):
-                        if i != j and existing_row.get(pk_column.name) == updated_row.get(pk_column.name):
-                            raise PrimaryKeyViolationException(
-                                f"PRIMARY KEY violation: value '{updated_row.get(pk_column.name)}' already exists"
-                            )
-                
-                # Check UNIQUE constraints (if unique column is being updated)
-                for column in table.columns:
-                    if 'UNIQUE' in column.constraints and column.name in updates:
-                        for j, existing_row in enumerate(table.rows):
-                            if i != j and existing_row.get(column.name) == updated_row.get(column.name):
-                                raise UniqueConstraintViolationException(
-                                    f"UNIQUE constraint violation on column '{column.name}'"
-                                )
-                
-                # Apply update
-                table.rows[i] = updated_row
-                updated_count += 1
+        if not updated_rows:
+            return 0
+        
+        # Stored values are already valid, so only the new values need checking, once for all rows
+        validator.validate_changes(changes)
+        
+        # Check PRIMARY KEY and UNIQUE constraints (if those columns are being updated)
+        for column in self._unique_columns_pk_first(table):
+            if column.name in updates:
+                self._check_unique_update(table, column, updated_rows)
+        
+        # Apply update to rows and indexes
+        updated_indexes = [
+            (index, table.column_position(index.column))
+            for index in table.indexes.values() if index.column in updates
+        ]
+        for i, updated_row in updated_rows.items():
+            old_row = table.rows[i]
+            for index, position in updated_indexes:
+                index.remove(old_row[position], i)
+                index.add(updated_row[position], i)
+            table.rows[i] = updated_row
         
         # Save to storage
-        self.storage.save_table_data(table_name, table.rows)
+        self._save(table, ('update', updated_rows), transaction)
         
-        return updated_count
+        return len(updated_rows)
     
-    def delete_rows(self, table_name: str, where_condition: Callable = None) -> int:
+    def delete_rows(self, table_name: str, where_condition: Callable = None,
+                   lookup: Optional[Tuple[str, str, Any]] = None,
+                   transaction: Optional[Transaction] = None) -> int:
         """Delete rows from table"""
         # Load table
-        table = self.schema_service.get_table(table_name)
+        table = self._writable_table(table_name, transaction)
         
-        original_count = len(table.rows)
-        
-        # Filter out rows that match the WHERE condition
-        if where_condition:
-            table.rows = [row for row in table.rows if not where_condition(row)]
+        # Find rows that match the WHERE condition
+        if where_condition or lookup:
+            deleted = sorted(set(self._matching_positions(table, where_condition, lookup)))
         else:
-            table.rows = []
+            deleted = list(range(len(table.rows)))
         
-        deleted_count = original_count - len(table.rows)
+        if not deleted:
+            return 0
+        
+        # Remove the rows from the indexes, which move later positions down, then from the table
+        table.column_store = None
+        if len(deleted) == len(table.rows):
+            for index in table.indexes.values():
+                index.build(())
+        elif table.indexes:
+            deleted_rows = [table.rows[i] for i in deleted]
+            for index in table.indexes.values():
+                position = table.column_position(index.column)
+                index.delete([(i, row[position]) for i, row in zip(deleted, deleted_rows)])
+        self._remove_positions(table, deleted)
         
         # Save to storage
-        self.storage.save_table_data(table_name, table.rows)
+        self._save(table, ('delete', deleted), transaction)
         
-        return deleted_count
+        return len(deleted)
     
     def join_tables(self, left_table_name: str, right_table_name: str,
                    left_column: str, right_column: str,
-                   select_columns: List[str] = None) -> List[Dict[str, Any]]:
-        """Perform INNER JOIN between two tables"""
-        # Load both tables
+                   select_columns: List[str] = None,
+                   strategy: Optional[str] = None,
+                   order_by: Optional[List[Tuple[str, bool]]] = None,
+                   limit: Optional[int] = None, offset: int = 0,
+                   counters: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """Perform INNER JOIN between two tables
+        
+        Takes the arguments of iter_join() and returns its rows as a list.
+        """
+        return list(self.iter_join(left_table_name, right_table_name, left_column, right_column,
+                                   select_columns, strategy, order_by, limit, offset, counters))
+    
+    def iter_join(self, left_table_name: str, right_table_name: str,
+                  left_column: str, right_column: str,
+                  select_columns: List[str] = None,
+                  strategy: Optional[str] = None,
+                  order_by: Optional[List[Tuple[str, bool]]] = None,
+                  limit: Optional[int] = None, offset: int = 0,
+                  counters: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over the rows of an INNER JOIN between two tables, producing each as it is pulled
+        
+        strategy is one of JOIN_STRATEGIES, usually chosen by the query
+        planner. Without one, an index on either join column is probed
+        when there is one, otherwise the smaller table is hashed. Rows come
+        out in nested loop order (left rows in order, then right rows in
+        order) unless order_by names output columns to sort on, and NULL
+        never joins. The lookup side is hashed up front; pairs are then
+        found as rows are pulled, and output rows are built only for those
+        within limit and offset.
+        """
+        left_table, right_table, pairs = self._join_matches(
+            left_table_name, right_table_name, left_column, right_column, strategy, counters
+        )
+        
+        # Build output rows only for matches, and only those on the page when not sorting
+        names, project = self._join_projection(left_table, right_table, select_columns)
+        if order_by:
+            rows = (project(left_table.rows[i], right_table.rows[j]) for i, j in pairs)
+            order_by = [(names.index(column), desc) for column, desc in order_by]
+            rows = self._order_and_page(rows, order_by, limit, offset, counters)
+        else:
+            if offset or limit is not None:
+                pairs = islice(pairs, offset, None if limit is None else offset + limit)
+            rows = (project(left_table.rows[i], right_table.rows[j]) for i, j in pairs)
+        
+        return self._counted((dict(zip(names, row)) for row in rows), counters, 'returned')
+    
+    def aggregate_rows(self, table_name: str, group_by: List[Tuple[str, str]],
+                       aggregates: List[Tuple[str, str, str]], columns: List[str],
+                       where_condition: Callable = None,
+                       lookup: Optional[Tuple[str, str, Any]] = None,
+                       having: Callable = None,
+                       order_by: Optional[List[Tuple[str, bool]]] = None,
+                       limit: Optional[int] = None, offset: int = 0,
+                       counters: Optional[Dict[str, int]] = None,
+                       vector_condition: Callable = None) -> Iterator[Dict[str, Any]]:
+        """Aggregate the rows of a table matching a WHERE condition, one result row per group
+        
+        Matching rows stream from the scan into their group's aggregates.
+        Full scans of large tables are instead filtered and aggregated over
+        whole columns when NumPy is installed, vector_condition holds the
+        WHERE clause (see iter_rows()) and there is at most one GROUP BY
+        column; see aggregate() for the other arguments.
+        """
+        table = self.schema_service.get_table(table_name)
+        group_by = [(name, table.column_position(column)) for name, column in group_by]
+        aggregates = [
+            (name, function, None if column == '*' else table.column_position(column))
+            for name, function, column in aggregates
+        ]
+        
+        candidates = self._candidate_positions(table, lookup)
+        if candidates is None and (where_condition is None or vector_condition is not None):
+            results = self._vector_aggregate(table, vector_condition, group_by, aggregates, counters)
+            if results is not None:
+                return self._aggregate_results(results, group_by, aggregates, columns, having,
+                                               order_by, limit, offset, counters)
+        
+        rows = iter(table.rows) if candidates is None else (table.rows[i] for i in candidates)
+        rows = self._counted(rows, counters, 'scanned')
+        if where_condition:
+            rows = filter(where_condition, rows)
+        rows = self._counted(rows, counters, 'matched')
+        
+        return self.aggregate(rows, group_by, aggregates, columns, having, order_by, limit, offset, counters)
+    
+    def aggregate_join(self, left_table_name: str, right_table_name: str,
+                       left_column: str, right_column: str,
+                       group_by: List[Tuple[str, str]], aggregates: List[Tuple[str, str, str]],
+                       columns: List[str], strategy: Optional[str] = None,
+                       having: Callable = None,
+                       order_by: Optional[List[Tuple[str, bool]]] = None,
+                       limit: Optional[int] = None, offset: int = 0,
+                       counters: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """Aggregate the rows of an INNER JOIN, one result row per group
+        
+        Joined rows, holding only the 'table.column' values the aggregation
+        reads, are built one at a time and streamed into their group's
+        aggregates; see aggregate() for the other arguments.
+        """
+        left_table, right_table, pairs = self._join_matches(
+            left_table_name, right_table_name, left_column, right_column, strategy, counters
+        )
+        
+        needed = [column for _, column in group_by]
+        needed += [column for _, _, column in aggregates if column != '*' and column not in needed]
+        if needed:
+            _, project = self._join_projection(left_table, right_table, needed)
+            rows = (project(left_table.rows[i], right_table.rows[j]) for i, j in pairs)
+        else:
+            rows = (() for _ in pairs)
+        
+        group_by = [(name, needed.index(column)) for name, column in group_by]
+        aggregates = [
+            (name, function, None if column == '*' else needed.index(column))
+            for name, function, column in aggregates
+        ]
+        return self.aggregate(rows, group_by, aggregates, columns, having, order_by, limit, offset, counters)
+    
+    def aggregate(self, rows: Iterable[Row], group_by: List[Tuple[str, int]],
+                  aggregates: List[Tuple[str, str, Optional[int]]], columns: List[str],
+                  having: Callable = None,
+                  order_by: Optional[List[Tuple[str, bool]]] = None,
+                  limit: Optional[int] = None, offset: int = 0,
+                  counters: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """Hash-aggregate rows into one result row per group
+        
+        group_by holds (result name, row position) pairs and aggregates
+        (result name, function, row position) triples, with no position for
+        COUNT(*). Only the running aggregates of each group are kept while
+        rows stream in. Without GROUP BY there is one group, even for no
+        rows. Result rows hold the group values then the aggregates, in the
+        order of the planner's result table; they are filtered by having,
+        ordered and paged on result names, and reduced to columns as they
+        are pulled.
+        """
+        def new_states() -> List[Any]:
+            return [AGGREGATE_FUNCTIONS[function](position) for _, function, position in aggregates]
+        
+        groups = {}
+        key_positions = [position for _, position in group_by]
+        for row in rows:
+            key = tuple([row[position] for position in key_positions])
+            states = groups.get(key)
+            if states is None:
+                states = groups[key] = new_states()
+            for state in states:
+                state.add(row)
+        
+        if not group_by and not groups:
+            groups[()] = new_states()
+        
+        # Build a result row per group: group values, then aggregates
+        results = [key + tuple([state.result() for state in states]) for key, states in groups.items()]
+        return self._aggregate_results(results, group_by, aggregates, columns, having,
+                                       order_by, limit, offset, counters)
+    
+    def _aggregate_results(self, results: List[Row], group_by: List[Tuple[str, int]],
+                           aggregates: List[Tuple[str, str, Optional[int]]], columns: List[str],
+                           having: Optional[Callable], order_by: Optional[List[Tuple[str, bool]]],
+                           limit: Optional[int], offset: int,
+                           counters: Optional[Dict[str, int]]) -> Iterator[Dict[str, Any]]:
+        """Filter, order and page the result rows of aggregate() and name their selected values"""
+        if counters is not None:
+            counters['grouped'] = len(results)
+        
+        if having:
+            results = [result for result in results if having(result)]
+            if counters is not None:
+                counters['having'] = len(results)
+        
+        names = [name for name, _ in group_by] + [name for name, _, _ in aggregates]
+        if order_by:
+            order_by = [(names.index(column), desc) for column, desc in order_by]
+        results = self._order_and_page(results, order_by, limit, offset, counters)
+        
+        # Name the values of the SELECT list
+        selected = [(column, names.index(column)) for column in columns]
+        return self._counted(({column: result[position] for column, position in selected} for result in results),
+                             counters, 'returned')
+    
+    def count_rows(self, table_name: str) -> int:
+        """Count the rows of a table from its statistics, loading it only when they are out of date"""
+        count = None
+        if not self.schema_service.may_differ_from_storage(table_name):
+            count = self.statistics_service.row_count(table_name)
+        if count is None:
+            count = len(self.schema_service.get_table(table_name).rows)
+        return count
+    
+    def match_counts(self, table_name: str, where_condition: Callable = None,
+                     lookup: Optional[Tuple[str, str, Any]] = None) -> Tuple[int, int]:
+        """Count the rows an access path reads and the rows matching the WHERE condition
+        
+        Runs the same scan as select_rows, update_rows and delete_rows without
+        touching the rows, for EXPLAIN.
+        """
+        table = self.schema_service.get_table(table_name)
+        candidates = self._candidate_positions(table, lookup)
+        scanned = len(table.rows) if candidates is None else len(candidates)
+        return scanned, len(self._matching_positions(table, where_condition, lookup))
+    
+    def _matching_positions(self, table: Table, where_condition: Optional[Callable],
+                            lookup: Optional[Tuple[str, str, Any]]) -> List[int]:
+        """Get positions of rows matching the WHERE condition, probing an index when possible"""
+        candidates = self._candidate_positions(table, lookup)
+        if candidates is None:
+            if where_condition is None:
+                return list(range(len(table.rows)))
+            return [i for i, row in enumerate(table.rows) if where_condition(row)]
+        
+        if where_condition is None:
+            return candidates
+        return [i for i in candidates if where_condition(table.rows[i])]
+    
+    def _order_and_page(self, rows: Iterable[Row], order_by: Optional[List[Tuple[int, bool]]],
+                        limit: Optional[int], offset: int,
+                        counters: Optional[Dict[str, int]]) -> Iterable[Row]:
+        """Sort rows on (position, descending) keys, keeping only those up to the limit, then skip to the offset"""
+        if order_by:
+            rows = self.sort_rows(rows, order_by, None if limit is None else offset + limit)
+            if counters is not None:
+                counters['sorted'] = len(rows)
+        
+        if offset or limit is not None:
+            rows = islice(rows, offset, None if limit is None else offset + limit)
+        return rows
+    
+    def _join_matches(self, left_table_name: str, right_table_name: str, left_column: str, right_column: str,
+                      strategy: Optional[str],
+                      counters: Optional[Dict[str, int]]) -> Tuple[Table, Table, Iterator[Tuple[int, int]]]:
+        """Load both tables of a join and find its (left position, right position) pairs"""
         left_table = self.schema_service.get_table(left_table_name)
         right_table = self.schema_service.get_table(right_table_name)
         
-        result = []
-        
-        # Nested loop join
-        for left_row in left_table.rows:
-            for right_row in right_table.rows:
-                # Check join condition
-                if left_row.get(left_column) == right_row.get(right_column):
-                    # Combine rows with table prefixes
-                    joined_row = {}
-                    
-                    # Add left table columns with prefix
-                    for key, value in left_row.items():
-                        joined_row[f"{left_table_name}.{key}"] = value
-                    
-                    # Add right table columns with prefix
-                    for key, value in right_row.items():
-                        joined_row[f"{right_table_name}.{key}"] = value
-                    
-                    # Select specific columns if provided
-                    if select_columns and select_columns != ['*']:
-                        selected_row = {col: joined_row.get(col) for col in select_columns}
-                        result.append(selected_row)
-                    else:
-                        result.append(joined_row)
-        
-        return result
\ No newline at end of file
+        if strategy is None:
+            strategy = self._default_join_strategy(left_table, right_table, left_column, right_column)
+        pairs = self._join_pairs(left_table, right_table, left_column, right_column, strategy)
+        
+        if counters is not None:
+            counters.update(left=len(left_table.rows), right=len(right_table.rows))
+        return left_table, right_table, self._counted(pairs, counters, 'joined')
+    
+    def _candidate_positions(self, table: Table,
+                             lookup: Optional[Tuple[str, str, Any]]) -> Optional[List[int]]:
+        """Get sorted positions an index finds for a lookup, or None when the table must be scanned"""
+        if lookup is not None and self.index_service.can_lookup(table, *lookup):
+            return sorted(self.index_service.lookup(table, *lookup))
+        return None
+    
+    def _column_store(self, table: Table) -> Optional[ColumnStore]:
+        """Get the up-to-date ColumnStore of a table, or None when vectorizing does not apply
+        
+        Only in-memory tables large enough to repay building the store are
+        vectorized. The store is kept on the table; appended rows are added
+        to it and other writes drop it.
+        """
+        if not ColumnStore.available() or not isinstance(table.rows, list):
+            return None
+        if len(table.rows) < self.VECTORIZE_MIN_ROWS:
+            return None
+        
+        with self._column_store_mutex:
+            if table.column_store is None:
+                table.column_store = ColumnStore(table)
+            else:
+                table.column_store.extend(table.rows)
+            return table.column_store
+    
+    def _vector_matches(self, table: Table, vector_condition: Optional[Callable]) -> Optional[List[int]]:
+        """Get positions of rows matching a vectorized WHERE condition, or None to filter row by row"""
+        store = self._column_store(table) if vector_condition is not None else None
+        if store is None:
+            return None
+        
+        mask = vector_condition(store)
+        return None if mask is None else store.positions(mask)
+    
+    def _vector_aggregate(self, table: Table, vector_condition: Optional[Callable],
+                          group_by: List[Tuple[str, int]], aggregates: List[Tuple[str, str, Optional[int]]],
+                          counters: Optional[Dict[str, int]]) -> Optional[List[Row]]:
+        """Get the aggregate() result rows of a whole table over its columns, or None to aggregate row by row"""
+        if len(group_by) > 1:
+            return None
+        store = self._column_store(table)
+        if store is None:
+            return None
+        
+        mask = None
+        if vector_condition is not None:
+            mask = vector_condition(store)
+            if mask is None:
+                return None
+        
+        key_position = group_by[0][1] if group_by else None
+        grouped = store.aggregate(mask, key_position, [(function, position) for _, function, position in aggregates])
+        if grouped is None:
+            return None
+        firsts, values = grouped
+        
+        if counters is not None:
+            counters['scanned'] = len(table.rows)
+            counters['matched'] = len(table.rows) if mask is None else int(mask.sum())
+        
+        # Group values are taken from the group's first row, so they keep their Python types
+        keys = [(table.rows[i][key_position],) for i in firsts] if group_by else [()]
+        group_values = zip(*values) if values else [()] * len(keys)
+        return [key + tuple(aggregated) for key, aggregated in zip(keys, group_values)]
+    
+    def _index_order_rows(self, table: Table, index, descending: bool) -> Iterator[Row]:
+        """Read rows in the key order of an ordered index, NULLs last ascending and first descending"""
+        positions = index.scan(descending)
+        
+        # NULLs are not indexed, so nullable columns need a scan for them too
+        column = table.get_column(index.column)
+        if 'NOT NULL' not in column.constraints and 'PRIMARY KEY' not in column.constraints:
+            column_position = table.column_position(index.column)
+            nulls = (i for i, row in enumerate(table.rows) if row[column_position] is None)
+            positions = chain(nulls, positions) if descending else chain(positions, nulls)
+        
+        return (table.rows[i] for i in positions)
+    
+    @staticmethod
+    def _counted(items: Iterator, counters: Optional[Dict[str, int]], name: str) -> Iterator:
+        """Count the items passing through under counters[name], when counting"""
+        if counters is None:
+            return items
+        counters[name] = 0
+        
+        def count() -> Iterator:
+            for item in items:
+                counters[name] += 1
+                yield item
+        
+        return count()
+    
+    def _default_join_strategy(self, left_table: Table, right_table: Table,
+                               left_column: str, right_column: str) -> str:
+        """Choose a join strategy without statistics: an index, else a hash table on the smaller table"""
+        left_indexed = self._join_index_lookup(left_table, left_column) is not None
+        right_indexed = self._join_index_lookup(right_table, right_column) is not None
+        
+        # Scan the smaller table when both sides can be probed
+        if right_indexed and (not left_indexed or len(left_table.rows) <= len(right_table.rows)):
+            return 'index_right'
+        if left_indexed:
+            return 'index_left'
+        if len(left_table.rows) < len(right_table.rows):
+            return 'hash_left'
+        return 'hash_right'
+    
+    def _join_pairs(self, left_table: Table, right_table: Table,
+                    left_column: str, right_column: str, strategy: str) -> Iterator[Tuple[int, int]]:
+        """Get positions of joined row pairs using a join strategy, in nested loop order
+        
+        Pairs are found as they are pulled, except when probing the left
+        side, where they are collected to be put in order.
+        """
+        if strategy == 'nested_loop':
+            return self._nested_loop_pairs(left_table, right_table, left_column, right_column)
+        
+        # Probe the named side through its index, or a hash table when it has none
+        probe_right = strategy.endswith('_right')
+        table, column = (right_table, right_column) if probe_right else (left_table, left_column)
+        lookup = self._join_index_lookup(table, column) if strategy.startswith('index') else None
+        if lookup is None:
+            lookup = self._join_hash_lookup(table.rows, table.column_position(column))
+        
+        left_position = left_table.column_position(left_column)
+        right_position = right_table.column_position(right_column)
+        if probe_right:
+            values = (row[left_position] for row in left_table.rows)
+            return ((i, j) for i, value in enumerate(values) if value is not None for j in lookup(value))
+        
+        pairs = []
+        for j, row in enumerate(right_table.rows):
+            value = row[right_position]
+            if value is not None:
+                pairs.extend((i, j) for i in lookup(value))
+        pairs.sort()
+        return iter(pairs)
+    
+    def _nested_loop_pairs(self, left_table: Table, right_table: Table,
+                           left_column: str, right_column: str) -> Iterator[Tuple[int, int]]:
+        """Compare every pair of rows, which beats building a lookup for tiny tables"""
+        right_position = right_table.column_position(right_column)
+        left_position = left_table.column_position(left_column)
+        right_values = [row[right_position] for row in right_table.rows]
+        left_values = (row[left_position] for row in left_table.rows)
+        
+        return (
+            (i, j)
+            for i, value in enumerate(left_values) if value is not None
+            for j, right_value in enumerate(right_values) if right_value == value
+        )
+    
+    def _join_index_lookup(self, table: Table, column_name: str) -> Optional[Callable[[Any], List[int]]]:
+        """Get a function returning sorted positions for a join value from an index"""
+        index = table.get_index(column_name)
+        if index is None:
+            return None
+        
+        def lookup(value: Any) -> List[int]:
+            try:
+                return sorted(index.lookup(value))
+            except TypeError:
+                return []  # Not comparable with the keys of an ordered index, so never equal
+        
+        return lookup
+    
+    def _join_hash_lookup(self, rows: List[Row], column_position: int) -> Callable[[Any], List[int]]:
+        """Hash rows on the join column at a position and get a function returning row positions for a value"""
+        buckets = {}
+        for i, row in enumerate(rows):
+            value = row[column_position]
+            if value is not None:
+                buckets.setdefault(value, []).append(i)
+        return lambda value: buckets.get(value, [])
+    
+    def _join_projection(self, left_table: Table, right_table: Table,
+                         select_columns: Optional[List[str]]) -> Tuple[List[str], Callable[[Row, Row], Row]]:
+        """Get the 'table.column' output names of a join and a function building an output row from a left and right row"""
+        if not select_columns or select_columns == ['*']:
+            # Every left column followed by every right column
+            names = [f"{left_table.name}.{name}" for name in left_table.column_names]
+            names += [f"{right_table.name}.{name}" for name in right_table.column_names]
+            return names, operator.add
+        
+        # Resolve each selected column to a side (0 = left, 1 = right) and position once
+        sources = []
+        for col in select_columns:
+            table_name, _, key = col.partition('.')
+            if table_name == right_table.name and right_table.get_column(key):
+                sources.append((1, right_table.column_position(key)))
+            elif table_name == left_table.name and left_table.get_column(key):
+                sources.append((0, left_table.column_position(key)))
+            else:
+                sources.append((None, None))
+        
+        def project(left_row: Row, right_row: Row) -> Row:
+            rows = (left_row, right_row)
+            return tuple([rows[side][position] if side is not None else None for side, position in sources])
+        
+        return list(select_columns), project
+    
+    def _check_unique_update(self, table: Table, column, updated_rows: Dict[int, Row]) -> None:
+        """Check that updated rows keep a PRIMARY KEY/UNIQUE column unique"""
+        index = table.get_index(column.name)
+        position = table.column_position(column.name)
+        new_values = set()
+        
+        for i, updated_row in updated_rows.items():
+            value = updated_row[position]
+            if value is None:
+                continue
+            
+            # Rows that are being updated are checked through their new values
+            conflict = value in new_values or any(
+                j != i and j not in updated_rows for j in index.lookup(value)
+            )
+            if conflict:
+                self._raise_unique_violation(column, value)
+            new_values.add(value)
+    
+    def _unique_columns_pk_first(self, table: Table) -> List:
+        """Get PRIMARY KEY/UNIQUE columns with the primary key checked first"""
+        return sorted(table.get_unique_columns(), key=lambda col: 'PRIMARY KEY' not in col.constraints)
+    
+    def _raise_unique_violation(self, column, value: Any) -> None:
+        """Raise the exception matching the violated constraint"""
+        if 'PRIMARY KEY' in column.constraints:
+            raise PrimaryKeyViolationException(
+                f"PRIMARY KEY violation: value '{value}' already exists"
+            )
+        raise UniqueConstraintViolationException(
+            f"UNIQUE constraint violation on column '{column.name}'"
+        )
+    
+    def _writable_table(self, table_name: str, transaction: Optional[Transaction]) -> Table:
+        """Get a table to change, entering it in the transaction's write set on first use
+        
+        An explicit transaction changes its own overlay of the table (see
+        Table.overlay), so its changes stay out of sight until it commits and
+        are dropped if it rolls back. So does a write statement run on its own
+        when the rows are a storage view, so that its changes reach storage
+        together through commit_changes rather than one write at a time.
+        Otherwise it changes the cached table, or an overlay of it while
+        snapshots read it (see TableCache.change); the caller ends the change
+        with SchemaService.end_changes().
+        """
+        if transaction is None:
+            return self.schema_service.get_table(table_name)
+        
+        write = transaction.writes.get(table_name)
+        if write is None:
+            epoch = self.commit_service.epoch(table_name)
+            table = self.schema_service.get_table(table_name)
+            if transaction.explicit or not isinstance(table.rows, (list, OverlayRows)):
+                table = table.overlay()
+            else:
+                table = self.schema_service.change_table(table)
+            write = transaction.writes[table_name] = TableWrite(table, epoch)
+        return write.table
+    
+    def _remove_positions(self, table: Table, positions: List[int]) -> None:
+        """Remove the rows at sorted positions from a table's rows in place
+        
+        A storage view removes them with one write per page they were on,
+        and an overlay maps them out of its positions. A list moves its later rows down for each removed row, or is
+        filtered in one pass when many rows go.
+        """
+        rows = table.rows
+        if not isinstance(rows, list):
+            rows.remove_positions(positions)
+        elif len(positions) > self.DELETE_IN_PLACE_MAX_ROWS:
+            removed = set(positions)
+            rows[:] = [row for i, row in enumerate(rows) if i not in removed]
+        else:
+            for position in reversed(positions):
+                del rows[position]
+    
+    def _save(self, table: Table, change: Change, transaction: Optional[Transaction] = None) -> None:
+        """Persist a change to table rows, writing through the table cache
+        
+        In a transaction the change is recorded for commit instead, unless
+        the rows are a storage view (not an overlay of one), which writes
+        changes as they are made.
+        Otherwise the storage write returns True when the whole table was
+        rewritten; indexes are saved alongside such full writes. The row
+        count in the table statistics is noted in memory on every write.
+        """
+        if transaction is not None and isinstance(table.rows, (list, OverlayRows)):
+            transaction.record(table.name, change)
+            return
+        
+        kind, payload = change
+        write_rows = {
+            'insert': self.storage.append_rows,
+            'update': self.storage.replace_rows,
+            'delete': self.storage.remove_rows
+        }[kind]
+        try:
+            if write_rows(table.name, payload, table.rows):
+                self.index_service.save_indexes(table)
+            self.statistics_service.record_row_count(table)
+        except Exception:
+            # The cached copy is ahead of storage, reload it on next access
+            self.schema_service.invalidate_cached_table(table.name)
+            raise
+        
+        self.schema_service.refresh_cached_table(table)
\ No newline at end of file
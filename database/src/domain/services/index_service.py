@@ -0,0 +1,207 @@
+import json
+from typing import Dict, Any, List, Iterator, Optional
+from ..models.table import Table, Column, IndexDefinition
+from ..models.index import OrderedIndex, INDEX_TYPES
+from ..exceptions import ColumnNotFoundException, InvalidDataTypeException
+
+class IndexService:
+    """Service for building, maintaining and persisting table indexes"""
+    
+    RANGE_OPERATORS = ('>', '<', '>=', '<=')
+    ORDERED_INDEX_TYPES = ('INTEGER', 'FLOAT', 'DATE')
+    
+    def __init__(self, storage):
+        self.storage = storage
+    
+    def attach_indexes(self, table: Table) -> None:
+        """Attach PRIMARY KEY/UNIQUE and declared indexes, loading them from storage if valid"""
+        stored = self.storage.load_table_indexes(table.name)
+        stored_indexes = stored.get('indexes', {})
+        is_current = (
+            stored.get('row_count') == len(table.rows) and
+            stored.get('version') == self._version_stamp(table.name)
+        )
+        
+        table.indexes = {}
+        rebuilt = False
+        for definition, unique in self._index_definitions(table):
+            data = stored_indexes.get(definition.name)
+            if is_current and data is not None and data.get('kind') == definition.kind:
+                index = INDEX_TYPES[definition.kind].from_dict(data)
+            else:
+                index = INDEX_TYPES[definition.kind](definition.name, definition.column, unique)
+                index.build(self._column_values(table, definition.column))
+                rebuilt = True
+            table.indexes[definition.name] = index
+        
+        # Persist indexes that had to be rebuilt so the next load is cheap
+        if rebuilt:
+            self.save_indexes(table)
+    
+    def rebuild_indexes(self, table: Table) -> None:
+        """Rebuild every index of a table from its rows"""
+        for index in table.indexes.values():
+            index.build(self._column_values(table, index.column))
+    
+    def save_indexes(self, table: Table) -> None:
+        """Persist the indexes of a table"""
+        self.storage.save_table_indexes(table.name, {
+            'row_count': len(table.rows),
+            'version': self._version_stamp(table.name),
+            'indexes': {name: index.to_dict() for name, index in table.indexes.items()}
+        })
+    
+    def lookup(self, table: Table, column_name: str, operator: str, value: Any) -> Optional[List[int]]:
+        """Get positions of rows matching 'column operator value', or None if no index applies
+        
+        value is a list for IN and a (low, high) pair for BETWEEN.
+        """
+        if operator == 'IN':
+            if table.get_index(column_name) is None:
+                return None
+            positions = set()
+            for item in value:
+                positions.update(self.lookup(table, column_name, '=', item))
+            return list(positions)
+        
+        if operator in self.RANGE_OPERATORS or operator == 'BETWEEN':
+            index = table.get_ordered_index(column_name)
+            if index is None:
+                return None
+            return self._range(index, operator, value)
+        
+        index = table.get_index(column_name)
+        if index is None or operator != '=':
+            return None
+        
+        positions = index.lookup(value)
+        
+        # Guard against an index that went stale through external edits of the data file
+        if not self._positions_match(table, column_name, value, positions):
+            self.rebuild_indexes(table)
+            positions = index.lookup(value)
+        
+        return positions
+    
+    def can_lookup(self, table: Table, column_name: str, operator: str, value: Any) -> bool:
+        """Check if a 'column operator value' filter can be answered from an index"""
+        column = table.get_column(column_name)
+        if column is None:
+            return False
+        if operator == 'IN':
+            return table.get_index(column_name) is not None and all(
+                self._is_exact_match_type(column, item) for item in value
+            )
+        if operator == 'BETWEEN':
+            return table.get_ordered_index(column_name) is not None and all(
+                self._is_exact_match_type(column, bound) for bound in value
+            )
+        if not self._is_exact_match_type(column, value):
+            return False
+        if operator == '=':
+            return table.get_index(column_name) is not None
+        if operator in self.RANGE_OPERATORS:
+            return table.get_ordered_index(column_name) is not None
+        return False
+    
+    def selectivity(self, table: Table, column_name: str, operator: str, value: Any) -> Optional[float]:
+        """Estimate the fraction of rows a lookup finds from index counts, or None if no index applies
+        
+        Equality counts are exact; ranges assume rows spread evenly over the
+        distinct values.
+        """
+        if not self.can_lookup(table, column_name, operator, value):
+            return None
+        if not table.rows:
+            return 0.0
+        
+        if operator in self.RANGE_OPERATORS or operator == 'BETWEEN':
+            index = table.get_ordered_index(column_name)
+            return index.range_fraction(**self.range_bounds(operator, value))
+        
+        index = table.get_index(column_name)
+        values = set(value) if operator == 'IN' else {value}
+        return min(sum(index.count(item) for item in values) / len(table.rows), 1.0)
+    
+    def range_bounds(self, operator: str, value: Any) -> Dict[str, Any]:
+        """Get the OrderedIndex.range arguments for a comparison operator or BETWEEN"""
+        if operator == 'BETWEEN':
+            return {'low': value[0], 'high': value[1]}
+        if operator == '>':
+            return {'low': value, 'low_inclusive': False}
+        if operator == '>=':
+            return {'low': value}
+        if operator == '<':
+            return {'high': value, 'high_inclusive': False}
+        return {'high': value}
+    
+    def validate_definition(self, table: Table, definition: IndexDefinition) -> None:
+        """Check that an index can be declared on a table"""
+        column = table.get_column(definition.column)
+        if column is None:
+            raise ColumnNotFoundException(
+                f"Column '{definition.column}' does not exist in table '{table.name}'"
+            )
+        if definition.kind not in INDEX_TYPES:
+            raise InvalidDataTypeException(f"Invalid index type: {definition.kind}")
+        if definition.kind == 'ORDERED' and column.data_type not in self.ORDERED_INDEX_TYPES:
+            raise InvalidDataTypeException(
+                f"Ordered index requires an INTEGER, FLOAT or DATE column, "
+                f"'{column.name}' is {column.data_type}"
+            )
+    
+    def _index_definitions(self, table: Table):
+        """Get (definition, unique) pairs for PRIMARY KEY/UNIQUE columns and declared indexes
+        
+        A PRIMARY KEY of an orderable type gets an ordered index, so rows
+        can be read in key order (such as for ORDER BY id LIMIT n pages).
+        """
+        primary_key = table.get_primary_key_column()
+        definitions = [
+            (IndexDefinition(
+                name=f"{table.name}_{column.name}_idx", column=column.name,
+                kind='ORDERED' if column is primary_key and column.data_type in self.ORDERED_INDEX_TYPES else 'HASH'
+            ), True)
+            for column in table.get_unique_columns()
+        ]
+        definitions.extend((definition, False) for definition in table.index_definitions)
+        return definitions
+    
+    def _range(self, index: OrderedIndex, operator: str, value: Any) -> List[int]:
+        """Run a range scan for a comparison operator or BETWEEN"""
+        return index.range(**self.range_bounds(operator, value))
+    
+    def _version_stamp(self, table_name: str) -> Any:
+        """Get the storage version of a table in the form it takes after a JSON round trip"""
+        return json.loads(json.dumps(self.storage.get_table_version(table_name)))
+    
+    def _positions_match(self, table: Table, column_name: str, value: Any,
+                         positions: List[int]) -> bool:
+        """Check that indexed positions actually hold the value"""
+        column_position = table.column_position(column_name)
+        for position in positions:
+            if position >= len(table.rows) or table.rows[position][column_position] != value:
+                return False
+        return True
+    
+    def _column_values(self, table: Table, column_name: str) -> Iterator[Any]:
+        """Iterate over the values of a column, in row order"""
+        position = table.column_position(column_name)
+        return (row[position] for row in table.rows)
+    
+    def _is_exact_match_type(self, column: Column, value: Any) -> bool:
+        """Check that an index on this column finds exactly the rows a WHERE filter would
+        
+        PredicateCompiler converts literals to the column type, so FLOAT
+        columns are compared with floats; other values (such as numbers
+        compared with a text column) are matched by converting row values.
+        """
+        if isinstance(value, bool):
+            return False
+        if column.data_type == 'INTEGER':
+            return isinstance(value, (int, float))
+        if column.data_type == 'FLOAT':
+            return isinstance(value, float)
+        if column.data_type in ('VARCHAR', 'DATE'):
+            return isinstance(value, str)
+        return False
\ No newline at end of file
@@ -0,0 +1,217 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+from ..exceptions import LockTimeoutException
+
+class ReadWriteLock:
+    """Lock held by any number of readers or by one writer
+    
+    Waiting writers keep new readers out, so a steady stream of reads
+    cannot starve writes. Not reentrant: a thread holding the lock must
+    not acquire it again.
+    
+    A process lock (see StorageInterface.table_lock) extends the lock to
+    other processes: the first reader takes it shared and the last reader
+    releases it, and a writer takes it exclusively.
+    
+    A writer may pin the lock for commits it hands over to be flushed
+    after its release (see CommitService). Until they are unpinned the
+    process keeps the process lock exclusively, and holders other than the
+    pin's owner wait, as the table's storage is behind its owner's cache.
+    Acquiring returns False if the lock was not taken within timeout seconds.
+    
+    A reader that may hold the lock for long, such as a streamed SELECT,
+    registers a callback with add_yielder(). A writer calls it before
+    waiting, and it must release the reader's hold, so an unread stream
+    never keeps writers waiting.
+    """
+    
+    def __init__(self, process_lock: Optional[Any] = None):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+        self._pins = 0
+        self._pin_owner = None
+        self._process_hold = False  # whether this process holds process_lock
+        self._yielders: List[Callable[[], None]] = []
+        self.process_lock = process_lock
+    
+    def acquire_read(self, timeout: Optional[float] = None, owner: Any = None) -> bool:
+        """Wait until no writer holds or waits for the lock, then hold it for reading"""
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: not (self._writing or self._waiting_writers or self._pinned_against(owner)), timeout
+            ):
+                return False
+            if not self._process_hold and self.process_lock is not None:
+                if not self.process_lock.lock_shared(timeout):
+                    return False
+                self._process_hold = True
+            self._readers += 1
+            return True
+    
+    def release_read(self) -> None:
+        """Release a read hold"""
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._release_process_lock()
+                self._condition.notify_all()
+    
+    def acquire_write(self, timeout: Optional[float] = None, owner: Any = None) -> bool:
+        """Wait until no one holds the lock, then hold it for writing"""
+        with self._condition:
+            self._waiting_writers += 1
+            yielders = list(self._yielders)
+        
+        try:
+            # Outside the condition, as yielding readers release their holds
+            for callback in yielders:
+                callback()
+            
+            with self._condition:
+                if not self._condition.wait_for(
+                    lambda: not (self._writing or self._readers or self._pinned_against(owner)), timeout
+                ):
+                    return False
+                # A pinned lock already holds the process lock exclusively
+                if not self._pins and self.process_lock is not None:
+                    if not self.process_lock.lock_exclusive(timeout):
+                        return False
+                    self._process_hold = True
+                self._writing = True
+                return True
+        finally:
+            with self._condition:
+                self._waiting_writers -= 1
+                if not self._waiting_writers:
+                    self._condition.notify_all()
+    
+    def release_write(self) -> None:
+        """Release the write hold"""
+        with self._condition:
+            self._writing = False
+            self._release_process_lock()
+            self._condition.notify_all()
+    
+    def add_yielder(self, callback: Callable[[], None]) -> bool:
+        """Register a callback releasing a read hold when a writer waits, returning True if one already does"""
+        with self._condition:
+            self._yielders.append(callback)
+            return self._waiting_writers > 0
+    
+    def remove_yielder(self, callback: Callable[[], None]) -> None:
+        """Unregister a callback added by add_yielder()"""
+        with self._condition:
+            if callback in self._yielders:
+                self._yielders.remove(callback)
+    
+    def pin(self, owner: Any) -> None:
+        """Keep the table to owner once the caller's write hold is released, until unpin()"""
+        with self._condition:
+            self._pins += 1
+            self._pin_owner = owner
+    
+    def unpin(self) -> None:
+        """Drop a pin taken by pin()"""
+        with self._condition:
+            self._pins -= 1
+            if not self._pins:
+                self._pin_owner = None
+                if not (self._writing or self._readers):
+                    self._release_process_lock()
+                self._condition.notify_all()
+    
+    def _pinned_against(self, owner: Any) -> bool:
+        """Check if the lock is pinned by someone other than owner"""
+        return self._pins > 0 and (owner is None or owner is not self._pin_owner)
+    
+    def _release_process_lock(self) -> None:
+        """Release the process lock once nothing in this process holds or pins the table"""
+        if self._process_hold and not (self._writing or self._readers or self._pins):
+            self.process_lock.unlock()
+            self._process_hold = False
+
+class LockManager:
+    """Readers-writer locks of the tables of a database, one per table name
+    
+    A statement locks every table it touches at once through lock(), which
+    acquires them in name order so two statements cannot deadlock on each
+    other's tables. A transaction adds locks statement by statement, so its
+    waits are bounded by a timeout instead. Engines opened on the same
+    database directory share one LockManager, see for_database().
+    process_locks gets the lock a table shares with other processes, if the
+    storage has one. owner is passed on to ReadWriteLock.
+    """
+    
+    _shared: Dict[str, 'LockManager'] = {}  # resolved database path -> its lock manager
+    _shared_mutex = threading.Lock()
+    
+    def __init__(self, process_locks: Optional[Callable[[str], Any]] = None):
+        self.process_locks = process_locks
+        self._mutex = threading.Lock()
+        self._locks: Dict[str, ReadWriteLock] = {}
+    
+    @classmethod
+    def for_database(cls, db_path: Any, process_locks: Optional[Callable[[str], Any]] = None) -> 'LockManager':
+        """Get the lock manager shared by every engine of this process on a database directory"""
+        key = os.path.realpath(db_path)
+        with cls._shared_mutex:
+            manager = cls._shared.get(key)
+            if manager is None:
+                manager = cls._shared[key] = cls(process_locks)
+            return manager
+    
+    def table_lock(self, table_name: str) -> ReadWriteLock:
+        """Get the lock of a table, creating it on first use"""
+        with self._mutex:
+            lock = self._locks.get(table_name)
+            if lock is None:
+                process_lock = self.process_locks(table_name) if self.process_locks else None
+                lock = self._locks[table_name] = ReadWriteLock(process_lock)
+            return lock
+    
+    def acquire(self, reads: Iterable[str] = (), writes: Iterable[str] = (),
+                timeout: Optional[float] = None, owner: Any = None) -> List[Tuple[ReadWriteLock, bool]]:
+        """Lock tables for reading and writing (writing wins for a table in both), returning the holds for release()
+        
+        Raises LockTimeoutException if a lock is not taken within timeout seconds.
+        """
+        modes = {table_name: False for table_name in reads}
+        modes.update((table_name, True) for table_name in writes)
+        
+        holds = []
+        try:
+            for table_name in sorted(modes):
+                lock = self.table_lock(table_name)
+                acquire = lock.acquire_write if modes[table_name] else lock.acquire_read
+                if not acquire(timeout, owner):
+                    raise LockTimeoutException(
+                        f"Timed out waiting for a lock on table '{table_name}'; "
+                        f"roll back the transaction and retry"
+                    )
+                holds.append((lock, modes[table_name]))
+        except BaseException:
+            self.release(holds)
+            raise
+        return holds
+    
+    def release(self, holds: List[Tuple[ReadWriteLock, bool]]) -> None:
+        """Release the holds returned by acquire(), in reverse order"""
+        for lock, write in reversed(holds):
+            if write:
+                lock.release_write()
+            else:
+                lock.release_read()
+    
+    @contextmanager
+    def lock(self, reads: Iterable[str] = (), writes: Iterable[str] = (),
+             timeout: Optional[float] = None, owner: Any = None) -> Iterator[None]:
+        """Hold table locks for the duration of a with block"""
+        holds = self.acquire(reads, writes, timeout, owner)
+        try:
+            yield
+        finally:
+            self.release(holds)
\ No newline at end of file
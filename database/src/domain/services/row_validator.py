@@ -0,0 +1,107 @@
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from ..models.table import Table, Column, Row
+from ..exceptions import (
+    InvalidDataTypeException,
+    NotNullConstraintViolationException,
+    PrimaryKeyViolationException
+)
+
+# (column name, accepted Python types, exception for NULL or None, max length or None, type name for errors)
+ColumnCheck = Tuple[str, Any, Optional[type], Optional[int], str]
+
+class RowValidator:
+    """Validates rows against a table schema compiled once into per-column checks
+    
+    Each column becomes a ColumnCheck, so a row is validated by one pass
+    over its values with no column lookups, constraint list searches or
+    data type dispatch. A validator belongs to the Table it was compiled
+    from; a changed schema loads as a new Table and so gets a new
+    validator, see for_table().
+    """
+    
+    # Data type -> (accepted Python types, name used in error messages)
+    TYPES = {
+        'INTEGER': (int, 'INTEGER'),
+        'VARCHAR': (str, 'VARCHAR'),
+        'FLOAT': ((int, float), 'FLOAT'),
+        'BOOLEAN': (bool, 'BOOLEAN'),
+        'DATE': (str, 'DATE string'),
+    }
+    
+    def __init__(self, table: Table):
+        self.table_name = table.name
+        self.positions = table.positions
+        self.names = tuple(col.name for col in table.columns)
+        self.checks: List[ColumnCheck] = [self._compile_column(col) for col in table.columns]
+    
+    @classmethod
+    def for_table(cls, table: Table) -> 'RowValidator':
+        """Get the validator of a table, compiling it on first use"""
+        if table.validator is None:
+            table.validator = cls(table)
+        return table.validator
+    
+    def from_dict(self, values: Dict[str, Any]) -> Row:
+        """Validate values keyed by column name and return them as a row, missing columns being NULL"""
+        if not self.positions.keys() >= values.keys():
+            self.check_columns(values)
+        row = tuple([values.get(name) for name in self.names])
+        self.validate(row)
+        return row
+    
+    def check_columns(self, column_names: Iterable[str]) -> None:
+        """Check that all named columns exist"""
+        for col_name in column_names:
+            if col_name not in self.positions:
+                raise InvalidDataTypeException(f"Column '{col_name}' does not exist in table '{self.table_name}'")
+    
+    def validate(self, row: Row) -> None:
+        """Validate a row's values"""
+        for value, check in zip(row, self.checks):
+            name, types, null_exception, max_length, _ = check
+            if value is None:
+                if null_exception is not None:
+                    self._raise_null(name, null_exception)
+            elif not isinstance(value, types) or (max_length and len(value) > max_length):
+                self._raise_invalid(value, check)
+    
+    def validate_changes(self, changes: List[Tuple[int, Any]]) -> None:
+        """Validate the (column position, value) pairs set by an update, in column order"""
+        for position, value in sorted(changes, key=lambda change: change[0]):
+            check = self.checks[position]
+            name, types, null_exception, max_length, _ = check
+            if value is None:
+                if null_exception is not None:
+                    self._raise_null(name, null_exception)
+            elif not isinstance(value, types) or (max_length and len(value) > max_length):
+                self._raise_invalid(value, check)
+    
+    def _compile_column(self, column: Column) -> ColumnCheck:
+        """Compile the check of a column's values"""
+        # NOT NULL is checked ahead of PRIMARY KEY, so it picks the exception
+        null_exception = None
+        if 'NOT NULL' in column.constraints:
+            null_exception = NotNullConstraintViolationException
+        elif 'PRIMARY KEY' in column.constraints:
+            null_exception = PrimaryKeyViolationException
+        
+        types, type_name = self.TYPES[column.data_type]
+        max_length = column.max_length if column.data_type == 'VARCHAR' else None
+        return column.name, types, null_exception, max_length, type_name
+    
+    def _raise_null(self, name: str, exception: type) -> None:
+        """Raise the violation for a NULL in a NOT NULL or PRIMARY KEY column"""
+        if exception is PrimaryKeyViolationException:
+            raise exception(f"PRIMARY KEY column '{name}' cannot be NULL")
+        raise exception(f"Column '{name}' cannot be NULL")
+    
+    def _raise_invalid(self, value: Any, check: ColumnCheck) -> None:
+        """Raise the error for a value of the wrong type or too long for its column"""
+        name, types, _, max_length, type_name = check
+        if not isinstance(value, types):
+            raise InvalidDataTypeException(
+                f"Column '{name}' expects {type_name}, got {type(value).__name__}"
+            )
+        raise InvalidDataTypeException(
+            f"Column '{name}' max length is {max_length}, got {len(value)}"
+        )
\ No newline at end of file
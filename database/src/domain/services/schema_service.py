@@ -1,12 +1,19 @@
-from typing import Dict, Any, List
-from ..models.table import Table, Column
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from ..models.table import Table, Column, IndexDefinition, Row
+from ..models.transaction import Transaction
+from .index_service import IndexService
+from .row_validator import RowValidator
+from .statistics_service import StatisticsService
+from .table_cache import TableCache
 from ..exceptions import (
     InvalidDataTypeException,
+    IndexAlreadyExistsException,
+    IndexNotFoundException,
     TableAlreadyExistsException,
     TableNotFoundException,
-    NotNullConstraintViolationException,
-    UniqueConstraintViolationException,
-    PrimaryKeyViolationException
+    UniqueConstraintViolationException
 )
 
 class SchemaService:
@@ -14,8 +21,12 @@ class SchemaService:
     
     VALID_DATA_TYPES = ['INTEGER', 'VARCHAR', 'FLOAT', 'BOOLEAN', 'DATE']
     
-    def __init__(self, storage):
+    def __init__(self, storage, cache_size_bytes: int = TableCache.DEFAULT_MAX_BYTES):
         self.storage = storage
+        self.index_service = IndexService(storage)
+        self.statistics_service = StatisticsService(storage)
+        self.table_cache = TableCache(cache_size_bytes)
+        self._local = threading.local()  # transaction and snapshot this thread reads tables from, see using_transaction()
     
     def create_table(self, table_name: str, columns: List[Dict[str, Any]]) -> Table:
         """Create a new table with schema validation"""
@@ -59,89 +70,206 @@ class SchemaService:
         # Initialize empty data file
         self.storage.save_table_data(table_name, [])
         
+        # Build indexes for PRIMARY KEY/UNIQUE columns
+        self.index_service.attach_indexes(table)
+        self.statistics_service.attach_statistics(table)
+        self.refresh_cached_table(table)
+        
         return table
     
     def get_table(self, table_name: str) -> Table:
-        """Load table from storage"""
-        if not self.storage.table_exists(table_name):
+        """Get table from the cache, loading it from storage if missing or changed on disk"""
+        table = self._local_table(table_name)
+        if table is not None:
+            return table
+        
+        version = self.storage.get_table_version(table_name)
+        if version is None:
+            self.table_cache.invalidate(table_name)
             raise TableNotFoundException(f"Table '{table_name}' does not exist")
         
+        table = self.table_cache.get(table_name, version)
+        if table is not None:
+            return table
+        
         schema = self.storage.load_table_schema(table_name)
         rows = self.storage.load_table_data(table_name)
         
-        return self._schema_to_table(schema, rows)
+        table = self._schema_to_table(schema, rows)
+        self.index_service.attach_indexes(table)
+        self.statistics_service.attach_statistics(table, version)
+        
+        # Cache under the version read before loading, so a concurrent change forces a reload
+        self.table_cache.put(table, version)
+        
+        return table
+    
+    def refresh_cached_table(self, table: Table) -> None:
+        """Record a table that was just written through to storage as the cached copy"""
+        self.table_cache.put(table, self.storage.get_table_version(table.name))
+    
+    def invalidate_cached_table(self, table_name: str) -> None:
+        """Drop a table from the cache so the next access reloads it"""
+        self.table_cache.invalidate(table_name)
+    
+    @contextmanager
+    def using_transaction(self, transaction: Optional[Transaction]) -> Iterator[None]:
+        """Get the tables an explicit transaction changed as its own overlays, in this thread, within a with block"""
+        self._local.transaction = transaction
+        try:
+            yield
+        finally:
+            self._local.transaction = None
+    
+    @contextmanager
+    def using_snapshot(self, snapshot: Dict[str, Table]) -> Iterator[None]:
+        """Get the tables of a snapshot taken by hold_snapshot(), in this thread, within a with block"""
+        self._local.snapshot = snapshot
+        try:
+            yield
+        finally:
+            self._local.snapshot = None
+    
+    def hold_snapshot(self, table_names: Iterable[str]) -> Optional[Dict[str, Table]]:
+        """Hold the current copies of tables for reading them without locks, or None if one is not cached
+        
+        Release the snapshot with release_snapshot().
+        """
+        versions = {table_name: self.storage.get_table_version(table_name) for table_name in table_names}
+        return self.table_cache.hold(versions)
+    
+    def release_snapshot(self, snapshot: Dict[str, Table]) -> None:
+        """Release a snapshot taken by hold_snapshot()"""
+        self.table_cache.release(snapshot.values())
+    
+    def change_table(self, table: Table) -> Table:
+        """Get the table to apply a write statement's changes to, see TableCache.change()"""
+        return self.table_cache.change(table)
+    
+    def end_changes(self, transaction: Transaction) -> None:
+        """End the changes a write statement made to the tables it got from change_table()"""
+        for table_name in transaction.writes:
+            self.table_cache.changed(table_name)
+    
+    def may_differ_from_storage(self, table_name: str) -> bool:
+        """Check if the rows this thread sees in a table may differ from those in storage
+        
+        They do in its transaction's overlay and in a cached copy with changes
+        being flushed, and may in a snapshot taken before a later write.
+        """
+        return self._local_table(table_name) is not None or self.table_cache.is_pinned(table_name)
+    
+    def create_index(self, table_name: str, index_name: str, column_name: str,
+                     kind: str = 'HASH') -> IndexDefinition:
+        """Declare an index on a table column and build it"""
+        if self.find_index_table(index_name) is not None:
+            raise IndexAlreadyExistsException(f"Index '{index_name}' already exists")
+        
+        table = self.get_table(table_name)
+        if index_name in table.indexes:
+            raise IndexAlreadyExistsException(f"Index '{index_name}' already exists")
+        
+        definition = IndexDefinition(name=index_name, column=column_name, kind=kind.upper())
+        self.index_service.validate_definition(table, definition)
+        
+        # Save the declaration; the next get_table builds the index. Copies share the list, so replace it
+        table.index_definitions = table.index_definitions + [definition]
+        self.storage.save_table_schema(table_name, self._table_to_schema(table))
+        self.table_cache.invalidate(table_name)
+        
+        return definition
+    
+    def drop_index(self, index_name: str) -> str:
+        """Remove a declared index and return the name of its table"""
+        table_name = self.find_index_table(index_name)
+        if table_name is None:
+            raise IndexNotFoundException(f"Index '{index_name}' does not exist")
+        
+        table = self.get_table(table_name)
+        table.index_definitions = [
+            definition for definition in table.index_definitions
+            if definition.name != index_name
+        ]
+        self.storage.save_table_schema(table_name, self._table_to_schema(table))
+        self.table_cache.invalidate(table_name)
+        
+        return table_name
+    
+    def find_index_table(self, index_name: str) -> Optional[str]:
+        """Get the name of the table a declared index belongs to"""
+        for table_name in self.storage.list_tables():
+            schema = self.storage.load_table_schema(table_name)
+            if any(index['name'] == index_name for index in schema.get('indexes', [])):
+                return table_name
+        return None
     
     def drop_table(self, table_name: str) -> None:
         """Delete a table"""
+        self.table_cache.invalidate(table_name)
         self.storage.delete_table(table_name)
     
     def list_tables(self) -> List[str]:
         """List all tables"""
         return self.storage.list_tables()
     
-    def validate_row(self, table: Table, row: Dict[str, Any]) -> None:
-        """Validate a row against table schema"""
-        # Check all columns exist
-        for col_name in row.keys():
-            if not table.get_column(col_name):
+    def validate_row(self, table: Table, row: Dict[str, Any]) -> Row:
+        """Validate values keyed by column name against table schema and return them as a row"""
+        return self.row_validator(table).from_dict(row)
+    
+    def check_columns(self, table: Table, column_names: Iterable[str]) -> None:
+        """Check that all named columns exist"""
+        self.row_validator(table).check_columns(column_names)
+    
+    def validate_values(self, table: Table, row: Row) -> None:
+        """Validate a row's values against table schema"""
+        self.row_validator(table).validate(row)
+    
+    def row_validator(self, table: Table) -> RowValidator:
+        """Get the validator compiled from a table's schema, for validating many rows"""
+        return RowValidator.for_table(table)
+    
+    def convert_text_row(self, table: Table, row: Dict[str, str]) -> Dict[str, Any]:
+        """Convert text values, such as CSV fields, to the types of their columns"""
+        converted = {}
+        for col_name, text in row.items():
+            column = table.get_column(col_name)
+            if column is None:
                 raise InvalidDataTypeException(f"Column '{col_name}' does not exist in table '{table.name}'")
+            converted[col_name] = self._convert_text_value(column, text)
+        return converted
+    
+    def _convert_text_value(self, column: Column, text: str) -> Any:
+        """Convert a text value to a column data type"""
+        try:
+            if column.data_type == 'INTEGER':
+                return int(text)
+            if column.data_type == 'FLOAT':
+                return float(text)
+        except ValueError:
+            raise InvalidDataTypeException(
+                f"Column '{column.name}' expects {column.data_type}, got '{text}'"
+            )
         
-        # Validate each column
-        for column in table.columns:
-            value = row.get(column.name)
-            
-            # Check NOT NULL constraint
-            if 'NOT NULL' in column.constraints and value is None:
-                raise NotNullConstraintViolationException(
-                    f"Column '{column.name}' cannot be NULL"
-                )
-            
-            # Check PRIMARY KEY constraint (includes NOT NULL)
-            if 'PRIMARY KEY' in column.constraints and value is None:
-                raise PrimaryKeyViolationException(
-                    f"PRIMARY KEY column '{column.name}' cannot be NULL"
-                )
-            
-            # Validate data type if value is not None
-            if value is not None:
-                self._validate_data_type(column, value)
-    
-    def _validate_data_type(self, column: Column, value: Any) -> None:
-        """Validate value matches column data type"""
-        if column.data_type == 'INTEGER':
-            if not isinstance(value, int):
-                raise InvalidDataTypeException(
-                    f"Column '{column.name}' expects INTEGER, got {type(value).__name__}"
-                )
-        
-        elif column.data_type == 'VARCHAR':
-            if not isinstance(value, str):
-                raise InvalidDataTypeException(
-                    f"Column '{column.name}' expects VARCHAR, got {type(value).__name__}"
-                )
-            if column.max_length and len(value) > column.max_length:
-                raise InvalidDataTypeException(
-                    f"Column '{column.name}' max length is {column.max_length}, got {len(value)}"
-                )
-        
-        elif column.data_type == 'FLOAT':
-            if not isinstance(value, (int, float)):
-                raise InvalidDataTypeException(
-                    f"Column '{column.name}' expects FLOAT, got {type(value).__name__}"
-                )
-        
-        elif column.data_type == 'BOOLEAN':
-            if not isinstance(value, bool):
-                raise InvalidDataTypeException(
-                    f"Column '{column.name}' expects BOOLEAN, got {type(value).__name__}"
-                )
-        
-        elif column.data_type == 'DATE':
-            if not isinstance(value, str):
-                raise InvalidDataTypeException(
-                    f"Column '{column.name}' expects DATE string, got {type(value).__name__}"
-                )
-            # TODO: Add date format validation
+        if column.data_type == 'BOOLEAN':
+            if text.lower() in ('true', 't', '1'):
+                return True
+            if text.lower() in ('false', 'f', '0'):
+                return False
+            raise InvalidDataTypeException(
+                f"Column '{column.name}' expects BOOLEAN, got '{text}'"
+            )
+        
+        return text
+    
+    def _local_table(self, table_name: str) -> Optional[Table]:
+        """Get the copy of a table this thread reads from its transaction or snapshot, if any"""
+        transaction = getattr(self._local, 'transaction', None)
+        if transaction is not None and table_name in transaction.writes:
+            return transaction.writes[table_name].table
+        snapshot = getattr(self._local, 'snapshot', None)
+        if snapshot is not None:
+            return snapshot.get(table_name)
+        return None
     
     def _table_to_schema(self, table: Table) -> Dict[str, Any]:
         """Convert Table object to schema dictionary"""
@@ -155,10 +283,18 @@ class SchemaService:
                     'constraints': col.constraints
                 }
                 for col in table.columns
+            ],
+            'indexes': [
+                {
+                    'name': index.name,
+                    'column': index.column,
+                    'type': index.kind
+                }
+                for index in table.index_definitions
             ]
         }
     
-    def _schema_to_table(self, schema: Dict[str, Any], rows: List[Dict[str, Any]]) -> Table:
+    def _schema_to_table(self, schema: Dict[str, Any], rows: List[Row]) -> Table:
         """Convert schema dictionary to Table object"""
         columns = [
             Column(
@@ -170,4 +306,10 @@ class SchemaService:
             for col in schema['columns']
         ]
         
-        return Table(name=schema['name'], columns=columns, rows=rows)
\ No newline at end of file
+        index_definitions = [
+            IndexDefinition(name=index['name'], column=index['column'], kind=index['type'])
+            for index in schema.get('indexes', [])
+        ]
+        
+        return Table(name=schema['name'], columns=columns, rows=rows,
+                     index_definitions=index_definitions)
\ No newline at end of file
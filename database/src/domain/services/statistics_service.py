@@ -0,0 +1,99 @@
+import json
+from typing import Dict, Any, List, Optional, Tuple
+from ..models.table import Table
+from ..models.statistics import ColumnStatistics, TableStatistics
+from ..exceptions import TableNotFoundException
+
+class StatisticsService:
+    """Service for computing, maintaining and persisting table statistics
+    
+    Row counts are kept exact on every write in memory, stamped with the
+    storage version they match; statistics are only written to storage by
+    ANALYZE, which also recomputes the column statistics.
+    """
+    
+    HISTOGRAM_BUCKETS = 20
+    
+    def __init__(self, storage):
+        self.storage = storage
+        self._row_counts: Dict[str, Tuple[Any, int]] = {}  # table name -> (storage version, row count)
+    
+    def attach_statistics(self, table: Table, version: Any = None) -> None:
+        """Attach the stored statistics of a freshly loaded table, correcting its row count
+        
+        version is the storage version read before loading the table, if known.
+        """
+        stored = self.storage.load_table_stats(table.name)
+        table.statistics = TableStatistics.from_dict(stored) if stored else TableStatistics(len(table.rows))
+        self.record_row_count(table, version)
+    
+    def record_row_count(self, table: Table, version: Any = None) -> None:
+        """Note the row count of a table that was just loaded or written, for its version in storage"""
+        if table.statistics is None:
+            table.statistics = TableStatistics(len(table.rows))
+        table.statistics.row_count = len(table.rows)
+        if version is None:
+            version = self.storage.get_table_version(table.name)
+        self._row_counts[table.name] = (version, len(table.rows))
+    
+    def row_count(self, table_name: str) -> Optional[int]:
+        """Get the row count of a table without loading it, or None if it is not known
+        
+        That is the count noted for the current storage version, else the
+        count of statistics stored for it, else one the storage keeps.
+        """
+        version = self.storage.get_table_version(table_name)
+        if version is None:
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        
+        noted = self._row_counts.get(table_name)
+        if noted is not None and noted[0] == version:
+            return noted[1]
+        
+        stored = self.storage.load_table_stats(table_name)
+        if stored and self._is_current(table_name, stored):
+            return stored['row_count']
+        return self.storage.count_rows(table_name)
+    
+    def analyze(self, table: Table) -> TableStatistics:
+        """Compute and persist the column statistics of a table"""
+        row_count = len(table.rows)
+        columns = {}
+        for position, column in enumerate(table.columns):
+            values = [row[position] for row in table.rows]
+            non_null = [value for value in values if value is not None]
+            columns[column.name] = ColumnStatistics(
+                distinct_count=len(set(non_null)),
+                null_fraction=(row_count - len(non_null)) / row_count if row_count else 0.0,
+                histogram=self._histogram(non_null)
+            )
+        
+        table.statistics = TableStatistics(row_count, columns, analyzed_row_count=row_count)
+        self._save(table)
+        self.record_row_count(table)
+        return table.statistics
+    
+    def _histogram(self, values: List[Any]) -> List[Any]:
+        """Get equi-depth bucket bounds: the minimum, the values at each bucket boundary and the maximum"""
+        if not values:
+            return []
+        try:
+            values = sorted(values)
+        except TypeError:
+            return []  # Values of mixed types have no order
+        buckets = min(self.HISTOGRAM_BUCKETS, len(values))
+        return [values[min(i * len(values) // buckets, len(values) - 1)] for i in range(buckets)] + [values[-1]]
+    
+    def _save(self, table: Table) -> None:
+        """Write table statistics stamped with the current storage version"""
+        data = table.statistics.to_dict()
+        data['version'] = self._version_stamp(table.name)
+        self.storage.save_table_stats(table.name, data)
+    
+    def _is_current(self, table_name: str, stored: Dict[str, Any]) -> bool:
+        """Check that stored statistics were written for the current version of the table"""
+        return stored.get('version') == self._version_stamp(table_name)
+    
+    def _version_stamp(self, table_name: str) -> Any:
+        """Get the storage version of a table in the form it takes after a JSON round trip"""
+        return json.loads(json.dumps(self.storage.get_table_version(table_name)))
\ No newline at end of file
@@ -0,0 +1,210 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Optional
+from ..models.table import Table
+
+class TableCache:
+    """LRU cache of loaded tables bounded by an estimated memory budget
+    
+    Safe to share between threads; tables handed out are shared too, so
+    callers lock them as DataService describes, or hold them as a snapshot
+    (see hold()). A pinned table holds changes its storage does not have
+    yet: it is served whatever the storage version and never evicted until
+    unpinned (see CommitService). A cached table may be an overlay of an
+    older copy still held by snapshots (see Table.overlay); its changes
+    are moved into that copy once nothing holds it (see settle()).
+    """
+    
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    SAMPLE_SIZE = 100
+    # Largest share of its rows a held overlay may have changed and still be overlaid again by a writer, see change()
+    OVERLAY_MAX_CHANGED_FRACTION = 0.25
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # table name -> (table, version, estimated size)
+        self._pins = {}  # table name -> pin count
+        self._changing = set()  # names of tables a writer changes in place, see change()
+        self._condition = threading.Condition(threading.RLock())
+    
+    def get(self, table_name: str, version: Any) -> Optional[Table]:
+        """Get a cached table if it is still at the given storage version"""
+        with self._condition:
+            entry = self._entries.get(table_name)
+            if entry is None:
+                return None
+            
+            table, cached_version, _ = entry
+            if cached_version != version and table_name not in self._pins:
+                # Table was changed outside this cache
+                self.invalidate(table_name)
+                return None
+            
+            self._entries.move_to_end(table_name)
+            return table
+    
+    def put(self, table: Table, version: Any) -> None:
+        """Cache a table at the given storage version, evicting cold tables if needed"""
+        size = self._estimate_size(table)
+        
+        with self._condition:
+            self.invalidate(table.name)
+            if size > self.max_bytes and table.name not in self._pins:
+                return  # Table alone exceeds the budget, always load it from storage
+            
+            self._entries[table.name] = (table, version, size)
+            self.current_bytes += size
+            
+            # Evict least recently used tables until the budget is met
+            for table_name in list(self._entries):
+                if self.current_bytes <= self.max_bytes:
+                    break
+                if table_name not in self._pins and table_name != table.name:
+                    self.invalidate(table_name)
+    
+    def pin(self, table: Table) -> None:
+        """Cache a table with changes not yet in storage, keeping it until unpin()"""
+        with self._condition:
+            entry = self._entries.get(table.name)
+            self._pins[table.name] = self._pins.get(table.name, 0) + 1
+            if entry is None or entry[0] is not table:
+                self.put(table, None)
+    
+    def unpin(self, table_name: str, version: Any = None) -> None:
+        """Drop a pin taken by pin(); with the last one, the table is recorded at the storage version given"""
+        with self._condition:
+            self._pins[table_name] -= 1
+            if self._pins[table_name]:
+                return
+            del self._pins[table_name]
+            
+            # Without a version the next get() finds the entry out of date and reloads it
+            entry = self._entries.get(table_name)
+            if entry is not None:
+                self._entries[table_name] = (entry[0], version, entry[2])
+    
+    def hold(self, versions: Dict[str, Any]) -> Optional[Dict[str, Table]]:
+        """Hold the cached copies of tables at the given storage versions as a snapshot, or None if one is missing
+        
+        Waits while a writer changes one of the tables in place. Until the
+        snapshot is released, writers change an overlay of a held table
+        instead (see change()), so the snapshot stays as it was without
+        locking.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._changing.isdisjoint(versions))
+            tables = {}
+            for table_name, version in versions.items():
+                table = self.get(table_name, version)
+                if table is None:
+                    return None
+                tables[table_name] = table
+            
+            for table in tables.values():
+                table.snapshots += 1
+                if table.base is not None:
+                    table.base.snapshots += 1
+            return tables
+    
+    def release(self, tables: Iterable[Table]) -> None:
+        """Release the tables of a snapshot taken by hold()"""
+        with self._condition:
+            for table in tables:
+                table.snapshots -= 1
+                if table.base is not None:
+                    table.base.snapshots -= 1
+    
+    def change(self, table: Table) -> Table:
+        """Get the table a writer holding a table's write lock changes
+        
+        That is the table itself, which snapshots wait for until changed(),
+        or an overlay of it when snapshots hold it (see Table.overlay), so a
+        write costs about the same with or without them; the overlay
+        replaces it in the cache when its changes are committed. An overlay
+        holding changes to more than OVERLAY_MAX_CHANGED_FRACTION of its
+        rows is copied instead, as each new overlay of it copies them.
+        """
+        with self._condition:
+            table = self._settle(table)
+            if not table.snapshots:
+                self._changing.add(table.name)
+                return table
+        if table.base is not None and table.rows.changed_count() > len(table.rows) * self.OVERLAY_MAX_CHANGED_FRACTION:
+            return table.copy()
+        return table.overlay()
+    
+    def settle(self, table: Table) -> Table:
+        """Get the table to cache once a writer holding its write lock has changed it, see _settle()"""
+        with self._condition:
+            return self._settle(table)
+    
+    def changed(self, table_name: str) -> None:
+        """End an in-place change started by change()"""
+        with self._condition:
+            if table_name in self._changing:
+                self._changing.discard(table_name)
+                self._condition.notify_all()
+    
+    def _settle(self, table: Table) -> Table:
+        """Move an overlay's changes into its base when no snapshot holds the base or its overlays
+        
+        The base then replaces the overlay, or an older overlay of it, in
+        the cache and is returned. Otherwise the overlay is returned as is,
+        also while the table is pinned, as commits being flushed may read it.
+        """
+        base = table.base
+        if base is None or base.snapshots or table.name in self._pins:
+            return table
+        
+        table.apply_overlay()
+        entry = self._entries.get(table.name)
+        if entry is not None and (entry[0] is table or entry[0].base is base):
+            self._entries[table.name] = (base, entry[1], entry[2])
+        return base
+    
+    def is_pinned(self, table_name: str) -> bool:
+        """Check if a table holds changes not yet in storage"""
+        return table_name in self._pins
+    
+    def invalidate(self, table_name: str) -> None:
+        """Remove a table from the cache"""
+        with self._condition:
+            entry = self._entries.pop(table_name, None)
+            if entry is not None:
+                self.current_bytes -= entry[2]
+    
+    def clear(self) -> None:
+        """Remove all tables from the cache"""
+        with self._condition:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def __contains__(self, table_name: str) -> bool:
+        return table_name in self._entries
+    
+    def _estimate_size(self, table: Table) -> int:
+        """Estimate the memory used by a table's rows from a sample"""
+        if table.base is not None:
+            # An overlay shares its base's rows and indexes, holding only its changes
+            changed = table.rows.changed_count()
+            return self._estimate_size(table.base) + 100 * (len(table.indexes) + 1) * changed
+        
+        if not isinstance(table.rows, list):
+            # Rows are read on demand by the storage engine, only indexes are held here
+            return sys.getsizeof(table.rows) + 100 * len(table.indexes) * len(table.rows)
+        
+        if not table.rows:
+            return sys.getsizeof(table.rows)
+        
+        step = max(1, len(table.rows) // self.SAMPLE_SIZE)
+        sample = table.rows[::step]
+        sample_bytes = sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+            for row in sample
+        )
+        
+        # Indexes hold roughly one entry per row
+        per_row = sample_bytes / len(sample) + 100 * len(table.indexes)
+        return sys.getsizeof(table.rows) + int(per_row * len(table.rows))
\ No newline at end of file
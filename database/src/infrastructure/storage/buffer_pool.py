@@ -0,0 +1,52 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from ...domain.models.table import Row
+
+class BufferPool:
+    """LRU cache of decoded pages shared by the tables of a PageStorage, safe to use from several threads"""
+
+    DEFAULT_CAPACITY_PAGES = 1024
+
+    def __init__(self, capacity_pages: int = DEFAULT_CAPACITY_PAGES):
+        self.capacity_pages = capacity_pages
+        self.hits = 0
+        self.misses = 0
+        self._pages = OrderedDict()  # (table name, page number) -> list of rows
+        self._mutex = threading.Lock()
+
+    def get(self, table_name: str, page_no: int) -> Optional[List[Row]]:
+        """Get a cached page, marking it most recently used"""
+        key = (table_name, page_no)
+        with self._mutex:
+            rows = self._pages.get(key)
+            if rows is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._pages.move_to_end(key)
+            return rows
+
+    def put(self, table_name: str, page_no: int, rows: List[Row]) -> None:
+        """Cache a page, evicting the least recently used pages when full"""
+        key = (table_name, page_no)
+        with self._mutex:
+            self._pages[key] = rows
+            self._pages.move_to_end(key)
+
+            while len(self._pages) > self.capacity_pages:
+                self._pages.popitem(last=False)
+
+    def discard_table(self, table_name: str) -> None:
+        """Drop every cached page of a table"""
+        with self._mutex:
+            for key in [key for key in self._pages if key[0] == table_name]:
+                del self._pages[key]
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def stats(self) -> Tuple[int, int]:
+        """Get (hits, misses) counters"""
+        return self.hits, self.misses
@@ -0,0 +1,36 @@
+import csv
+import json
+from typing import Dict, Any, Iterator
+from pathlib import Path
+from ...domain.exceptions import DatabaseException
+
+BULK_FORMATS = ('CSV', 'NDJSON')
+
+def read_rows(file_path: str, file_format: str) -> Iterator[Dict[str, Any]]:
+    """Read rows from a CSV file with a header line or an NDJSON file
+    
+    CSV values are returned as strings, with empty fields left out of the
+    row; NDJSON values keep their JSON types.
+    """
+    if file_format not in BULK_FORMATS:
+        raise DatabaseException(f"Unknown file format '{file_format}', expected CSV or NDJSON")
+    
+    path = Path(file_path)
+    if not path.is_file():
+        raise DatabaseException(f"File '{file_path}' does not exist")
+    
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if file_format == 'CSV':
+            for row in csv.DictReader(f):
+                yield {key: value for key, value in row.items() if value != ''}
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    raise DatabaseException(f"Invalid JSON on line {line_no} of '{file_path}': {e}")
+                if not isinstance(row, dict):
+                    raise DatabaseException(f"Line {line_no} of '{file_path}' is not a JSON object")
+                yield row
\ No newline at end of file
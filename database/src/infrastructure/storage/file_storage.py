@@ -1,17 +1,34 @@
 import json
 import os
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, Iterable, List, Tuple
 from pathlib import Path
 from .storage_interface import StorageInterface
+from .table_lock import TableLockFile
+from ...domain.models.table import Row
 from ...domain.exceptions import TableNotFoundException, TableAlreadyExistsException
 
 class FileStorage(StorageInterface):
-    """JSON file-based storage implementation"""
+    """JSON file-based storage implementation
+    
+    Rows are stored as JSON objects keyed by column name and converted
+    from and to positional rows using the table schema.
+    
+    Several processes may share the database directory: each table has a
+    lock file in locks/ whose advisory lock is held by statements (see
+    table_lock) and which counts the writes to the table. The count is part
+    of the table version, so other processes' caches see every write even
+    when file times and sizes do not change.
+    """
     
     def __init__(self, db_path: str = "./db_data"):
         self.db_path = Path(db_path)
         self.schemas_path = self.db_path / "schemas"
         self.tables_path = self.db_path / "tables"
+        self.indexes_path = self.db_path / "indexes"
+        self.stats_path = self.db_path / "stats"
+        self.locks_path = self.db_path / "locks"
+        self._columns: Dict[str, Tuple[Any, List[Tuple[str, str]]]] = {}  # table name -> (schema stamp, (name, type) per column)
     
     def initialize_database(self, db_path: str = None) -> None:
         """Initialize the database directory structure"""
@@ -19,16 +36,27 @@ class FileStorage(StorageInterface):
             self.db_path = Path(db_path)
             self.schemas_path = self.db_path / "schemas"
             self.tables_path = self.db_path / "tables"
+            self.indexes_path = self.db_path / "indexes"
+            self.stats_path = self.db_path / "stats"
+            self.locks_path = self.db_path / "locks"
         
         # Create directories if they don't exist
         self.schemas_path.mkdir(parents=True, exist_ok=True)
         self.tables_path.mkdir(parents=True, exist_ok=True)
+        self.indexes_path.mkdir(parents=True, exist_ok=True)
+        self.stats_path.mkdir(parents=True, exist_ok=True)
+        self.locks_path.mkdir(parents=True, exist_ok=True)
+    
+    def table_lock(self, table_name: str) -> TableLockFile:
+        """Get the advisory lock file of a table"""
+        return TableLockFile.for_path(self.locks_path / f"{table_name}.lock")
     
     def save_table_schema(self, table_name: str, schema: Dict[str, Any]) -> None:
-        """Save table schema to JSON file"""
+        """Save table schema to JSON file, forgetting the cached row layout"""
+        self._columns.pop(table_name, None)
         schema_file = self.schemas_path / f"{table_name}.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f, indent=2)
+        self._write_json_atomic(schema_file, schema, indent=2)
+        self._bump_generation(table_name)
     
     def load_table_schema(self, table_name: str) -> Dict[str, Any]:
         """Load table schema from JSON file"""
@@ -44,38 +72,109 @@ class FileStorage(StorageInterface):
         schema_file = self.schemas_path / f"{table_name}.json"
         return schema_file.exists()
     
-    def save_table_data(self, table_name: str, rows: List[Dict[str, Any]]) -> None:
+    def get_table_version(self, table_name: str) -> Any:
+        """Get a version stamp from the table generation and the modification time and size of its files"""
+        schema_file = self.schemas_path / f"{table_name}.json"
+        data_file = self._data_file(table_name)
+        
+        try:
+            schema_stat = schema_file.stat()
+        except FileNotFoundError:
+            return None
+        
+        try:
+            data_stat = data_file.stat()
+            data_version = (data_stat.st_mtime_ns, data_stat.st_size)
+        except FileNotFoundError:
+            data_version = None
+        
+        generation = self.table_lock(table_name).generation()
+        return (schema_stat.st_mtime_ns, schema_stat.st_size, data_version, generation)
+    
+    def save_table_data(self, table_name: str, rows: List[Row]) -> None:
         """Save table data to JSON file"""
         if not self.table_exists(table_name):
             raise TableNotFoundException(f"Table '{table_name}' does not exist")
         
-        data_file = self.tables_path / f"{table_name}.json"
-        with open(data_file, 'w') as f:
-            json.dump(rows, f, indent=2)
+        data_file = self._data_file(table_name)
+        self._write_json_atomic(data_file, self._to_records(table_name, rows), indent=2)
+        self._bump_generation(table_name)
     
-    def load_table_data(self, table_name: str) -> List[Dict[str, Any]]:
+    def load_table_data(self, table_name: str) -> List[Row]:
         """Load table data from JSON file"""
         if not self.table_exists(table_name):
             raise TableNotFoundException(f"Table '{table_name}' does not exist")
         
-        data_file = self.tables_path / f"{table_name}.json"
+        data_file = self._data_file(table_name)
         if not data_file.exists():
             return []  # Return empty list if data file doesn't exist yet
         
         with open(data_file, 'r') as f:
-            return json.load(f)
+            return self._from_records(table_name, json.load(f))
+    
+    def save_table_indexes(self, table_name: str, indexes: Dict[str, Any]) -> None:
+        """Save table index data to JSON file"""
+        if not self.table_exists(table_name):
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        
+        self.indexes_path.mkdir(parents=True, exist_ok=True)
+        index_file = self.indexes_path / f"{table_name}.json"
+        self._write_json_atomic(index_file, indexes, sync=False)  # Indexes can be rebuilt
+    
+    def load_table_indexes(self, table_name: str) -> Dict[str, Any]:
+        """Load table index data from JSON file"""
+        index_file = self.indexes_path / f"{table_name}.json"
+        if not index_file.exists():
+            return {}  # Indexes are rebuilt from the rows when missing
+        
+        try:
+            with open(index_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}  # Treat unreadable index files as missing
+    
+    def save_table_stats(self, table_name: str, stats: Dict[str, Any]) -> None:
+        """Save table statistics to a JSON file next to the schema"""
+        if not self.table_exists(table_name):
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        
+        self.stats_path.mkdir(parents=True, exist_ok=True)
+        stats_file = self.stats_path / f"{table_name}.json"
+        self._write_json_atomic(stats_file, stats, sync=False)  # Stale statistics are detected and recomputed
+    
+    def load_table_stats(self, table_name: str) -> Dict[str, Any]:
+        """Load table statistics from JSON file"""
+        stats_file = self.stats_path / f"{table_name}.json"
+        if not stats_file.exists():
+            return {}
+        
+        try:
+            with open(stats_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}  # Treat unreadable statistics as missing
     
     def delete_table(self, table_name: str) -> None:
         """Delete table schema and data files"""
         if not self.table_exists(table_name):
             raise TableNotFoundException(f"Table '{table_name}' does not exist")
         
+        self._columns.pop(table_name, None)
         schema_file = self.schemas_path / f"{table_name}.json"
-        data_file = self.tables_path / f"{table_name}.json"
+        data_file = self._data_file(table_name)
+        index_file = self.indexes_path / f"{table_name}.json"
+        stats_file = self.stats_path / f"{table_name}.json"
         
         schema_file.unlink()  # Delete schema file
         if data_file.exists():
             data_file.unlink()  # Delete data file if exists
+        if index_file.exists():
+            index_file.unlink()  # Delete index file if exists
+        if stats_file.exists():
+            stats_file.unlink()  # Delete statistics file if exists
+        
+        # The lock file stays, so a table created again under the name keeps counting up
+        self._bump_generation(table_name)
     
     def list_tables(self) -> List[str]:
         """List all tables in the database"""
@@ -86,4 +185,52 @@ class FileStorage(StorageInterface):
         for schema_file in self.schemas_path.glob("*.json"):
             tables.append(schema_file.stem)  # Get filename without extension
         
-        return sorted(tables)
\ No newline at end of file
+        return sorted(tables)
+    
+    def _data_file(self, table_name: str) -> Path:
+        """Get the data file path for a table"""
+        return self.tables_path / f"{table_name}.json"
+    
+    def _bump_generation(self, table_name: str) -> None:
+        """Count a write to the table's files"""
+        self.table_lock(table_name).bump()
+    
+    def _table_columns(self, table_name: str) -> List[Tuple[str, str]]:
+        """Get the (name, type) row layout from the table schema, reread when another process changed it"""
+        schema_file = self.schemas_path / f"{table_name}.json"
+        try:
+            schema_stat = schema_file.stat()
+            stamp = (schema_stat.st_mtime_ns, schema_stat.st_size, schema_stat.st_ino)
+        except FileNotFoundError:
+            stamp = None
+        
+        cached = self._columns.get(table_name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        
+        schema = self.load_table_schema(table_name)
+        columns = [(col['name'], col['type']) for col in schema['columns']]
+        self._columns[table_name] = (stamp, columns)
+        return columns
+    
+    def _to_records(self, table_name: str, rows: Iterable[Row]) -> List[Dict[str, Any]]:
+        """Convert rows to the JSON objects stored on disk"""
+        names = [name for name, _ in self._table_columns(table_name)]
+        return [dict(zip(names, row)) for row in rows]
+    
+    def _from_records(self, table_name: str, records: Iterable[Dict[str, Any]]) -> List[Row]:
+        """Convert stored JSON objects to rows, columns missing from an object being NULL"""
+        names = [name for name, _ in self._table_columns(table_name)]
+        return [tuple([record.get(name) for name in names]) for record in records]
+    
+    def _write_json_atomic(self, path: Path, data: Any, indent: int = None, sync: bool = True) -> None:
+        """Write JSON to a temporary file and rename it over the target, so a crash never leaves a torn file"""
+        # Named per thread, so concurrent writers of the same file never share a temporary
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w') as f:
+            # json.dumps uses the C encoder for compact output, json.dump never does
+            f.write(json.dumps(data, indent=indent))
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
\ No newline at end of file
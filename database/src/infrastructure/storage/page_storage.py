@@ -0,0 +1,615 @@
+import os
+import struct
+import threading
+import zlib
+from bisect import bisect_right
+from collections.abc import MutableSequence
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+from pathlib import Path
+from .file_storage import FileStorage
+from .buffer_pool import BufferPool
+from ...domain.models.table import Row
+from ...domain.exceptions import DatabaseException, InvalidDataTypeException, TableNotFoundException
+
+INTEGER_VALUE = struct.Struct('<q')
+FLOAT_VALUE = struct.Struct('<d')
+BOOLEAN_VALUE = struct.Struct('<?')
+STRING_LENGTH = struct.Struct('<H')
+
+class PagedRows(MutableSequence):
+    """Row list backed by the pages of a PageStorage table
+    
+    Reads go through the buffer pool and changes are written straight to the
+    table's pages, so the table is never held in memory as a whole.
+    """
+    
+    def __init__(self, storage: 'PageStorage', table_name: str):
+        self.storage = storage
+        self.table_name = table_name
+    
+    def __len__(self) -> int:
+        return self.storage._row_count(self.table_name)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.storage._read_row(self.table_name, self._position(index))
+    
+    def __setitem__(self, index: int, row: Row) -> None:
+        self.storage._replace_rows(self.table_name, {self._position(index): row})
+    
+    def __delitem__(self, index: int) -> None:
+        self.storage._remove_rows(self.table_name, [self._position(index)])
+    
+    def remove_positions(self, positions: Iterable[int]) -> None:
+        """Remove the rows at several positions with one write per touched page"""
+        self.storage._remove_rows(self.table_name, [self._position(position) for position in positions])
+    
+    def __iter__(self) -> Iterator[Row]:
+        return self.storage._scan(self.table_name)
+    
+    def insert(self, index: int, row: Row) -> None:
+        """Insert a row; paged tables only support inserting at the end"""
+        if index != len(self):
+            raise DatabaseException("Paged tables only support appending rows")
+        self.storage._append_rows(self.table_name, [row])
+    
+    def extend(self, rows: Iterable[Row]) -> None:
+        """Append several rows with one write per touched page"""
+        self.storage._append_rows(self.table_name, list(rows))
+    
+    def _position(self, index: int) -> int:
+        """Normalize a (possibly negative) index to a row position"""
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("row position out of range")
+        return index
+
+class PageStorage(FileStorage):
+    """Binary page-based storage with a buffer pool
+    
+    Table data lives in tables/<table>.db as fixed-size pages. Page 0 is the
+    file header and every other page holds length-prefixed rows encoded
+    positionally from the table schema. load_table_data returns a PagedRows
+    view that reads pages through an LRU buffer pool, so tables larger than
+    memory can be scanned and point-read. Schemas and indexes stay JSON.
+    Commits are not deferred, and readers lock the tables they read rather
+    than hold snapshots.
+    
+    commit_changes() logs the new images of every page it touches to
+    tables/<table>.journal before writing them to the data file, so a
+    crash leaves all or none of a commit: loading the table applies a
+    complete journal left behind and drops a torn one. Changes made
+    directly to a PagedRows view are written as they are made instead.
+    """
+    
+    GROUP_COMMIT = False
+    COMMIT_NEEDS_ALL_ROWS = False
+    SNAPSHOT_READS = False
+    PAGE_SIZE = 8192
+    MAGIC = b'PGDB'
+    FORMAT_VERSION = 1
+    FILE_HEADER = struct.Struct('<4sHII')  # magic, format version, row count, page count
+    PAGE_HEADER = struct.Struct('<HHI')  # record count, payload bytes, payload crc32
+    RECORD_LENGTH = struct.Struct('<H')
+    PAGE_CAPACITY = PAGE_SIZE - PAGE_HEADER.size
+    JOURNAL_MAGIC = b'PGJN'
+    JOURNAL_WRITE = struct.Struct('<QI')  # file offset, byte count; the bytes follow
+    JOURNAL_TRAILER = struct.Struct('<4sII')  # magic, crc32 and length of the writes before it
+    
+    def __init__(self, db_path: str = "./db_data",
+                 pool_pages: int = BufferPool.DEFAULT_CAPACITY_PAGES, sync: bool = False):
+        super().__init__(db_path)
+        self.buffer_pool = BufferPool(pool_pages)
+        self.sync = sync
+        self._files = {}  # table name -> open data file
+        self._page_counts: Dict[str, List[int]] = {}  # table name -> row count of each page
+        self._page_starts: Dict[str, List[int]] = {}  # table name -> first row position of each page
+        self._row_totals: Dict[str, int] = {}
+        self._journals: Dict[str, Dict[int, bytes]] = {}  # table name -> file offset -> bytes a commit will write there
+        self._read_mutex = threading.RLock()  # readers of one table share its file position, and reloads close it
+    
+    def save_table_data(self, table_name: str, rows: Iterable[Row]) -> None:
+        """Rewrite the whole data file"""
+        if not self.table_exists(table_name):
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        
+        self._rewrite(table_name, rows)
+    
+    def load_table_data(self, table_name: str) -> PagedRows:
+        """Open the table's pages and return a row view over them"""
+        if not self.table_exists(table_name):
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        
+        # Called when the table changed on disk, so drop cached pages
+        self._close(table_name)
+        self._recover(table_name)
+        
+        if not self._data_file(table_name).exists():
+            if (self.tables_path / f"{table_name}.json").exists():
+                raise DatabaseException(
+                    f"Table '{table_name}' is stored as JSON; migrate the database to the page engine first"
+                )
+            self._rewrite(table_name, [])
+        
+        return PagedRows(self, table_name)
+    
+    def append_rows(self, table_name: str, rows: List[Row], all_rows) -> bool:
+        """Write appended rows to the last pages"""
+        if not self._is_view(table_name, all_rows):
+            self._append_rows(table_name, rows)
+        return False
+    
+    def replace_rows(self, table_name: str, changes: Dict[int, Row], all_rows) -> bool:
+        """Rewrite the pages holding the replaced rows"""
+        if not self._is_view(table_name, all_rows):
+            self._replace_rows(table_name, changes)
+        return False
+    
+    def remove_rows(self, table_name: str, positions: List[int], all_rows) -> bool:
+        """Rewrite the pages the removed rows were on"""
+        if not self._is_view(table_name, all_rows):
+            self._remove_rows(table_name, positions)
+        return False
+    
+    def commit_changes(self, table_name: str, changes: List[Tuple[str, Any]], all_rows) -> bool:
+        """Write the pages touched by the changes through the journal, so a crash leaves all or none of them
+        
+        The pages are built in memory, then logged, then written. If a
+        replaced row outgrows its page, the table is repacked with all the
+        changes and swapped in atomically instead.
+        """
+        self._journals[table_name] = {}
+        try:
+            for kind, payload in changes:
+                if kind == 'insert':
+                    self._append_rows(table_name, payload)
+                elif kind == 'update':
+                    pages = self._replaced_pages(table_name, payload)
+                    if pages is None:
+                        break
+                    for page_no, page_rows in pages.items():
+                        self._write_page(table_name, page_no, page_rows)
+                else:
+                    self._remove_rows(table_name, payload)
+            else:
+                self._write_journal(table_name, self._journals.pop(table_name))
+                return False
+        except BaseException:
+            # Forget the pages and directory of the unwritten changes
+            self._journals.pop(table_name, None)
+            self._close(table_name)
+            raise
+        
+        self._journals.pop(table_name)
+        self._close(table_name)
+        rows = list(self._scan(table_name))
+        for kind, payload in changes:
+            if kind == 'insert':
+                rows.extend(payload)
+            elif kind == 'update':
+                for position, row in payload.items():
+                    rows[position] = row
+            else:
+                removed = set(payload)
+                rows = [row for i, row in enumerate(rows) if i not in removed]
+        self._rewrite(table_name, rows)
+        return False
+    
+    def count_rows(self, table_name: str) -> Optional[int]:
+        """Get the number of rows in a table from its file header, which another process may have written"""
+        if not self.table_exists(table_name):
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        if self._journal_file(table_name).exists():
+            return None  # A crashed commit may have left the header behind its pages
+        
+        try:
+            with open(self._data_file(table_name), 'rb') as f:
+                magic, _, row_count, _ = self.FILE_HEADER.unpack(f.read(self.FILE_HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return None
+        return row_count if magic == self.MAGIC else None
+    
+    def delete_table(self, table_name: str) -> None:
+        """Close and delete table files"""
+        self._close(table_name)
+        super().delete_table(table_name)
+        self._journal_file(table_name).unlink(missing_ok=True)
+    
+    def _data_file(self, table_name: str) -> Path:
+        """Get the page file path for a table"""
+        return self.tables_path / f"{table_name}.db"
+    
+    def _journal_file(self, table_name: str) -> Path:
+        """Get the journal file path for a table"""
+        return self.tables_path / f"{table_name}.journal"
+    
+    def _is_view(self, table_name: str, rows) -> bool:
+        """Check if rows is this table's PagedRows, whose changes are already written"""
+        return isinstance(rows, PagedRows) and rows.storage is self and rows.table_name == table_name
+    
+    # Page access
+    
+    def _row_count(self, table_name: str) -> int:
+        """Get the number of rows in a table"""
+        self._load_directory(table_name)
+        return self._row_totals[table_name]
+    
+    def _read_row(self, table_name: str, position: int) -> Row:
+        """Read a single row through the buffer pool"""
+        page_no, offset = self._locate(table_name, position)
+        return self._read_page(table_name, page_no)[offset]
+    
+    def _scan(self, table_name: str) -> Iterator[Row]:
+        """Yield rows page by page through the buffer pool"""
+        page_count = len(self._load_directory(table_name))
+        for page_no in range(1, page_count + 1):
+            yield from self._read_page(table_name, page_no)
+    
+    def _read_page(self, table_name: str, page_no: int) -> List[Row]:
+        """Get the decoded rows of a page, reading it from disk on a pool miss"""
+        rows = self.buffer_pool.get(table_name, page_no)
+        if rows is not None:
+            return rows
+        
+        # A page written by a commit in progress is only in its journal so far
+        page = self._journals.get(table_name, {}).get(page_no * self.PAGE_SIZE)
+        if page is None:
+            with self._read_mutex:
+                f = self._file(table_name)
+                f.seek(page_no * self.PAGE_SIZE)
+                page = f.read(self.PAGE_SIZE)
+        
+        count, size, checksum = self.PAGE_HEADER.unpack_from(page)
+        payload = page[self.PAGE_HEADER.size:self.PAGE_HEADER.size + size]
+        if zlib.crc32(payload) != checksum:
+            raise DatabaseException(f"Page {page_no} of table '{table_name}' is corrupt")
+        
+        columns = self._table_columns(table_name)
+        rows = []
+        offset = 0
+        for _ in range(count):
+            (length,) = self.RECORD_LENGTH.unpack_from(payload, offset)
+            offset += self.RECORD_LENGTH.size
+            rows.append(self._decode_row(columns, payload[offset:offset + length]))
+            offset += length
+        
+        self.buffer_pool.put(table_name, page_no, rows)
+        return rows
+    
+    def _locate(self, table_name: str, position: int) -> Tuple[int, int]:
+        """Map a row position to (page number, offset within page)"""
+        starts = self._page_starts.get(table_name)
+        if starts is None:
+            starts = []
+            total = 0
+            for count in self._load_directory(table_name):
+                starts.append(total)
+                total += count
+            self._page_starts[table_name] = starts
+        
+        # bisect_right skips empty pages that share a start position
+        page_index = bisect_right(starts, position) - 1
+        return page_index + 1, position - starts[page_index]
+    
+    def _load_directory(self, table_name: str) -> List[int]:
+        """Get the row count of each page, reading only page headers"""
+        counts = self._page_counts.get(table_name)
+        if counts is not None:
+            return counts
+        
+        with self._read_mutex:
+            f = self._file(table_name)
+            f.seek(0)
+            magic, _, row_count, page_count = self.FILE_HEADER.unpack(f.read(self.FILE_HEADER.size))
+            if magic != self.MAGIC:
+                raise DatabaseException(f"Data file of table '{table_name}' is not a page file")
+            
+            counts = []
+            for page_no in range(1, page_count + 1):
+                f.seek(page_no * self.PAGE_SIZE)
+                counts.append(self.PAGE_HEADER.unpack(f.read(self.PAGE_HEADER.size))[0])
+            
+            self._row_totals[table_name] = row_count
+            self._page_starts.pop(table_name, None)
+            self._page_counts[table_name] = counts
+        return counts
+    
+    # Page writes
+    
+    def _append_rows(self, table_name: str, rows: List[Row]) -> None:
+        """Append rows to the last page, starting new pages when it is full"""
+        if not rows:
+            return
+        
+        counts = self._load_directory(table_name)
+        records = [self._encode_row(table_name, row) for row in rows]
+        
+        page_no = len(counts)
+        if page_no:
+            page_rows = list(self._read_page(table_name, page_no))
+            used = self._payload_size(self._encode_row(table_name, row) for row in page_rows)
+        else:
+            page_rows, used = [], self.PAGE_CAPACITY  # Forces a first page
+        changed = False
+        
+        for row, record in zip(rows, records):
+            size = self.RECORD_LENGTH.size + len(record)
+            if used + size > self.PAGE_CAPACITY:
+                if changed:
+                    self._write_page(table_name, page_no, page_rows)
+                page_no, page_rows, used = len(counts) + 1, [], 0
+                counts.append(0)
+            page_rows.append(row)
+            used += size
+            changed = True
+        
+        self._write_page(table_name, page_no, page_rows)
+        self._row_totals[table_name] += len(rows)
+        self._write_header(table_name)
+    
+    def _replace_rows(self, table_name: str, changes: Dict[int, Row]) -> None:
+        """Rewrite the pages holding replaced rows, or the whole file if a page overflows"""
+        pages = self._replaced_pages(table_name, changes)
+        if pages is None:
+            # Grown rows no longer fit their page, so repack the whole table
+            rows = [changes.get(i, row) for i, row in enumerate(self._scan(table_name))]
+            self._rewrite(table_name, rows)
+            return
+        
+        for page_no, page_rows in pages.items():
+            self._write_page(table_name, page_no, page_rows)
+        self._flush(table_name)
+    
+    def _replaced_pages(self, table_name: str, changes: Dict[int, Row]) -> Optional[Dict[int, List[Row]]]:
+        """Get the rows of the pages holding replaced rows after replacing them, or None if one overflows"""
+        pages = {}
+        for position, row in changes.items():
+            page_no, offset = self._locate(table_name, position)
+            if page_no not in pages:
+                pages[page_no] = list(self._read_page(table_name, page_no))
+            pages[page_no][offset] = row
+        
+        for page_rows in pages.values():
+            if self._payload_size(self._encode_row(table_name, row) for row in page_rows) > self.PAGE_CAPACITY:
+                return None
+        return pages
+    
+    def _remove_rows(self, table_name: str, positions: List[int]) -> None:
+        """Rewrite the pages the removed rows were on; emptied pages are kept until a rewrite"""
+        pages = {}
+        for position in positions:
+            page_no, offset = self._locate(table_name, position)
+            pages.setdefault(page_no, set()).add(offset)
+        
+        for page_no, offsets in pages.items():
+            page_rows = self._read_page(table_name, page_no)
+            self._write_page(table_name, page_no, [row for i, row in enumerate(page_rows) if i not in offsets])
+        
+        self._row_totals[table_name] -= len(positions)
+        self._write_header(table_name)
+    
+    def _write_page(self, table_name: str, page_no: int, rows: List[Row]) -> None:
+        """Encode and write a page, or add it to the journal of a commit, keeping the pool and directory in sync"""
+        records = [self._encode_row(table_name, row) for row in rows]
+        self._write_at(table_name, page_no * self.PAGE_SIZE, self._encode_page(records))
+        
+        self._page_counts[table_name][page_no - 1] = len(rows)
+        self._page_starts.pop(table_name, None)
+        self.buffer_pool.put(table_name, page_no, rows)
+    
+    def _write_header(self, table_name: str) -> None:
+        """Write the file header and flush the file"""
+        self._write_at(table_name, 0, self.FILE_HEADER.pack(
+            self.MAGIC, self.FORMAT_VERSION,
+            self._row_totals[table_name], len(self._page_counts[table_name])
+        ))
+        self._flush(table_name)
+    
+    def _write_at(self, table_name: str, offset: int, data: bytes) -> None:
+        """Write bytes at a file offset, or add them to the journal of a commit in progress"""
+        journal = self._journals.get(table_name)
+        if journal is not None:
+            journal[offset] = data
+            return
+        f = self._file(table_name)
+        f.seek(offset)
+        f.write(data)
+    
+    def _write_journal(self, table_name: str, writes: Dict[int, bytes]) -> None:
+        """Log a commit's writes to the journal, then apply them to the data file and drop the journal
+        
+        Both files are synced when sync is set. A crash before the journal
+        is complete leaves the data file untouched; one after leaves the
+        journal to be applied again on load.
+        """
+        body = b''.join(self.JOURNAL_WRITE.pack(offset, len(data)) + data for offset, data in sorted(writes.items()))
+        journal_file = self._journal_file(table_name)
+        with open(journal_file, 'wb') as f:
+            f.write(body + self.JOURNAL_TRAILER.pack(self.JOURNAL_MAGIC, zlib.crc32(body), len(body)))
+            if self.sync:
+                f.flush()
+                os.fsync(f.fileno())
+        
+        for offset, data in writes.items():
+            self._write_at(table_name, offset, data)
+        self._flush(table_name)
+        journal_file.unlink(missing_ok=True)
+    
+    def _recover(self, table_name: str) -> None:
+        """Apply the journal of a commit interrupted by a crash, or drop it if it was not completely logged"""
+        journal_file = self._journal_file(table_name)
+        try:
+            journal = journal_file.read_bytes()
+        except FileNotFoundError:
+            return
+        
+        writes = self._parse_journal(journal)
+        if writes:
+            with open(self._data_file(table_name), 'r+b') as f:
+                for offset, data in writes:
+                    f.seek(offset)
+                    f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._bump_generation(table_name)
+        journal_file.unlink(missing_ok=True)
+    
+    def _parse_journal(self, journal: bytes) -> List[Tuple[int, bytes]]:
+        """Get the (offset, bytes) writes of a journal, or none if it is torn or corrupt"""
+        if len(journal) < self.JOURNAL_TRAILER.size:
+            return []
+        magic, checksum, length = self.JOURNAL_TRAILER.unpack_from(journal, len(journal) - self.JOURNAL_TRAILER.size)
+        body = journal[:-self.JOURNAL_TRAILER.size]
+        if magic != self.JOURNAL_MAGIC or length != len(body) or zlib.crc32(body) != checksum:
+            return []
+        
+        writes = []
+        offset = 0
+        while offset < len(body):
+            file_offset, size = self.JOURNAL_WRITE.unpack_from(body, offset)
+            offset += self.JOURNAL_WRITE.size
+            writes.append((file_offset, body[offset:offset + size]))
+            offset += size
+        return writes
+    
+    def _rewrite(self, table_name: str, rows: Iterable[Row]) -> None:
+        """Write a fresh, densely packed data file and swap it in atomically"""
+        # The new file holds every row, so an unapplied journal of the old one must not touch it
+        self._journal_file(table_name).unlink(missing_ok=True)
+        
+        data_file = self._data_file(table_name)
+        tmp_file = data_file.with_name(data_file.name + '.tmp')
+        
+        row_count = 0
+        page_count = 0
+        with open(tmp_file, 'wb') as f:
+            f.write(bytes(self.PAGE_SIZE))  # Header page, filled in below
+            
+            records, used = [], 0
+            for row in rows:
+                record = self._encode_row(table_name, row)
+                size = self.RECORD_LENGTH.size + len(record)
+                if records and used + size > self.PAGE_CAPACITY:
+                    f.write(self._encode_page(records))
+                    page_count += 1
+                    records, used = [], 0
+                records.append(record)
+                used += size
+                row_count += 1
+            
+            if records:
+                f.write(self._encode_page(records))
+                page_count += 1
+            
+            f.seek(0)
+            f.write(self.FILE_HEADER.pack(self.MAGIC, self.FORMAT_VERSION, row_count, page_count))
+            if self.sync:
+                f.flush()
+                os.fsync(f.fileno())
+        
+        self._close(table_name)
+        os.replace(tmp_file, data_file)
+        self._bump_generation(table_name)
+    
+    def _encode_page(self, records: List[bytes]) -> bytes:
+        """Build a page from encoded rows"""
+        payload = b''.join(self.RECORD_LENGTH.pack(len(record)) + record for record in records)
+        header = self.PAGE_HEADER.pack(len(records), len(payload), zlib.crc32(payload))
+        return (header + payload).ljust(self.PAGE_SIZE, b'\0')
+    
+    def _payload_size(self, records: Iterable[bytes]) -> int:
+        """Get the page payload size taken by encoded rows"""
+        return sum(self.RECORD_LENGTH.size + len(record) for record in records)
+    
+    # Row encoding
+    
+    def _encode_row(self, table_name: str, row: Row) -> bytes:
+        """Encode a row as a NULL bitmap followed by its non-NULL values in column order"""
+        columns = self._table_columns(table_name)
+        null_bits = 0
+        parts = []
+        
+        for i, ((name, data_type), value) in enumerate(zip(columns, row)):
+            if value is None:
+                null_bits |= 1 << i
+                continue
+            
+            try:
+                if data_type == 'INTEGER':
+                    parts.append(INTEGER_VALUE.pack(value))
+                elif data_type == 'FLOAT':
+                    parts.append(FLOAT_VALUE.pack(value))
+                elif data_type == 'BOOLEAN':
+                    parts.append(BOOLEAN_VALUE.pack(value))
+                else:
+                    encoded = value.encode('utf-8')
+                    parts.append(STRING_LENGTH.pack(len(encoded)) + encoded)
+            except (struct.error, AttributeError) as e:
+                raise InvalidDataTypeException(f"Column '{name}' value cannot be stored: {e}")
+        
+        record = null_bits.to_bytes((len(columns) + 7) // 8, 'little') + b''.join(parts)
+        if self.RECORD_LENGTH.size + len(record) > self.PAGE_CAPACITY:
+            raise DatabaseException(f"Row is too large for a {self.PAGE_SIZE} byte page")
+        return record
+    
+    def _decode_row(self, columns: List[Tuple[str, str]], record: bytes) -> Row:
+        """Decode a row produced by _encode_row"""
+        bitmap_size = (len(columns) + 7) // 8
+        null_bits = int.from_bytes(record[:bitmap_size], 'little')
+        offset = bitmap_size
+        row = []
+        
+        for i, (_, data_type) in enumerate(columns):
+            if null_bits >> i & 1:
+                row.append(None)
+            elif data_type == 'INTEGER':
+                row.append(INTEGER_VALUE.unpack_from(record, offset)[0])
+                offset += INTEGER_VALUE.size
+            elif data_type == 'FLOAT':
+                row.append(FLOAT_VALUE.unpack_from(record, offset)[0])
+                offset += FLOAT_VALUE.size
+            elif data_type == 'BOOLEAN':
+                row.append(BOOLEAN_VALUE.unpack_from(record, offset)[0])
+                offset += BOOLEAN_VALUE.size
+            else:
+                (length,) = STRING_LENGTH.unpack_from(record, offset)
+                offset += STRING_LENGTH.size
+                row.append(record[offset:offset + length].decode('utf-8'))
+                offset += length
+        
+        return tuple(row)
+    
+    # File handles
+    
+    def _file(self, table_name: str):
+        """Get the open data file of a table"""
+        with self._read_mutex:
+            f = self._files.get(table_name)
+            if f is None:
+                f = open(self._data_file(table_name), 'r+b')
+                self._files[table_name] = f
+            return f
+    
+    def _flush(self, table_name: str) -> None:
+        """Flush written pages to the operating system (and disk if sync is set), completing a write"""
+        if table_name in self._journals:
+            return  # The commit writes its pages once they are journaled
+        f = self._file(table_name)
+        f.flush()
+        if self.sync:
+            os.fsync(f.fileno())
+        self._bump_generation(table_name)
+    
+    def _close(self, table_name: str) -> None:
+        """Close a table's data file and forget its cached pages and directory"""
+        with self._read_mutex:
+            f = self._files.pop(table_name, None)
+            if f is not None:
+                f.close()
+            self.buffer_pool.discard_table(table_name)
+            self._page_counts.pop(table_name, None)
+            self._page_starts.pop(table_name, None)
+            self._row_totals.pop(table_name, None)
\ No newline at end of file
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+from typing import Optional
+from .storage_interface import StorageInterface
+from .file_storage import FileStorage
+from .wal_storage import WALStorage
+from .page_storage import PageStorage
+from ...domain.exceptions import DatabaseException
+
+STORAGE_ENGINES = {
+    'json': FileStorage,
+    'wal': WALStorage,
+    'page': PageStorage,
+}
+
+DEFAULT_ENGINE = 'json'
+ENGINE_FILE = 'engine.json'
+
+def open_storage(db_path: str, engine: Optional[str] = None, **options) -> StorageInterface:
+    """Create and initialize the storage for a database directory
+    
+    The engine used is recorded in the database directory. When engine is
+    None the recorded engine is used, so every client of a database agrees
+    on its on-disk format.
+    """
+    recorded = read_engine(db_path)
+    if engine is None:
+        engine = recorded or DEFAULT_ENGINE
+    
+    if engine not in STORAGE_ENGINES:
+        raise DatabaseException(
+            f"Unknown storage engine '{engine}', expected one of: {', '.join(STORAGE_ENGINES)}"
+        )
+    
+    # A WAL database is a JSON database plus logs, so JSON databases can be opened as WAL
+    if recorded is not None and recorded != engine and not (recorded == 'json' and engine == 'wal'):
+        raise DatabaseException(
+            f"Database at '{db_path}' uses the '{recorded}' storage engine; "
+            f"migrate it to '{engine}' first"
+        )
+    
+    storage = STORAGE_ENGINES[engine](db_path, **options)
+    storage.initialize_database()
+    
+    if recorded != engine:
+        write_engine(db_path, engine)
+    
+    return storage
+
+def read_engine(db_path: str) -> Optional[str]:
+    """Get the engine recorded for a database, or None for a new database"""
+    engine_file = Path(db_path) / ENGINE_FILE
+    if engine_file.exists():
+        with open(engine_file, 'r') as f:
+            return json.load(f)['engine']
+    
+    # Databases created before engines were recorded are JSON databases
+    if any((Path(db_path) / "schemas").glob("*.json")):
+        return 'json'
+    return None
+
+def write_engine(db_path: str, engine: str) -> None:
+    """Record the engine used by a database"""
+    Path(db_path).mkdir(parents=True, exist_ok=True)
+    with open(Path(db_path) / ENGINE_FILE, 'w') as f:
+        json.dump({'engine': engine}, f)
+
+def migrate_database(source_path: str, target_path: str, engine: str) -> int:
+    """Copy every table of a database into a new database using another engine
+    
+    Returns the number of tables migrated. The source database is left untouched.
+    """
+    if Path(target_path).resolve() == Path(source_path).resolve():
+        raise DatabaseException("Migration target must be a different directory")
+    if read_engine(source_path) is None:
+        raise DatabaseException(f"No database found at '{source_path}'")
+    if read_engine(target_path) is not None:
+        raise DatabaseException(f"Migration target '{target_path}' already contains a database")
+    
+    source = open_storage(source_path)
+    target = open_storage(target_path, engine)
+    
+    tables = source.list_tables()
+    for table_name in tables:
+        target.save_table_schema(table_name, source.load_table_schema(table_name))
+        target.save_table_data(table_name, list(source.load_table_data(table_name)))
+    
+    return len(tables)
\ No newline at end of file
@@ -1,8 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from ...domain.models.table import Row
 
 class StorageInterface(ABC):
-    """Abstract interface for storage implementations"""
+    """Abstract interface for storage implementations
+    
+    Table data is exchanged as Row tuples holding one value per column in
+    the order of the table schema; how rows are laid out on disk is up to
+    each implementation.
+    """
+    
+    # Whether a transaction's changes may be flushed after its locks are released, batched with other commits
+    GROUP_COMMIT = True
+    # Whether commit_changes() needs all_rows, or only the changes
+    COMMIT_NEEDS_ALL_ROWS = True
+    # Whether loaded rows live in memory, so readers may hold cached tables as snapshots instead of locking them
+    SNAPSHOT_READS = True
     
     @abstractmethod
     def initialize_database(self, db_path: str) -> None:
@@ -25,15 +38,86 @@ class StorageInterface(ABC):
         pass
     
     @abstractmethod
-    def save_table_data(self, table_name: str, rows: List[Dict[str, Any]]) -> None:
+    def get_table_version(self, table_name: str) -> Any:
+        """Get a version stamp that changes whenever the table is written, or None if missing"""
+        pass
+    
+    def table_lock(self, table_name: str) -> Any:
+        """Get the lock shared with other processes using the database for a table
+        
+        The lock has lock_shared(), lock_exclusive() and unlock() methods and
+        is taken by LockManager along with the table's in-process lock. The
+        default None means the storage is only used by one process.
+        """
+        return None
+    
+    @abstractmethod
+    def save_table_data(self, table_name: str, rows: List[Row]) -> None:
         """Save table data to storage"""
         pass
     
+    def append_rows(self, table_name: str, rows: List[Row], all_rows: List[Row]) -> bool:
+        """Persist rows appended to the end of a table
+        
+        all_rows is the full row list after the change. Returns True when the
+        whole table was rewritten, which is when derived data such as indexes
+        should be saved too. The default implementation rewrites the table.
+        """
+        self.save_table_data(table_name, all_rows)
+        return True
+    
+    def replace_rows(self, table_name: str, changes: Dict[int, Row], all_rows: List[Row]) -> bool:
+        """Persist rows replaced at the given positions (see append_rows)"""
+        self.save_table_data(table_name, all_rows)
+        return True
+    
+    def remove_rows(self, table_name: str, positions: List[int], all_rows: List[Row]) -> bool:
+        """Persist removal of the rows at the given positions before the change (see append_rows)"""
+        self.save_table_data(table_name, all_rows)
+        return True
+    
+    def commit_changes(self, table_name: str, changes: List[Tuple[str, Any]], all_rows: Optional[List[Row]]) -> bool:
+        """Persist the changes of one or more committed transactions to a table in a single durable write
+        
+        changes holds ('insert', rows), ('update', {position: row}) and
+        ('delete', positions) in the order they were made; a crash must
+        leave all or none of them in storage. all_rows is the full row list
+        after them, or None when COMMIT_NEEDS_ALL_ROWS is False. Returns
+        True when the whole table was rewritten (see append_rows). The
+        default implementation rewrites the table.
+        """
+        self.save_table_data(table_name, all_rows)
+        return True
+    
     @abstractmethod
-    def load_table_data(self, table_name: str) -> List[Dict[str, Any]]:
+    def load_table_data(self, table_name: str) -> List[Row]:
         """Load table data from storage"""
         pass
     
+    def count_rows(self, table_name: str) -> Optional[int]:
+        """Get the number of rows in a table without loading it, or None if the storage cannot tell"""
+        return None
+    
+    @abstractmethod
+    def save_table_indexes(self, table_name: str, indexes: Dict[str, Any]) -> None:
+        """Save table index data to storage"""
+        pass
+    
+    @abstractmethod
+    def load_table_indexes(self, table_name: str) -> Dict[str, Any]:
+        """Load table index data from storage"""
+        pass
+    
+    @abstractmethod
+    def save_table_stats(self, table_name: str, stats: Dict[str, Any]) -> None:
+        """Save table statistics to storage"""
+        pass
+    
+    @abstractmethod
+    def load_table_stats(self, table_name: str) -> Dict[str, Any]:
+        """Load table statistics from storage, or an empty dict if there are none"""
+        pass
+    
     @abstractmethod
     def delete_table(self, table_name: str) -> None:
         """Delete a table from storage"""
@@ -0,0 +1,104 @@
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # No advisory file locks (Windows); tables are then only locked within a process
+    fcntl = None
+
+GENERATION = struct.Struct('<Q')
+
+class TableLockFile:
+    """Advisory lock and generation counter of a table, shared by every process using the database
+    
+    The lock file holds the table's generation: a counter bumped by each
+    write to the table's files, so a process can tell that its cached copy
+    is stale by reading eight bytes. lock_shared() and lock_exclusive()
+    take a flock on the file; they are not reentrant and a process takes
+    them once for all its threads (see ReadWriteLock). One object per file
+    is shared by the process, see for_path().
+    """
+    
+    _shared: Dict[str, 'TableLockFile'] = {}  # resolved lock file path -> its lock
+    _shared_mutex = threading.Lock()
+    
+    POLL_SECONDS = 0.005  # retry interval of a lock wait with a timeout
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._mutex = threading.RLock()  # guards the descriptor's file position
+        self._fd = None
+        self._pid = None  # process that opened _fd
+    
+    @classmethod
+    def for_path(cls, path) -> 'TableLockFile':
+        """Get the lock of a lock file, shared by all storages of this process"""
+        key = os.path.realpath(path)
+        with cls._shared_mutex:
+            lock = cls._shared.get(key)
+            if lock is None:
+                lock = cls._shared[key] = cls(key)
+            return lock
+    
+    def lock_shared(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no other process writes the table, then hold the lock with other readers
+        
+        Returns False if the lock was not taken within timeout seconds.
+        """
+        return fcntl is None or self._flock(fcntl.LOCK_SH, timeout)
+    
+    def lock_exclusive(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no other process uses the table, then hold the lock alone (see lock_shared)"""
+        return fcntl is None or self._flock(fcntl.LOCK_EX, timeout)
+    
+    def unlock(self) -> None:
+        """Release a shared or exclusive hold"""
+        if fcntl is not None:
+            fcntl.flock(self._file(), fcntl.LOCK_UN)
+    
+    def generation(self) -> int:
+        """Get the number of writes to the table so far"""
+        with self._mutex:
+            fd = self._file()
+            os.lseek(fd, 0, os.SEEK_SET)
+            data = os.read(fd, GENERATION.size)
+        return GENERATION.unpack(data)[0] if len(data) == GENERATION.size else 0
+    
+    def bump(self) -> None:
+        """Count a write to the table; callers hold the exclusive lock"""
+        with self._mutex:
+            generation = self.generation()
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            os.write(self._fd, GENERATION.pack(generation + 1))
+    
+    def _flock(self, operation: int, timeout: Optional[float]) -> bool:
+        """Take a flock, polling without blocking when the wait is bounded"""
+        if timeout is None:
+            fcntl.flock(self._file(), operation)
+            return True
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(self._file(), operation | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(self.POLL_SECONDS)
+    
+    def _file(self) -> int:
+        """Get this process's open descriptor of the lock file, creating the file if needed
+        
+        A forked child reopens the file: a flock belongs to the open file, so
+        a descriptor inherited from the parent would share the parent's lock.
+        """
+        with self._mutex:
+            if self._pid != os.getpid():
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                self._pid = os.getpid()
+            return self._fd
\ No newline at end of file
@@ -0,0 +1,253 @@
+import json
+import os
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+from .file_storage import FileStorage
+from ...domain.models.table import Row
+from ...domain.exceptions import TableNotFoundException
+
+class WALStorage(FileStorage):
+    """JSON file storage with an append-only write-ahead log per table
+    
+    Each INSERT/UPDATE/DELETE appends one checksummed record to
+    tables/<table>.wal instead of rewriting tables/<table>.json; the
+    changes of committed transactions flushed together are logged as one
+    batch record. Loading a table reads the base file and replays the log.
+    Once the log grows past checkpoint_bytes the base file is rewritten
+    atomically and the log is cleared, so the base file stays readable by
+    FileStorage.
+    """
+    
+    COMMIT_NEEDS_ALL_ROWS = False
+    DEFAULT_CHECKPOINT_BYTES = 4 * 1024 * 1024
+    REPLAY_IN_PLACE_MAX_ROWS = 200  # most rows a replayed delete record removes one at a time
+    
+    def __init__(self, db_path: str = "./db_data",
+                 checkpoint_bytes: int = DEFAULT_CHECKPOINT_BYTES, sync: bool = True):
+        super().__init__(db_path)
+        self.checkpoint_bytes = checkpoint_bytes
+        self.sync = sync
+    
+    def get_table_version(self, table_name: str) -> Any:
+        """Get a version stamp that also changes when the log is appended to"""
+        version = super().get_table_version(table_name)
+        if version is None:
+            return None
+        
+        try:
+            log_stat = self._log_file(table_name).stat()
+            log_version = (log_stat.st_mtime_ns, log_stat.st_size)
+        except FileNotFoundError:
+            log_version = None
+        
+        return version + (log_version,)
+    
+    def save_table_data(self, table_name: str, rows: List[Row]) -> None:
+        """Save the full table as a checkpoint"""
+        if not self.table_exists(table_name):
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        
+        self._checkpoint(table_name, rows)
+    
+    def load_table_data(self, table_name: str) -> List[Row]:
+        """Load the base file and replay the log on top of it"""
+        if not self.table_exists(table_name):
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        
+        data_file = self._data_file(table_name)
+        if data_file.exists():
+            with open(data_file, 'rb') as f:
+                base = f.read()
+            rows = json.loads(base)
+            base_stamp = [zlib.crc32(base), len(base)]
+        else:
+            rows = []
+            base_stamp = None
+        
+        records = self._read_log(table_name)
+        
+        # Records before a completed checkpoint are already in the base file;
+        # the same base content can be checkpointed twice, so the last match counts
+        for i in range(len(records) - 1, -1, -1):
+            record = records[i]
+            if record['op'] == 'checkpoint' and record['base'] == base_stamp:
+                records = records[i + 1:]
+                break
+        
+        for record in records:
+            self._apply_record(rows, record)
+        
+        return self._from_records(table_name, rows)
+    
+    def append_rows(self, table_name: str, rows: List[Row], all_rows: List[Row]) -> bool:
+        """Log appended rows"""
+        return self._log(table_name, self._change_record(table_name, 'insert', rows), all_rows)
+    
+    def replace_rows(self, table_name: str, changes: Dict[int, Row], all_rows: List[Row]) -> bool:
+        """Log rows replaced at the given positions"""
+        return self._log(table_name, self._change_record(table_name, 'update', changes), all_rows)
+    
+    def remove_rows(self, table_name: str, positions: List[int], all_rows: List[Row]) -> bool:
+        """Log removal of the rows at the given positions"""
+        if not all_rows:
+            # Deleting every row is cheaper as a checkpoint of an empty table
+            self._checkpoint(table_name, all_rows)
+            return True
+        return self._log(table_name, self._change_record(table_name, 'delete', positions), all_rows)
+    
+    def commit_changes(self, table_name: str, changes: List[Tuple[str, Any]], all_rows: Optional[List[Row]]) -> bool:
+        """Log the changes as one record, so replaying the log applies all or none of them"""
+        records = [self._change_record(table_name, kind, payload) for kind, payload in changes]
+        record = records[0] if len(records) == 1 else {'op': 'batch', 'records': records}
+        return self._log(table_name, record, all_rows)
+    
+    def delete_table(self, table_name: str) -> None:
+        """Delete table files including the log"""
+        super().delete_table(table_name)
+        
+        log_file = self._log_file(table_name)
+        if log_file.exists():
+            log_file.unlink()
+    
+    def _log(self, table_name: str, record: Dict[str, Any], all_rows: Optional[List[Row]]) -> bool:
+        """Append a record to the log, checkpointing when the log is large
+        
+        Without all_rows the checkpoint reads the table back from storage.
+        """
+        if not self.table_exists(table_name):
+            raise TableNotFoundException(f"Table '{table_name}' does not exist")
+        
+        log_size = self._append_record(self._log_file(table_name), record)
+        self._bump_generation(table_name)
+        
+        if log_size >= self.checkpoint_bytes:
+            if all_rows is None:
+                all_rows = self.load_table_data(table_name)
+            self._checkpoint(table_name, all_rows)
+            return True
+        return False
+    
+    def _change_record(self, table_name: str, kind: str, payload: Any) -> Dict[str, Any]:
+        """Build the log record of an ('insert', rows), ('update', {position: row}) or ('delete', positions) change"""
+        if kind == 'insert':
+            return {'op': 'insert', 'rows': self._to_records(table_name, payload)}
+        if kind == 'update':
+            records = self._to_records(table_name, payload.values())
+            return {'op': 'update', 'rows': [[position, row] for position, row in zip(payload, records)]}
+        return {'op': 'delete', 'positions': list(payload)}
+    
+    def _checkpoint(self, table_name: str, rows: List[Row]) -> None:
+        """Rewrite the base file atomically and clear the log
+        
+        A checkpoint record naming the new base file is logged before the
+        rename, so a crash between the rename and clearing the log does not
+        replay records that are already in the base file.
+        """
+        data_file = self._data_file(table_name)
+        log_file = self._log_file(table_name)
+        
+        base = json.dumps(self._to_records(table_name, rows), indent=2).encode('utf-8')
+        tmp_file = data_file.with_name(data_file.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(base)
+            if self.sync:
+                f.flush()
+                os.fsync(f.fileno())
+        
+        if log_file.exists():
+            self._append_record(log_file, {'op': 'checkpoint', 'base': [zlib.crc32(base), len(base)]})
+        
+        os.replace(tmp_file, data_file)
+        if self.sync:
+            # Make the rename itself durable before the log is cleared
+            fd = os.open(data_file.parent, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        
+        if log_file.exists():
+            with open(log_file, 'r+b') as f:
+                f.truncate(0)
+                if self.sync:
+                    os.fsync(f.fileno())
+        
+        self._bump_generation(table_name)
+    
+    def _append_record(self, log_file: Path, record: Dict[str, Any]) -> int:
+        """Append a checksummed record line and return the new log size"""
+        payload = json.dumps(record, separators=(',', ':')).encode('utf-8')
+        line = b'%08x ' % zlib.crc32(payload) + payload + b'\n'
+        
+        with open(log_file, 'ab') as f:
+            f.write(line)
+            f.flush()
+            if self.sync:
+                os.fsync(f.fileno())
+            return f.tell()
+    
+    def _read_log(self, table_name: str) -> List[Dict[str, Any]]:
+        """Read intact log records, cutting off a torn or corrupt tail"""
+        log_file = self._log_file(table_name)
+        if not log_file.exists():
+            return []
+        
+        with open(log_file, 'rb') as f:
+            data = f.read()
+        
+        records, valid_length = self._parse_log(data)
+        
+        # Drop the damaged tail so later appends follow a valid record
+        if valid_length < len(data):
+            with open(log_file, 'r+b') as f:
+                f.truncate(valid_length)
+        
+        return records
+    
+    def _parse_log(self, data: bytes) -> Tuple[List[Dict[str, Any]], int]:
+        """Parse log records, returning them with the length of the valid prefix"""
+        records = []
+        offset = 0
+        
+        while offset < len(data):
+            end = data.find(b'\n', offset)
+            if end == -1:
+                break  # Torn final write
+            
+            line = data[offset:end]
+            try:
+                checksum, payload = int(line[:8], 16), line[9:]
+                if zlib.crc32(payload) != checksum:
+                    break
+                records.append(json.loads(payload))
+            except ValueError:
+                break
+            
+            offset = end + 1
+        
+        return records, offset
+    
+    def _apply_record(self, rows: List[Dict[str, Any]], record: Dict[str, Any]) -> None:
+        """Apply a log record to a list of stored row objects in place"""
+        if record['op'] == 'insert':
+            rows.extend(record['rows'])
+        elif record['op'] == 'update':
+            for position, row in record['rows']:
+                rows[position] = row
+        elif record['op'] == 'delete':
+            # Few deleted rows are removed in place rather than copying the table for each record
+            positions = record['positions']
+            if len(positions) > self.REPLAY_IN_PLACE_MAX_ROWS:
+                deleted = set(positions)
+                rows[:] = [row for i, row in enumerate(rows) if i not in deleted]
+            else:
+                for position in sorted(positions, reverse=True):
+                    del rows[position]
+        elif record['op'] == 'batch':
+            for inner in record['records']:
+                self._apply_record(rows, inner)
+    
+    def _log_file(self, table_name: str) -> Path:
+        """Get the log file path for a table"""
+        return self.tables_path / f"{table_name}.wal"
\ No newline at end of file
@@ -0,0 +1,28 @@
+import argparse
+import sys
+from ...infrastructure.storage.storage_factory import STORAGE_ENGINES, migrate_database, read_engine
+from ...domain.exceptions import DatabaseException
+
+def main():
+    """Main entry point for migrating a database to another storage engine"""
+    parser = argparse.ArgumentParser(
+        description="Copy a database into a new directory using another storage engine"
+    )
+    parser.add_argument('source', help="Existing database directory")
+    parser.add_argument('target', help="New database directory to create")
+    parser.add_argument('--engine', choices=sorted(STORAGE_ENGINES), default='page',
+                        help="Storage engine of the new database (default: page)")
+    args = parser.parse_args()
+    
+    try:
+        source_engine = read_engine(args.source) or 'json'
+        count = migrate_database(args.source, args.target, args.engine)
+    except DatabaseException as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    print(f"Migrated {count} table(s) from '{args.source}' ({source_engine}) "
+          f"to '{args.target}' ({args.engine})")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,234 @@
+import threading
+from collections import deque
+from typing import Dict, Any, Deque, Iterator, List, Optional, Tuple
+from ...application.executors.cursor import Cursor
+from ...domain import exceptions
+from ...domain.exceptions import ConnectionException, DatabaseException
+from .protocol import connect, encode_message, receive_message
+
+class RemoteRows:
+    """Iterator over the rows of a result as their batches arrive from the server"""
+    
+    def __init__(self, connection: 'Connection', request_id: int):
+        self.connection = connection
+        self.request_id = request_id
+        self._batch: Iterator[Dict[str, Any]] = iter(())
+        self._done = False
+    
+    def __iter__(self) -> 'RemoteRows':
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        while True:
+            row = next(self._batch, None)
+            if row is not None:
+                return row
+            if self._done:
+                raise StopIteration
+            
+            message = self.connection._take(self.request_id)
+            if message['type'] == 'rows':
+                columns = message['columns']
+                self._batch = (dict(zip(columns, values)) for values in message['rows'])
+            else:
+                self._done = True
+                self.connection._finish(self.request_id)
+                if message['type'] == 'error':
+                    raise self.connection._error(message)
+    
+    def close(self) -> None:
+        """Stop producing rows; batches still on their way are dropped as they arrive"""
+        if not self._done:
+            self._done = True
+            self._batch = iter(())
+            self.connection._finish(self.request_id)
+
+class Connection:
+    """A connection to a database server (see DatabaseServer), which is one session on it
+    
+    Offers the methods of QueryExecutor that clients use, so it can stand
+    in for an embedded engine. Statements run on the server in the order
+    they are sent: execute() waits for its reply, while pipeline() sends
+    many statements before reading any reply. Rows arrive in batches;
+    a streamed result or cursor reads them as they are fetched, and
+    replies to later requests are read past them and kept until taken.
+    Not thread-safe; see Client.
+    """
+    
+    def __init__(self, address: str, timeout: Optional[float] = None):
+        self.address = address
+        self._socket = connect(address, timeout)
+        self._stream = self._socket.makefile('rb')
+        self._next_id = 1
+        self._replies: Dict[int, Deque[Dict[str, Any]]] = {}  # request id -> its messages read but not taken
+        self.broken = False  # Set once the connection is lost; it cannot be used again
+    
+    def prepare(self, sql: str) -> str:
+        """Check a statement on the server, which caches it parsed for repeated execution, and return it"""
+        self._reply(self._send({'op': 'prepare', 'sql': sql}), False)
+        return sql
+    
+    def execute(self, sql, params=None, stream: bool = False, session=None) -> Dict[str, Any]:
+        """Execute a statement and return its result, as QueryExecutor.execute does
+        
+        sql is SQL text or a prepared statement. session is accepted for
+        Cursor and ignored: the connection is the session.
+        """
+        return self._reply(self._execute_request(sql, params, stream), stream)
+    
+    def pipeline(self, statements: List[Tuple[Any, Any]]) -> List[Dict[str, Any]]:
+        """Execute (sql, params) statements in order, sending them all before reading any reply
+        
+        Every statement runs even if an earlier one fails; the first error
+        is raised once all replies are read.
+        """
+        request_ids = [self._execute_request(sql, params, False) for sql, params in statements]
+        results = []
+        error = None
+        for request_id in request_ids:
+            try:
+                results.append(self._reply(request_id, False))
+            except DatabaseException as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+    
+    def cursor(self, session=None) -> Cursor:
+        """Open a cursor fetching rows as they arrive from the server"""
+        return Cursor(self)
+    
+    def list_tables(self) -> List[str]:
+        """Get the names of all tables"""
+        return self._reply(self._send({'op': 'tables'}), False)['tables']
+    
+    def close(self) -> None:
+        """Close the connection; the server rolls back a transaction left open"""
+        self._stream.close()
+        self._socket.close()
+    
+    def __enter__(self) -> 'Connection':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _execute_request(self, sql, params, stream: bool) -> int:
+        """Send an execute request"""
+        return self._send({
+            'op': 'execute',
+            'sql': getattr(sql, 'sql', sql),
+            'params': params,
+            'stream': stream
+        })
+    
+    def _send(self, request: Dict[str, Any]) -> int:
+        """Send a request and return its id"""
+        request_id = self._next_id
+        self._next_id += 1
+        request['id'] = request_id
+        try:
+            self._socket.sendall(encode_message(request))
+        except OSError as e:
+            raise self._lost(f"Lost connection to server '{self.address}': {e}")
+        self._replies[request_id] = deque()
+        return request_id
+    
+    def _reply(self, request_id: int, stream: bool) -> Dict[str, Any]:
+        """Read the result of a request, its rows as a RemoteRows iterator when streaming, else as a list"""
+        message = self._take(request_id)
+        if message['type'] == 'error' or not message['rows']:
+            self._finish(request_id)
+        if message['type'] == 'error':
+            raise self._error(message)
+        
+        result = message['result']
+        if message['rows']:
+            rows = RemoteRows(self, request_id)
+            result['rows'] = rows if stream else list(rows)
+        return result
+    
+    def _take(self, request_id: int) -> Dict[str, Any]:
+        """Take the next message of a request's reply, reading past replies to earlier requests"""
+        replies = self._replies[request_id]
+        while not replies:
+            try:
+                message = receive_message(self._stream)
+            except OSError as e:
+                raise self._lost(f"Lost connection to server '{self.address}': {e}")
+            if message is None:
+                raise self._lost(f"Server '{self.address}' closed the connection")
+            
+            # Messages of requests whose replies were dropped are discarded
+            pending = self._replies.get(message.get('id'))
+            if pending is not None:
+                pending.append(message)
+        return replies.popleft()
+    
+    def _lost(self, message: str) -> ConnectionException:
+        """Mark the connection broken and build the exception reporting it"""
+        self.broken = True
+        return ConnectionException(message)
+    
+    def _finish(self, request_id: int) -> None:
+        """Forget a request whose reply is complete or no longer wanted"""
+        self._replies.pop(request_id, None)
+    
+    @staticmethod
+    def _error(message: Dict[str, Any]) -> DatabaseException:
+        """Build the exception of an error reply, of the class the server raised when it is a database error"""
+        error_class = getattr(exceptions, message.get('error_type', ''), None)
+        if not (isinstance(error_class, type) and issubclass(error_class, DatabaseException)):
+            error_class = DatabaseException
+        return error_class(message['error'])
+
+class Client:
+    """Client of a database server for applications with many threads
+    
+    Each thread gets its own Connection, and with it its own session, as
+    each thread of a shared QueryExecutor does. A connection that raised
+    ConnectionException is discarded, so the thread's next call opens a
+    new one (and a new session). Offers the same methods as Connection.
+    """
+    
+    def __init__(self, address: str, timeout: Optional[float] = None):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+    
+    def connection(self) -> Connection:
+        """Get the calling thread's connection, opening it on first use or after it was lost"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and connection.broken:
+            self.close()
+            connection = None
+        if connection is None:
+            connection = self._local.connection = Connection(self.address, self.timeout)
+        return connection
+    
+    def prepare(self, sql: str) -> str:
+        """See Connection.prepare"""
+        return self.connection().prepare(sql)
+    
+    def execute(self, sql, params=None, stream: bool = False, session=None) -> Dict[str, Any]:
+        """See Connection.execute"""
+        return self.connection().execute(sql, params, stream)
+    
+    def pipeline(self, statements: List[Tuple[Any, Any]]) -> List[Dict[str, Any]]:
+        """See Connection.pipeline"""
+        return self.connection().pipeline(statements)
+    
+    def cursor(self, session=None) -> Cursor:
+        """See Connection.cursor"""
+        return self.connection().cursor()
+    
+    def list_tables(self) -> List[str]:
+        """See Connection.list_tables"""
+        return self.connection().list_tables()
+    
+    def close(self) -> None:
+        """Close the calling thread's connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            self._local.connection = None
+            connection.close()
\ No newline at end of file
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import socket
+import struct
+from typing import Dict, Any, BinaryIO, Optional, Tuple, Union
+from ...domain.exceptions import ConnectionException
+
+# Every message is a JSON object preceded by its length in bytes, a 4-byte big-endian unsigned integer
+HEADER = struct.Struct('>I')
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+DEFAULT_PORT = 5544
+
+# Requests (client to server) carry an id, echoed by every message of their reply, and an op:
+#   {'id': 1, 'op': 'execute', 'sql': ..., 'params': [...] or {...}, 'stream': False}
+#   {'id': 2, 'op': 'prepare', 'sql': ...}
+#   {'id': 3, 'op': 'tables'}
+# A reply is one 'result' message, or one 'error' message; a result holding rows
+# ('rows': True) is followed by 'rows' batches and an 'end' message (or an 'error'):
+#   {'id': 1, 'type': 'result', 'result': {'success': True, 'message': ...}, 'rows': True}
+#   {'id': 1, 'type': 'rows', 'columns': ['id', 'name'], 'rows': [[1, 'Alice'], ...]}
+#   {'id': 1, 'type': 'end', 'row_count': 1}
+#   {'id': 1, 'type': 'error', 'error': ..., 'error_type': 'TableNotFoundException'}
+# Replies come in request order, so a client may send requests without waiting (pipelining).
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Frame a message for sending"""
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    if len(payload) > MAX_MESSAGE_BYTES:
+        raise ConnectionException(f"Message of {len(payload)} bytes exceeds the {MAX_MESSAGE_BYTES} byte limit")
+    return HEADER.pack(len(payload)) + payload
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Read the next message from a stream, or None if it was closed between messages"""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ConnectionException("Connection closed in the middle of a message")
+        return None
+    
+    try:
+        payload = await reader.readexactly(_payload_length(header))
+    except asyncio.IncompleteReadError:
+        raise ConnectionException("Connection closed in the middle of a message")
+    return _decode_payload(payload)
+
+def receive_message(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read the next message from a blocking binary stream, such as a socket file, or None if it was closed"""
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ConnectionException("Connection closed in the middle of a message")
+    
+    length = _payload_length(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise ConnectionException("Connection closed in the middle of a message")
+    return _decode_payload(payload)
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    """Parse a server address: 'host:port', 'host' (default port) or 'unix:/path/to/socket'
+    
+    Returns the socket path of a Unix address, else a (host, port) pair.
+    """
+    if address.startswith('unix:'):
+        return address[len('unix:'):]
+    
+    host, separator, port = address.rpartition(':')
+    if not separator:
+        return address, DEFAULT_PORT
+    try:
+        return host, int(port)
+    except ValueError:
+        raise ConnectionException(f"Invalid server address '{address}'")
+
+def connect(address: str, timeout: Optional[float] = None) -> socket.socket:
+    """Open a connected socket to a server address (see parse_address)"""
+    target = parse_address(address)
+    try:
+        if isinstance(target, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(target)
+            except OSError:
+                sock.close()
+                raise
+        else:
+            sock = socket.create_connection(target, timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError as e:
+        raise ConnectionException(f"Cannot connect to server '{address}': {e}")
+    return sock
+
+def _payload_length(header: bytes) -> int:
+    """Get the payload length from a message header, checking it against the limit"""
+    length = HEADER.unpack(header)[0]
+    if length > MAX_MESSAGE_BYTES:
+        raise ConnectionException(f"Message of {length} bytes exceeds the {MAX_MESSAGE_BYTES} byte limit")
+    return length
+
+def _decode_payload(payload: bytes) -> Dict[str, Any]:
+    """Decode a message payload"""
+    try:
+        message = json.loads(payload)
+    except ValueError as e:
+        raise ConnectionException(f"Malformed message: {e}")
+    if not isinstance(message, dict):
+        raise ConnectionException("Malformed message: expected a JSON object")
+    return message
\ No newline at end of file
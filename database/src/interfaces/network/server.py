@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Callable, Iterator, List, Optional
+from ...infrastructure.storage.storage_factory import STORAGE_ENGINES, open_storage
+from ...application.executors.query_executor import QueryExecutor, Session
+from ...domain.exceptions import ConnectionException
+from .protocol import DEFAULT_PORT, encode_message, read_message
+
+class DatabaseServer:
+    """Serves one QueryExecutor to clients over the framed protocol of protocol.py
+    
+    Many client processes thus share one engine, with its table cache and
+    indexes kept warm. Each connection is a session: its requests run one
+    at a time in the order received, on a pool of worker threads, so a
+    client may pipeline them without waiting for replies. The rows of a
+    result are sent in batches of up to batch_size as the executor produces
+    them; the connection's next request runs once they are all sent. A
+    transaction left open when a connection closes is rolled back.
+    """
+    
+    BATCH_SIZE = 500
+    DEFAULT_WORKERS = 16
+    
+    def __init__(self, executor: QueryExecutor, batch_size: int = BATCH_SIZE,
+                 workers: int = DEFAULT_WORKERS):
+        self.executor = executor
+        self.batch_size = batch_size
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rdbms-worker')
+    
+    async def start(self, host: Optional[str] = None, port: int = DEFAULT_PORT,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Listen on a TCP port, or on a Unix socket when path is given"""
+        if path is not None:
+            return await asyncio.start_unix_server(self._serve_connection, path)
+        return await asyncio.start_server(self._serve_connection, host, port)
+    
+    async def serve(self, host: Optional[str] = None, port: int = DEFAULT_PORT,
+                    path: Optional[str] = None) -> None:
+        """Listen (see start()) and serve clients until cancelled"""
+        server = await self.start(host, port, path)
+        async with server:
+            await server.serve_forever()
+    
+    def close(self) -> None:
+        """Stop the worker threads once running statements finish"""
+        self._workers.shutdown(wait=True)
+    
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Run a connection's requests in order until the client disconnects"""
+        session = self.executor.session()
+        try:
+            while True:
+                request = await read_message(reader)
+                if request is None:
+                    break
+                await self._handle(request, session, writer)
+        except (ConnectionException, ConnectionError):
+            pass
+        finally:
+            if session.transaction is not None:
+                await self._run(self.executor.execute, 'ROLLBACK', None, False, session)
+            writer.close()
+    
+    async def _handle(self, request: Dict[str, Any], session: Session, writer: asyncio.StreamWriter) -> None:
+        """Run one request and send its reply"""
+        request_id = request.get('id')
+        try:
+            op = request.get('op')
+            if op == 'execute':
+                result = await self._run(self.executor.execute, request['sql'], request.get('params'),
+                                         bool(request.get('stream')), session)
+            elif op == 'prepare':
+                await self._run(self.executor.prepare, request['sql'])
+                result = {'success': True, 'message': "Statement prepared"}
+            elif op == 'tables':
+                tables = await self._run(self.executor.list_tables)
+                result = {'success': True, 'message': f"{len(tables)} table(s)", 'tables': tables}
+            else:
+                raise ConnectionException(f"Unknown request op '{op}'")
+        except Exception as e:
+            await self._send(writer, self._error(request_id, e))
+            return
+        
+        rows = result.pop('rows', None)
+        await self._send(writer, {'id': request_id, 'type': 'result', 'result': result, 'rows': rows is not None})
+        if rows is not None:
+            await self._send_rows(request_id, iter(rows), writer)
+    
+    async def _send_rows(self, request_id: Any, rows: Iterator[Dict[str, Any]],
+                         writer: asyncio.StreamWriter) -> None:
+        """Send a result's rows in batches as the executor produces them, then an end (or error) message"""
+        row_count = 0
+        try:
+            while True:
+                try:
+                    batch = await self._run(self._take, rows, self.batch_size)
+                except Exception as e:
+                    await self._send(writer, self._error(request_id, e))
+                    return
+                if not batch:
+                    break
+                
+                columns = list(batch[0])
+                await self._send(writer, {
+                    'id': request_id,
+                    'type': 'rows',
+                    'columns': columns,
+                    'rows': [list(row.values()) for row in batch]
+                })
+                row_count += len(batch)
+            
+            await self._send(writer, {'id': request_id, 'type': 'end', 'row_count': row_count})
+        finally:
+            close = getattr(rows, 'close', None)
+            if close is not None:
+                close()
+    
+    async def _run(self, function: Callable, *args) -> Any:
+        """Run a blocking engine call on a worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._workers, function, *args)
+    
+    @staticmethod
+    def _take(rows: Iterator[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+        """Pull up to count rows"""
+        return list(islice(rows, count))
+    
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        """Send a message, waiting while the client is behind on reading"""
+        writer.write(encode_message(message))
+        await writer.drain()
+    
+    @staticmethod
+    def _error(request_id: Any, error: Exception) -> Dict[str, Any]:
+        """Build the error reply of a request"""
+        return {'id': request_id, 'type': 'error', 'error': str(error), 'error_type': type(error).__name__}
+
+def main():
+    """Main entry point for the database server"""
+    parser = argparse.ArgumentParser(description="Pesapal RDBMS network server")
+    parser.add_argument('db_path', nargs='?', default="./db_data", help="Database directory")
+    parser.add_argument('--engine', choices=sorted(STORAGE_ENGINES),
+                        help="Storage engine (default: the engine the database was created with)")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument('--unix', metavar='PATH', help="Listen on a Unix socket at PATH instead of TCP")
+    parser.add_argument('--workers', type=int, default=DatabaseServer.DEFAULT_WORKERS,
+                        help=f"Statements run at once (default: {DatabaseServer.DEFAULT_WORKERS})")
+    args = parser.parse_args()
+    
+    server = DatabaseServer(QueryExecutor(open_storage(args.db_path, args.engine)), workers=args.workers)
+    where = f"unix:{args.unix}" if args.unix else f"{args.host}:{args.port}"
+    print(f"Serving '{args.db_path}' on {where}")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("Server stopped")
+    finally:
+        server.close()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
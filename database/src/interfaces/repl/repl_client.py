@@ -1,17 +1,23 @@
+import argparse
 import sys
 from tabulate import tabulate
-from ...infrastructure.storage.file_storage import FileStorage
+from ...infrastructure.storage.storage_factory import STORAGE_ENGINES, open_storage
 from ...application.executors.query_executor import QueryExecutor
+from ...application.executors.cursor import Cursor
 from ...domain.exceptions import DatabaseException
-from typing import Dict, Any
+from ..network.client import Connection
 
 class REPLClient:
     """Interactive REPL for database operations"""
     
-    def __init__(self, db_path: str = "./db_data"):
-        self.storage = FileStorage(db_path)
-        self.storage.initialize_database()
-        self.executor = QueryExecutor(self.storage)
+    PAGE_SIZE = 100  # rows printed per table while a SELECT streams
+    
+    def __init__(self, db_path: str = "./db_data", engine: str = None, server: str = None):
+        """Open the database at db_path, or connect to a database server at the address server"""
+        if server is not None:
+            self.executor = Connection(server)
+        else:
+            self.executor = QueryExecutor(open_storage(db_path, engine))
         self.running = False
     
     def start(self):
@@ -50,11 +56,11 @@ class REPLClient:
                     self._show_tables()
                     continue
                 
-                # Execute SQL
-                result = self.executor.execute(sql)
+                # Execute SQL, fetching rows as they are produced
+                cursor = self.executor.cursor().execute(sql)
                 
                 # Display result
-                self._display_result(result)
+                self._display_result(cursor)
             
             except DatabaseException as e:
                 print(f"Error: {e}")
@@ -98,15 +104,21 @@ class REPLClient:
             except EOFError:
                 return ""
     
-    def _display_result(self, result: Dict[str, Any]):
+    def _display_result(self, cursor: Cursor):
         """Display query result"""
-        if 'rows' in result:
-            # SELECT query - display as table
-            rows = result['rows']
+        result = cursor.result
+        if 'plan' in result:
+            # EXPLAIN - display the plan tree
+            print('\n'.join(result['plan']))
+            print(f"\n{result['message']}")
+        elif 'affected_rows' not in result:
+            # SELECT query - display as tables of up to PAGE_SIZE rows, printed as they arrive
+            row_count = 0
+            rows = cursor.fetchmany(self.PAGE_SIZE)
             
             if not rows:
                 print("No rows returned.")
-            else:
+            while rows:
                 # Extract headers from first row
                 headers = list(rows[0].keys())
                 
@@ -115,8 +127,10 @@ class REPLClient:
                 
                 # Print table
                 print(tabulate(table_data, headers=headers, tablefmt='grid'))
+                row_count += len(rows)
+                rows = cursor.fetchmany(self.PAGE_SIZE)
             
-            print(f"\n{result['message']}")
+            print(f"\n{row_count} row(s) returned")
         else:
             # DDL or DML query - display message
             print(result['message'])
@@ -132,13 +146,30 @@ Available Commands:
 DDL Commands:
   CREATE TABLE table_name (column1 TYPE constraints, column2 TYPE, ...);
   DROP TABLE table_name;
+  CREATE INDEX index_name ON table_name (column) [USING HASH | BTREE];
+  DROP INDEX index_name;
 
 DML Commands:
-  INSERT INTO table_name (col1, col2, ...) VALUES (val1, val2, ...);
+  INSERT INTO table_name (col1, col2, ...) VALUES (val1, val2, ...), (val1, val2, ...);
+  COPY table_name FROM 'file.csv' [FORMAT CSV | NDJSON];
   SELECT * FROM table_name;
   SELECT col1, col2 FROM table_name WHERE column = value;
-  UPDATE table_name SET column = value WHERE column = value;
+  UPDATE table_name SET col1 = val1, col2 = val2 WHERE column = value;
   DELETE FROM table_name WHERE column = value;
+  SELECT ... ORDER BY col1 [ASC|DESC], col2 ... [LIMIT n] [OFFSET m];
+  SELECT COUNT(*) FROM table_name [WHERE column = value];
+  SELECT col, COUNT(*), SUM(c), AVG(c), MIN(c), MAX(c) FROM table_name
+      [WHERE ...] GROUP BY col [HAVING COUNT(*) > n];
+  EXPLAIN SELECT ... | UPDATE ... | DELETE ...;
+  ANALYZE [table_name];
+
+Transactions:
+  BEGIN;  ...INSERT/COPY/UPDATE/DELETE/SELECT...;  COMMIT; | ROLLBACK;
+
+WHERE Conditions:
+  =, !=, >, <, >=, <=, AND, OR, NOT, (...)
+  column IN (val1, val2), column BETWEEN low AND high
+  column IS [NOT] NULL, column LIKE 'pattern%'
 
 JOIN:
   SELECT col1, col2 FROM table1 INNER JOIN table2 ON table1.col = table2.col;
@@ -166,7 +197,7 @@ DELETE FROM users WHERE id = 1;
     
     def _show_tables(self):
         """Show all tables in database"""
-        tables = self.storage.list_tables()
+        tables = self.executor.list_tables()
         
         if not tables:
             print("No tables found.")
@@ -179,12 +210,19 @@ DELETE FROM users WHERE id = 1;
 
 def main():
     """Main entry point for REPL"""
-    # Check for custom database path
-    db_path = "./db_data"
-    if len(sys.argv) > 1:
-        db_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Pesapal RDBMS interactive SQL shell")
+    parser.add_argument('db_path', nargs='?', default="./db_data", help="Database directory")
+    parser.add_argument('--engine', choices=sorted(STORAGE_ENGINES),
+                        help="Storage engine (default: the engine the database was created with)")
+    parser.add_argument('--server', metavar='ADDRESS',
+                        help="Connect to a database server (host:port or unix:/path) instead of opening db_path")
+    args = parser.parse_args()
     
-    repl = REPLClient(db_path)
+    try:
+        repl = REPLClient(args.db_path, args.engine, args.server)
+    except DatabaseException as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     repl.start()
 
 if __name__ == '__main__':
@@ -0,0 +1,140 @@
+"""Differential tests of RecursiveDescentParser against the reference SQLParser grammar
+
+Statements both parsers accept must parse to equal statements, and
+statements either rejects must be rejected by both. Syntax only the
+recursive descent parser supports is listed separately and skipped in
+the comparison.
+"""
+from typing import Any
+
+import pytest
+
+from src.application.parsers.prepared_statement import Parameter
+from src.application.parsers.recursive_descent_parser import RecursiveDescentParser
+from src.application.parsers.sql_parser import SQLParser
+from src.domain.exceptions import ParseException
+
+ACCEPTED = [
+    # DDL
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(50) NOT NULL, "
+    "email VARCHAR(100) UNIQUE, score FLOAT, active BOOLEAN, born DATE)",
+    "create table t (a integer)",
+    "CREATE TABLE t (a INTEGER PRIMARY KEY NOT NULL, b VARCHAR(5) UNIQUE NOT NULL);",
+    "DROP TABLE users",
+    "CREATE INDEX idx_name ON users (name)",
+    "CREATE INDEX idx_score ON users (score) USING BTREE",
+    "CREATE INDEX idx_score ON users (score) USING HASH",
+    "CREATE INDEX idx_score ON users (score) USING ORDERED",
+    "DROP INDEX idx_name",
+    # INSERT and COPY
+    "INSERT INTO users (id, name) VALUES (1, 'Alice')",
+    "INSERT INTO users (id, name, email) VALUES (1, 'Alice', \"a@x.com\"), (2, 'Bob', 'b@x.com')",
+    "INSERT INTO users (id, name) VALUES (?, ?)",
+    "INSERT INTO users (id, name) VALUES (:id, :name)",
+    "COPY users FROM 'users.csv'",
+    "COPY users FROM 'users.ndjson' FORMAT NDJSON",
+    "COPY users FROM \"users.csv\" FORMAT CSV",
+    # SELECT
+    "SELECT * FROM users",
+    "SELECT id, name FROM users",
+    "SELECT users.id FROM users",
+    "SELECT * FROM users WHERE id = 1",
+    "SELECT * FROM users WHERE name != 'Bob'",
+    "SELECT * FROM users WHERE id > 10",
+    "SELECT * FROM users WHERE id <= 10",
+    "SELECT * FROM users WHERE id >= ?",
+    "SELECT * FROM users WHERE id < :max",
+    "SELECT users.name, orders.total FROM users INNER JOIN orders ON users.id = orders.user_id",
+    "SELECT * FROM users INNER JOIN orders ON users.id = orders.user_id",
+    # UPDATE and DELETE
+    "UPDATE users SET name = 'Carol' WHERE id = 3",
+    "UPDATE users SET name = 'Carol', email = 'c@x.com'",
+    "UPDATE users SET name = ? WHERE id = ?",
+    "DELETE FROM users WHERE id = 3",
+    "DELETE FROM users",
+    # Transaction control
+    "BEGIN",
+    "BEGIN TRANSACTION",
+    "begin work",
+    "COMMIT",
+    "COMMIT WORK",
+    "COMMIT TRANSACTION;",
+    "ROLLBACK",
+    "ROLLBACK WORK",
+    "ROLLBACK TRANSACTION",
+]
+
+REJECTED = [
+    "FROBNICATE users",
+    "SELECT FROM users",
+    "SELECT * FROM users WHERE",
+    "SELECT * FROM users WHERE id == 1",
+    "SELECT * FROM a INNER JOIN b ON a.x = 1",
+    "CREATE TABLE t ()",
+    "CREATE TABLE t (a TEXT)",
+    "CREATE INDEX ON users (name)",
+    "CREATE INDEX idx ON users (name) USING GIST",
+    "DROP users",
+    "INSERT INTO users VALUES (1)",
+    "INSERT INTO users (id) VALUES",
+    "INSERT INTO t (a) VALUES (-5)",
+    "INSERT INTO t (a) VALUES (1.5)",
+    "INSERT INTO t (a) VALUES (NULL)",
+    "INSERT INTO t (a) VALUES (TRUE)",
+    "COPY users FROM 'users.csv' FORMAT XML",
+    "UPDATE users WHERE id = 1",
+    "DELETE users",
+    "BEGIN COMMIT",
+    "COMMIT TRANSACTION WORK",
+]
+
+# Deliberately supported by RecursiveDescentParser only
+RECURSIVE_DESCENT_ONLY = [
+    "SELECT * FROM users WHERE id > 1 AND (name = 'a' OR NOT active = 1)",
+    "SELECT * FROM users WHERE id IN (1, 2, 3)",
+    "SELECT * FROM users WHERE id BETWEEN 1 AND 5",
+    "SELECT * FROM users WHERE email IS NOT NULL",
+    "SELECT * FROM users WHERE name LIKE 'A%'",
+    "SELECT * FROM users ORDER BY name DESC",
+    "SELECT * FROM users ORDER BY id LIMIT 10 OFFSET 5",
+    "SELECT COUNT(*) FROM users",
+    "SELECT active, AVG(score) FROM users GROUP BY active HAVING COUNT(*) > 1",
+    "EXPLAIN SELECT * FROM users WHERE id = 1",
+    "ANALYZE",
+    "ANALYZE users",
+]
+
+def comparable(node: Any) -> Any:
+    """Replace placeholders, which compare by identity, with their names"""
+    if isinstance(node, Parameter):
+        return ('parameter', node.name)
+    if isinstance(node, dict):
+        return {key: comparable(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [comparable(value) for value in node]
+    return node
+
+@pytest.fixture(scope='module')
+def parsers():
+    return SQLParser(), RecursiveDescentParser()
+
+@pytest.mark.parametrize('sql', ACCEPTED + [
+    pytest.param(sql, marks=pytest.mark.skip(reason="syntax supported by RecursiveDescentParser only"))
+    for sql in RECURSIVE_DESCENT_ONLY
+])
+def test_accepted_statements_parse_equal(parsers, sql):
+    reference, parser = parsers
+    assert comparable(parser.parse(sql)) == comparable(reference.parse(sql))
+
+@pytest.mark.parametrize('sql', REJECTED)
+def test_rejected_statements_fail_in_both(parsers, sql):
+    for parser in parsers:
+        with pytest.raises(ParseException):
+            parser.parse(sql)
+
+@pytest.mark.parametrize('sql', RECURSIVE_DESCENT_ONLY)
+def test_recursive_descent_only_syntax(parsers, sql):
+    reference, parser = parsers
+    parser.parse(sql)
+    with pytest.raises(ParseException):
+        reference.parse(sql)
\ No newline at end of file
@@ -1,21 +1,31 @@
 from flask import Blueprint, jsonify, request
-from ..services.rdbms_client import RDBMSClient
+from ..services.rdbms_client import get_client
 
 appointments_bp = Blueprint('appointments', __name__)
 
-def get_client():
-    """Get or create RDBMS client"""
-    if not hasattr(get_client, 'client'):
-        get_client.client = RDBMSClient()
-    return get_client.client
-
 @appointments_bp.route('/appointments', methods=['GET'])
 def get_all_appointments():
     """Get all appointments with patient and doctor names"""
     
-    # Get all appointments
+    # Get all appointments, optionally for one doctor or patient
     sql_appointments = "SELECT * FROM appointments"
-    result_appointments = get_client().execute_query(sql_appointments)
+    params = []
+    doctor_id = request.args.get('doctor_id', type=int)
+    patient_id = request.args.get('patient_id', type=int)
+    if doctor_id is not None:
+        sql_appointments += " WHERE doctor_id = ?"
+        params.append(doctor_id)
+    elif patient_id is not None:
+        sql_appointments += " WHERE patient_id = ?"
+        params.append(patient_id)
+    
+    # Page through appointments in id order when asked
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', type=int)
+    if limit is not None or offset is not None:
+        sql_appointments += " ORDER BY id LIMIT ? OFFSET ?"
+        params.extend([limit, offset or 0])
+    result_appointments = get_client().execute_query(sql_appointments, params)
     
     if not result_appointments['success']:
         return jsonify({
@@ -47,11 +57,36 @@ def get_all_appointments():
         'count': len(appointments)
     }), 200
 
+@appointments_bp.route('/appointments/summary', methods=['GET'])
+def get_appointment_summary():
+    """Count appointments per doctor, patient or status, aggregated by the engine"""
+    group_column = request.args.get('by', 'doctor_id')
+    if group_column not in ('doctor_id', 'patient_id', 'status'):
+        return jsonify({
+            'success': False,
+            'error': "by must be one of: doctor_id, patient_id, status"
+        }), 400
+    
+    sql = f"SELECT {group_column}, COUNT(*) AS count FROM appointments GROUP BY {group_column} ORDER BY {group_column}"
+    result = get_client().execute_query(sql)
+    
+    if result['success']:
+        return jsonify({
+            'success': True,
+            'by': group_column,
+            'summary': result['data'].get('rows', [])
+        }), 200
+    else:
+        return jsonify({
+            'success': False,
+            'error': result['error']
+        }), 500
+
 @appointments_bp.route('/appointments/<int:appointment_id>', methods=['GET'])
 def get_appointment(appointment_id):
     """Get a specific appointment by ID"""
-    sql = f"SELECT * FROM appointments WHERE id = {appointment_id}"
-    result = get_client().execute_query(sql)
+    sql = "SELECT * FROM appointments WHERE id = ?"
+    result = get_client().execute_query(sql, [appointment_id])
     
     if result['success']:
         rows = result['data'].get('rows', [])
@@ -84,9 +119,11 @@ def create_appointment():
                 'error': f'{field} is required'
             }), 400
     
-    sql = f"INSERT INTO appointments (id, patient_id, doctor_id, appointment_date, status) VALUES ({data['id']}, {data['patient_id']}, {data['doctor_id']}, '{data['appointment_date']}', '{data['status']}')"
+    sql = "INSERT INTO appointments (id, patient_id, doctor_id, appointment_date, status) VALUES (?, ?, ?, ?, ?)"
     
-    result = get_client().execute_query(sql)
+    result = get_client().execute_query(sql, [
+        data['id'], data['patient_id'], data['doctor_id'], data['appointment_date'], data['status']
+    ])
     
     if result['success']:
         return jsonify({
@@ -111,9 +148,9 @@ def update_appointment(appointment_id):
             'error': 'Status is required'
         }), 400
     
-    sql = f"UPDATE appointments SET status = '{data['status']}' WHERE id = {appointment_id}"
+    sql = "UPDATE appointments SET status = ? WHERE id = ?"
     
-    result = get_client().execute_query(sql)
+    result = get_client().execute_query(sql, [data['status'], appointment_id])
     
     if result['success']:
         return jsonify({
@@ -129,9 +166,9 @@ def update_appointment(appointment_id):
 @appointments_bp.route('/appointments/<int:appointment_id>', methods=['DELETE'])
 def delete_appointment(appointment_id):
     """Delete an appointment"""
-    sql = f"DELETE FROM appointments WHERE id = {appointment_id}"
+    sql = "DELETE FROM appointments WHERE id = ?"
     
-    result = get_client().execute_query(sql)
+    result = get_client().execute_query(sql, [appointment_id])
     
     if result['success']:
         return jsonify({
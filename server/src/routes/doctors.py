@@ -1,18 +1,19 @@
 from flask import Blueprint, jsonify, request
-from ..services.rdbms_client import RDBMSClient
+from ..services.rdbms_client import get_client
 
 doctors_bp = Blueprint('doctors', __name__)
 
-def get_client():
-    """Get or create RDBMS client"""
-    if not hasattr(get_client, 'client'):
-        get_client.client = RDBMSClient()
-    return get_client.client
-
 @doctors_bp.route('/doctors', methods=['GET'])
 def get_all_doctors():
-    """Get all doctors"""
-    result = get_client().execute_query("SELECT * FROM doctors")
+    """Get all doctors, a page at a time when limit or offset is given"""
+    sql = "SELECT * FROM doctors"
+    params = []
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', type=int)
+    if limit is not None or offset is not None:
+        sql += " ORDER BY id LIMIT ? OFFSET ?"
+        params.extend([limit, offset or 0])
+    result = get_client().execute_query(sql, params)
     
     if result['success']:
         return jsonify({
@@ -29,8 +30,8 @@ def get_all_doctors():
 @doctors_bp.route('/doctors/<int:doctor_id>', methods=['GET'])
 def get_doctor(doctor_id):
     """Get a specific doctor by ID"""
-    sql = f"SELECT * FROM doctors WHERE id = {doctor_id}"
-    result = get_client().execute_query(sql)
+    sql = "SELECT * FROM doctors WHERE id = ?"
+    result = get_client().execute_query(sql, [doctor_id])
     
     if result['success']:
         rows = result['data'].get('rows', [])
@@ -61,9 +62,9 @@ def create_doctor():
             'error': 'Name is required'
         }), 400
     
-    sql = f"INSERT INTO doctors (id, name, specialization) VALUES ({data['id']}, '{data['name']}', '{data.get('specialization', '')}')"
+    sql = "INSERT INTO doctors (id, name, specialization) VALUES (?, ?, ?)"
     
-    result = get_client().execute_query(sql)
+    result = get_client().execute_query(sql, [data['id'], data['name'], data.get('specialization', '')])
     
     if result['success']:
         return jsonify({
@@ -88,9 +89,17 @@ def update_doctor(doctor_id):
             'error': 'Name is required'
         }), 400
     
-    # Update name
-    sql_name = f"UPDATE doctors SET name = '{data['name']}' WHERE id = {doctor_id}"
-    result = get_client().execute_query(sql_name)
+    # Update all provided fields in one statement
+    assignments = ["name = :name"]
+    if 'specialization' in data:
+        assignments.append("specialization = :specialization")
+    
+    sql = f"UPDATE doctors SET {', '.join(assignments)} WHERE id = :id"
+    result = get_client().execute_query(sql, {
+        'name': data['name'],
+        'specialization': data.get('specialization', ''),
+        'id': doctor_id
+    })
     
     if not result['success']:
         return jsonify({
@@ -98,28 +107,17 @@ def update_doctor(doctor_id):
             'error': result['error']
         }), 500
     
-    # Update specialization if provided
-    if 'specialization' in data:
-        sql_spec = f"UPDATE doctors SET specialization = '{data.get('specialization', '')}' WHERE id = {doctor_id}"
-        result = get_client().execute_query(sql_spec)
-        
-        if not result['success']:
-            return jsonify({
-                'success': False,
-                'error': result['error']
-            }), 500
-    
     return jsonify({
         'success': True,
         'message': 'Doctor updated successfully'
     }), 200
-    
+
 @doctors_bp.route('/doctors/<int:doctor_id>', methods=['DELETE'])
 def delete_doctor(doctor_id):
     """Delete a doctor"""
-    sql = f"DELETE FROM doctors WHERE id = {doctor_id}"
+    sql = "DELETE FROM doctors WHERE id = ?"
     
-    result = get_client().execute_query(sql)
+    result = get_client().execute_query(sql, [doctor_id])
     
     if result['success']:
         return jsonify({
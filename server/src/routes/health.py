@@ -1,4 +1,5 @@
 from flask import Blueprint, jsonify
+from ..services.rdbms_client import get_client
 
 health_bp = Blueprint('health', __name__)
 
@@ -13,10 +14,7 @@ def health_check():
 @health_bp.route('/tables', methods=['GET'])
 def list_tables():
     """List all tables in the database"""
-    from ..services.rdbms_client import RDBMSClient
-    
-    client = RDBMSClient()
-    result = client.get_all_tables()
+    result = get_client().get_all_tables()
     
     if result['success']:
         return jsonify({
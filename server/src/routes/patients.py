@@ -1,18 +1,19 @@
 from flask import Blueprint, jsonify, request
-from ..services.rdbms_client import RDBMSClient
+from ..services.rdbms_client import get_client
 
 patients_bp = Blueprint('patients', __name__)
 
-def get_client():
-    """Get or create RDBMS client"""
-    if not hasattr(get_client, 'client'):
-        get_client.client = RDBMSClient()
-    return get_client.client
-
 @patients_bp.route('/patients', methods=['GET'])
 def get_all_patients():
-    """Get all patients"""
-    result = get_client().execute_query("SELECT * FROM patients")
+    """Get all patients, a page at a time when limit or offset is given"""
+    sql = "SELECT * FROM patients"
+    params = []
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', type=int)
+    if limit is not None or offset is not None:
+        sql += " ORDER BY id LIMIT ? OFFSET ?"
+        params.extend([limit, offset or 0])
+    result = get_client().execute_query(sql, params)
     
     if result['success']:
         return jsonify({
@@ -29,8 +30,8 @@ def get_all_patients():
 @patients_bp.route('/patients/<int:patient_id>', methods=['GET'])
 def get_patient(patient_id):
     """Get a specific patient by ID"""
-    sql = f"SELECT * FROM patients WHERE id = {patient_id}"
-    result = get_client().execute_query(sql)
+    sql = "SELECT * FROM patients WHERE id = ?"
+    result = get_client().execute_query(sql, [patient_id])
     
     if result['success']:
         rows = result['data'].get('rows', [])
@@ -63,9 +64,9 @@ def create_patient():
         }), 400
     
     # Build INSERT query
-    sql = f"INSERT INTO patients (id, name, email, phone) VALUES ({data['id']}, '{data['name']}', '{data['email']}', '{data.get('phone', '')}')"
+    sql = "INSERT INTO patients (id, name, email, phone) VALUES (?, ?, ?, ?)"
     
-    result = get_client().execute_query(sql)
+    result = get_client().execute_query(sql, [data['id'], data['name'], data['email'], data.get('phone', '')])
     
     if result['success']:
         return jsonify({
@@ -90,9 +91,20 @@ def update_patient(patient_id):
             'error': 'Name is required'
         }), 400
     
-    # Update name
-    sql_name = f"UPDATE patients SET name = '{data['name']}' WHERE id = {patient_id}"
-    result = get_client().execute_query(sql_name)
+    # Update all provided fields in one statement
+    assignments = ["name = :name"]
+    if 'email' in data and data['email']:
+        assignments.append("email = :email")
+    if 'phone' in data:
+        assignments.append("phone = :phone")
+    
+    sql = f"UPDATE patients SET {', '.join(assignments)} WHERE id = :id"
+    result = get_client().execute_query(sql, {
+        'name': data['name'],
+        'email': data.get('email'),
+        'phone': data.get('phone'),
+        'id': patient_id
+    })
     
     if not result['success']:
         return jsonify({
@@ -100,28 +112,6 @@ def update_patient(patient_id):
             'error': result['error']
         }), 500
     
-    # Update email if provided
-    if 'email' in data and data['email']:
-        sql_email = f"UPDATE patients SET email = '{data['email']}' WHERE id = {patient_id}"
-        result = get_client().execute_query(sql_email)
-        
-        if not result['success']:
-            return jsonify({
-                'success': False,
-                'error': result['error']
-            }), 500
-    
-    # Update phone if provided
-    if 'phone' in data:
-        sql_phone = f"UPDATE patients SET phone = '{data['phone']}' WHERE id = {patient_id}"
-        result = get_client().execute_query(sql_phone)
-        
-        if not result['success']:
-            return jsonify({
-                'success': False,
-                'error': result['error']
-            }), 500
-    
     return jsonify({
         'success': True,
         'message': 'Patient updated successfully'
@@ -130,9 +120,9 @@ def update_patient(patient_id):
 @patients_bp.route('/patients/<int:patient_id>', methods=['DELETE'])
 def delete_patient(patient_id):
     """Delete a patient"""
-    sql = f"DELETE FROM patients WHERE id = {patient_id}"
+    sql = "DELETE FROM patients WHERE id = ?"
     
-    result = get_client().execute_query(sql)
+    result = get_client().execute_query(sql, [patient_id])
     
     if result['success']:
         return jsonify({
@@ -1,27 +1,79 @@
 import os
-from src.infrastructure.storage.file_storage import FileStorage
+import threading
+from contextlib import contextmanager
+from src.infrastructure.storage.storage_factory import open_storage
 from src.application.executors.query_executor import QueryExecutor
 from src.domain.exceptions import DatabaseException
+from src.interfaces.network.client import Client
 
 class RDBMSClient:
     """Client for interacting with the RDBMS"""
     
-    def __init__(self, db_path: str = None):
-        """Initialize the RDBMS client"""
+    def __init__(self, db_path: str = None, engine: str = None, server: str = None):
+        """Initialize the RDBMS client
+        
+        engine selects the storage engine ('json', 'wal' or 'page'); it
+        defaults to RDBMS_STORAGE_ENGINE or the engine the database uses.
+        server, defaulting to RDBMS_SERVER, is the address of a database
+        server (host:port or unix:/path) to use instead of opening the
+        database in this process.
+        """
+        if server is None:
+            server = os.environ.get('RDBMS_SERVER')
+        if server:
+            self.executor = Client(server)
+            return
+        
         # Set default path relative to this file
         if db_path is None:
             current_dir = os.path.dirname(os.path.abspath(__file__))
             db_path = os.path.join(current_dir, '../../../database/db_data')
             db_path = os.path.abspath(db_path)
         
-        self.storage = FileStorage(db_path)
-        self.storage.initialize_database()
-        self.executor = QueryExecutor(self.storage)
+        if engine is None:
+            engine = os.environ.get('RDBMS_STORAGE_ENGINE')
+        
+        self.executor = QueryExecutor(open_storage(db_path, engine))
+    
+    def prepare(self, sql: str):
+        """Parse a statement with ? or :name placeholders once for repeated execution"""
+        return self.executor.prepare(sql)
+    
+    def execute(self, statement, params=None):
+        """Execute a prepared statement with parameter values and return results"""
+        return self.execute_query(statement, params)
+    
+    def cursor(self):
+        """Open a cursor fetching query rows as they are produced (fetchone/fetchmany/iteration)
+        
+        Unlike execute_query, cursor methods raise DatabaseException on errors.
+        """
+        return self.executor.cursor()
     
-    def execute_query(self, sql: str):
-        """Execute a SQL query and return results"""
+    @contextmanager
+    def transaction(self):
+        """Run the statements of a with block, on this thread, as one transaction
+        
+        The transaction commits when the block ends and rolls back if it
+        raises. execute_query reports errors without raising, so raise on a
+        failed result to roll back.
+        """
+        self.executor.execute('BEGIN')
         try:
-            result = self.executor.execute(sql)
+            yield self
+        except BaseException:
+            self.executor.execute('ROLLBACK')
+            raise
+        self.executor.execute('COMMIT')
+    
+    def execute_query(self, sql, params=None):
+        """Execute a SQL query and return results
+        
+        Values should be passed in params (a list for ? placeholders, a dict
+        for :name placeholders) rather than spliced into the SQL text.
+        """
+        try:
+            result = self.executor.execute(sql, params)
             return {
                 'success': True,
                 'data': result
@@ -42,7 +94,7 @@ class RDBMSClient:
     def get_all_tables(self):
         """Get list of all tables"""
         try:
-            tables = self.storage.list_tables()
+            tables = self.executor.list_tables()
             return {
                 'success': True,
                 'data': tables
@@ -51,4 +103,20 @@ class RDBMSClient:
             return {
                 'success': False,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+
+_client = None
+_client_mutex = threading.Lock()
+
+def get_client() -> RDBMSClient:
+    """Get the RDBMS client shared by every request of this process
+    
+    The engine is thread-safe, so one client serves all requests; separate
+    clients would each cache the tables and could not coordinate writes.
+    """
+    global _client
+    if _client is None:
+        with _client_mutex:
+            if _client is None:
+                _client = RDBMSClient()
+    return _client
\ No newline at end of file